@@ -1,3 +1,4 @@
+import os
 import pytest
 from utils.testutil import (wait_until_maintenance_finished, wait_blocks,
                             check_irreversible_block_is_updated)
@@ -8,6 +9,74 @@ from utils.cli_wallet import CLI_WALLET
 from utils.py_logger import logger, PrettyFormatter
 from utils.step_generator import StepGenerator
 from utils.whitelist_tc_manager import WhitelistTcManager
+from utils.resource_pool import ResourcePool
+from utils.workers import (is_xdist_worker, get_worker_index, get_worker_id,
+                           get_worker_file_path, get_funding_account,
+                           set_funding_account, shared_state)
+from utils.sim_chain import install_sim_backend, get_sim_chain
+from utils.time_control import TIME_CONTROLLER, DebugNodeTimeSkipper
+from utils.witness_node import WITNESS_NODE
+from utils.log_scanner import MaintenanceLogFollower
+from utils.results_store import (RESULTS_STORE, DEFAULT_RESULTS_FILE,
+                                 set_results_file)
+from utils.rpc_stats import RPC_STATS
+from utils.time_profiler import PROFILER
+from utils.chain_snapshot import ChainSnapshots, SimChainSnapshots
+
+
+SIM_BACKEND = 'sim'
+BEFORE_COMMITTEE_SNAPSHOT = 'before_committee'
+COMMITTEE_SNAPSHOT = 'committee'
+
+
+def pytest_configure(config):
+    set_results_file(config.getoption('results_file'))
+    if config.getoption('rpc_stats'):
+        RPC_STATS.enable()
+    if config.getoption('time_profile'):
+        PROFILER.enable()
+    if config.getoption('backend') == SIM_BACKEND:
+        logger.info('Tests are run against in-process simulated chain')
+        install_sim_backend()
+        return
+    debug_key = config.getoption('debug_key')
+    if debug_key:
+        logger.info('Maintenance waits are skipped with debug_node plugin')
+        TIME_CONTROLLER.set_skipper(
+            DebugNodeTimeSkipper(WITNESS_NODE, debug_key))
+    # each xdist worker may use its own cli_wallet instance
+    ports = config.getoption('cli_wallet_ports')
+    if ports:
+        ports = ports.split(',')
+        port = ports[get_worker_index() % len(ports)]
+        CLI_WALLET.connect('http://%s:%s' % ('localhost', port))
+
+
+def pytest_sessionfinish(session):
+    if PROFILER.enabled:
+        dump_time_profile(session.config)
+    if not RPC_STATS.enabled:
+        return
+    logger.info('RPC calls statistics:\n%s' % RPC_STATS.format_summary())
+    stats_file = get_worker_file_path(
+        session.config.getoption('rpc_stats_file'))
+    if stats_file:
+        RPC_STATS.dump(stats_file)
+        logger.info('RPC calls statistics is saved to %s' % stats_file)
+    if session.config.getoption('rpc_stats_to_results'):
+        RPC_STATS.record_to_results_store(
+            RESULTS_STORE, {'backend': session.config.getoption('backend')})
+
+
+def dump_time_profile(config):
+    logger.info('Time spent by tests:\n%s' % PROFILER.format_summary())
+    profile_file = get_worker_file_path(config.getoption('time_profile_file'))
+    stacks_file = get_worker_file_path(
+        config.getoption('time_profile_stacks'))
+    PROFILER.dump_json(profile_file)
+    PROFILER.dump_collapsed(stacks_file)
+    logger.info('Time profile is saved to %s and %s' % (profile_file,
+                                                        stacks_file))
 
 
 def pytest_logger_config(logger_config):
@@ -22,6 +91,20 @@ def reset_step_generator():
     step_generator.reset()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def time_profile(request):
+    PROFILER.start_test(request.node.nodeid)
+    yield
+    PROFILER.finish_test()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def rpc_stats_test_id(request):
+    RPC_STATS.set_current_test(request.node.nodeid)
+    yield
+    RPC_STATS.set_current_test(None)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def check_consensus():
     check_irreversible_block_is_updated()
@@ -29,13 +112,56 @@ def check_consensus():
     check_irreversible_block_is_updated()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def worker_funding_account(request):
+    # xdist workers fund new objects from their own sub-account, so they do
+    # not compete for "nathan" balance
+    if not is_xdist_worker():
+        yield None
+        return
+    balance = request.config.getoption('worker_funding')
+    logger.info('Creating funding account for %s worker' % get_worker_id())
+    funding_account = create_account_with_balance(balance, lifetime=True)
+    set_funding_account(funding_account.name)
+    yield funding_account
+    set_funding_account('nathan')
+
+
 @pytest.yield_fixture
-def socket():
+def socket(request):
+    if request.config.getoption('backend') == SIM_BACKEND:
+        pytest.skip('raw socket tests need real cli_wallet')
     _socket = s.socket(s.AF_INET, s.SOCK_STREAM)
     yield _socket
     _socket.close()
 
 
+@pytest.fixture(scope='function')
+def maintenance_log_follower(request):
+    log_file_path = os.path.join(request.config.getoption('docker_dir'),
+                                 'log')
+    follower = MaintenanceLogFollower(log_file_path)
+    follower.start()
+    yield follower
+    follower.stop()
+
+
+@pytest.fixture(scope='session')
+def results_store():
+    return RESULTS_STORE
+
+
+@pytest.fixture(scope='session')
+def benchmark_params(request):
+    """Options describing size of a performance run, recorded with every
+    measurement"""
+    names = ('issuers_pairs_count', 'issuer_assets_count', 'sellers_count',
+             'holders_count', 'with_fba', 'new_maintenance',
+             'bts_for_issuers', 'ordinary_accounts_count', 'backend',
+             'transfer_senders', 'transfers_count')
+    return dict((name, request.config.getoption(name)) for name in names)
+
+
 @pytest.fixture(scope='module')
 def witness_node():
     class Dummy:
@@ -52,6 +178,27 @@ def cli_wallet():
     return Dummy
 
 
+@pytest.fixture(scope='session')
+def resource_pool():
+    # every kind is created on its first take and then refilled in the
+    # background, kinds no test takes cost nothing
+    pool = ResourcePool()
+    yield pool
+    pool.stop()
+    pool.log_consumers()
+
+
+@pytest.fixture
+def take_account(request, resource_pool):
+    """Returns a new funded account from the pool on every call"""
+    return lambda: resource_pool.get_account(request.node.nodeid)
+
+
+@pytest.fixture
+def take_lifetime_account(request, resource_pool):
+    return lambda: resource_pool.get_lifetime_account(request.node.nodeid)
+
+
 @pytest.fixture
 def account():
     class Dummy:
@@ -73,27 +220,89 @@ def whitelist_tc_manager():
 
 @pytest.fixture(scope="function")
 def init_balances():
-    CLI_WALLET.transfer("nathan", "init1", 10000)
-    CLI_WALLET.transfer("nathan", "init2", 10000)
+    CLI_WALLET.transfer(get_funding_account(), "init1", 10000)
+    CLI_WALLET.transfer(get_funding_account(), "init2", 10000)
+
+
+@pytest.fixture(scope='session')
+def chain_snapshots(request):
+    """None if node restart commands are not given or the node is shared
+    by xdist workers"""
+    if request.config.getoption('backend') == SIM_BACKEND:
+        return SimChainSnapshots(get_sim_chain())
+    stop_command = request.config.getoption('snapshot_stop_command')
+    start_command = request.config.getoption('snapshot_start_command')
+    if not stop_command or not start_command or is_xdist_worker():
+        return None
+    snapshots = ChainSnapshots(request.config.getoption('docker_dir'),
+                               stop_command, start_command)
+    if not request.config.getoption('reuse_snapshots'):
+        snapshots.clear()
+    return snapshots
 
 
 @pytest.fixture(scope="session")
-def committee():
+def committee(request, chain_snapshots):
+    logger.info('Committee fixture setup started')
+    committee_accounts = ("init0", "init1", "init2")
+    committee = Committee()
+
+    if chain_snapshots is not None:
+        # teardown just restores the chain instead of reverting changes
+        chain_snapshots.take(BEFORE_COMMITTEE_SNAPSHOT)
+        if request.config.getoption('reuse_snapshots'):
+            # the next sessions restore the committee instead of voting
+            chain_snapshots.checkpoint(
+                COMMITTEE_SNAPSHOT,
+                lambda: setup_committee(committee, committee_accounts))
+        else:
+            setup_committee(committee, committee_accounts)
+        logger.info('Committee fixture setup finished')
+        yield committee
+
+        logger.info('Committee fixture tearDown started')
+        chain_snapshots.restore(BEFORE_COMMITTEE_SNAPSHOT)
+        logger.info('Committee fixture tearDown finished')
+        return
+
+    # committee is shared by all xdist workers: the first one votes, the
+    # last one reverts changes when no other worker's tests use it. Every
+    # worker has its own simulated chain
+    state_name = 'committee'
+    if request.config.getoption('backend') == SIM_BACKEND:
+        state_name = 'committee-%s' % get_worker_id()
+    with shared_state(state_name) as state:
+        if not state:
+            state['account_name'] = setup_committee(committee,
+                                                    committee_accounts)
+            state['previous_global_params'] = \
+                CLI_WALLET.get_global_parameters()
+        state['users'] = state.get('users', 0) + 1
+
+    logger.info('Committee fixture setup finished')
+    yield committee
+
+    logger.info('Committee fixture tearDown started')
+    with shared_state(state_name) as state:
+        state['users'] -= 1
+        if not state['users']:
+            revert_committee_changes(committee, state['account_name'],
+                                     committee_accounts,
+                                     state['previous_global_params'])
+            state.clear()
+    logger.info('Committee fixture tearDown finished')
+
+
+def setup_committee(committee, committee_accounts):
     # create new accont (testAccount)
     # transfer to testAccount BTS
     # transfer to commitee BTS from testAccount balance
     # transfer to commitee members BTS from testAccount balance
     # testAccount vote for commitee members
-
-    logger.info('Committee fixture setup started')
     account = create_account_with_balance(5000000, referrer_percent='1')
 
-    committee_accounts = ("init0", "init1", "init2")
-
-    committee = Committee()
-
-    # there are 5 operations (interval, referral_percent, subscription_plan x3)
-    # that should be applied
+    # there are 5 operations (interval, referral_percent,
+    # subscription_plan x3) that should be applied
     # it costs committee 5 tokens to make voting effective
     committee.increaseBalance(account.name, 5)
 
@@ -105,37 +314,35 @@ def committee():
         committee.addMember(account.name, member)
 
     wait_until_maintenance_finished()
+    return account.name
 
-    previous_global_params = CLI_WALLET.get_global_parameters()
-
-    logger.info('Committee fixture setup finished')
-    yield committee
 
-    logger.info('Committee fixture tearDown started')
+def revert_committee_changes(committee, account_name, committee_accounts,
+                             previous_global_params):
     current_global_params = CLI_WALLET.get_global_parameters()
     param_value = dict()
     for key in previous_global_params.keys():
         if isinstance(previous_global_params[key], int):
             if current_global_params[key] != previous_global_params[key]:
-                param_value[key] = current_global_params[key]
+                param_value[key] = previous_global_params[key]
                 logger.info(
                     'current %s:%s' % (key, current_global_params[key]))
                 logger.info(
                     'previous %s:%s' % (key, previous_global_params[key]))
-                committee.update_global_property("init0", "init1", key,
-                                                 previous_global_params[key])
+    if param_value:
+        committee.update_global_properties("init0", "init1", param_value)
 
     for member in committee_accounts:
-        committee.deleteMember(account.name, member)
+        committee.deleteMember(account_name, member)
     wait_blocks(1)
 
     wait_until_maintenance_finished()
     if param_value:
-        param = param_value.keys()[0]
-        logger.info('Check that %s was changed back' % param)
+        logger.info('Check that %s were changed back' % param_value.keys())
         current_global_params = CLI_WALLET.get_global_parameters()
-        assert current_global_params[param] == previous_global_params[param]
-    logger.info('Committee fixture tearDown finished')
+        for param in param_value:
+            assert current_global_params[param] == \
+                previous_global_params[param]
 
 
 def pytest_addoption(parser):
@@ -151,6 +358,75 @@ def pytest_addoption(parser):
     parser.addoption("--bts_for_issuers", action="store", default=1000000)
     parser.addoption("--ordinary_accounts_count", action="store",
                      default=100000)
+    parser.addoption("--cli_wallet_ports", action="store", default=None,
+                     help="comma separated cli_wallet ports, xdist workers "
+                          "are distributed between them")
+    parser.addoption("--worker_funding", action="store", default=50000000,
+                     help="balance of funding account of each xdist worker")
+    parser.addoption("--backend", action="store", default="real",
+                     choices=("real", SIM_BACKEND),
+                     help="'sim' runs tests against in-process chain model "
+                          "with virtual clock instead of real nodes")
+    parser.addoption("--holders_sweep", action="store", default=None,
+                     help="comma separated holders counts for maintenance "
+                          "benchmark, --holders_count by default")
+    parser.addoption("--revenue_assets_sweep", action="store", default=None,
+                     help="comma separated revenue assets counts for "
+                          "maintenance benchmark, --issuer_assets_count by "
+                          "default")
+    parser.addoption("--transfer_senders", action="store", default=10,
+                     help="funded accounts of transfer benchmark")
+    parser.addoption("--transfers_count", action="store", default=200,
+                     help="transfers broadcast by every path of transfer "
+                          "benchmark")
+    parser.addoption("--transfer_concurrency_sweep", action="store",
+                     default="1,4,16,64",
+                     help="comma separated numbers of parallel transfer "
+                          "calls of transfer benchmark")
+    parser.addoption("--builder_ops", action="store", default=20,
+                     help="transfers per builder transaction of transfer "
+                          "benchmark")
+    parser.addoption("--snapshot_stop_command", action="store", default=None,
+                     help="shell command stopping witness node (and "
+                          "cli_wallet) to take or restore a snapshot of "
+                          "--docker_dir")
+    parser.addoption("--snapshot_start_command", action="store",
+                     default=None,
+                     help="shell command starting witness node (and "
+                          "cli_wallet) after a snapshot")
+    parser.addoption("--reuse_snapshots", action="store_true",
+                     default=False,
+                     help="restore snapshots of previous sessions instead "
+                          "of building them again")
+    parser.addoption("--rpc_stats", action="store_true", default=False,
+                     help="collect per method and per test statistics of "
+                          "RPC calls")
+    parser.addoption("--rpc_stats_file", action="store",
+                     default='rpc_stats.json',
+                     help="JSON report of --rpc_stats, xdist workers "
+                          "add their id to the name")
+    parser.addoption("--rpc_stats_to_results", action="store_true",
+                     default=False,
+                     help="record RPC latency percentiles to --results_file")
+    parser.addoption("--time_profile", action="store_true", default=False,
+                     help="split wall time of tests and steps into waiting "
+                          "for chain, RPC and python")
+    parser.addoption("--time_profile_file", action="store",
+                     default='time_profile.json',
+                     help="JSON report of --time_profile, xdist workers "
+                          "add their id to the names of both files")
+    parser.addoption("--time_profile_stacks", action="store",
+                     default='time_profile.folded',
+                     help="collapsed stacks of --time_profile for "
+                          "flamegraph.pl")
+    parser.addoption("--results_file", action="store",
+                     default=DEFAULT_RESULTS_FILE,
+                     help="JSON-lines file benchmark results are appended "
+                          "to, see utils/results_store.py")
+    parser.addoption("--debug_key", action="store", default=None,
+                     help="private key of a witness for debug_node plugin. "
+                          "When set, waits for maintenance are replaced "
+                          "by generating blocks up to the needed time")
 
 
 def pytest_generate_tests(metafunc):
@@ -208,3 +484,28 @@ def pytest_generate_tests(metafunc):
             option_ordinary_accounts_count is not None:
         metafunc.parametrize("ordinary_accounts_count",
                              [option_ordinary_accounts_count])
+
+    # parameter sweeps: every value becomes a separate test
+    if 'holders_sweep_count' in metafunc.fixturenames:
+        sweep = metafunc.config.option.holders_sweep or \
+            str(metafunc.config.option.holders_count)
+        metafunc.parametrize("holders_sweep_count", sweep.split(','))
+
+    if 'revenue_assets_sweep_count' in metafunc.fixturenames:
+        sweep = metafunc.config.option.revenue_assets_sweep or \
+            str(metafunc.config.option.issuer_assets_count)
+        metafunc.parametrize("revenue_assets_sweep_count", sweep.split(','))
+
+    if 'transfer_concurrency' in metafunc.fixturenames:
+        sweep = metafunc.config.option.transfer_concurrency_sweep
+        metafunc.parametrize("transfer_concurrency", sweep.split(','))
+
+    option_transfers_count = metafunc.config.option.transfers_count
+    if 'transfers_count' in metafunc.fixturenames and \
+            option_transfers_count is not None:
+        metafunc.parametrize("transfers_count", [option_transfers_count])
+
+    option_builder_ops = metafunc.config.option.builder_ops
+    if 'builder_ops' in metafunc.fixturenames and \
+            option_builder_ops is not None:
+        metafunc.parametrize("builder_ops", [option_builder_ops])
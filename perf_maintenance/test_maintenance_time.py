@@ -0,0 +1,221 @@
+# Maintenance duration versus number of stock (FBA) holders and revenue
+# assets. Every test point populates the chain at its own scale, trades
+# revenue assets to accumulate fees and measures the next maintenance from
+# witness log. With chain snapshots (see conftest.py) every point starts
+# from the same chain, otherwise points add up on one chain and the
+# cumulative counts are recorded as chain_* params. Run e.g.:
+#   python -m pytest perf_maintenance/ --docker_dir=/path/to/witness/dir \
+#       --holders_sweep=100,1000,5000 --revenue_assets_sweep=1,10 \
+#       --with_fba=True
+
+import os
+import pytest
+from utils.account import create_accounts
+from utils.assets import (create_new_user_assets,
+                          prepare_reward_user_asset_options)
+from utils.cli_wallet import CLI_WALLET
+from utils.fb_asset import create_stock_asset
+from utils.log_scanner import get_log_index
+from utils.py_logger import log_step, logger
+from utils.testutil import (check_maintenance_time, wait_blocks,
+                            wait_until_maintenance_finished,
+                            write_result_to_csv)
+
+
+# market fee of revenue assets, 100 means 1%
+REVENUE_ASSET_MARKET_FEE = 100
+REVENUE_ASSET_PRECISION = 0
+STOCK_ASSET_PRECISION = 0
+STOCK_AMOUNT_PER_HOLDER = 10
+TRADE_AMOUNT = 100
+# BTS reserved for the fee of every limit order
+ORDER_FEE = 10
+# holders balance is not used, but accounts creation requires transfer
+HOLDER_BALANCE = 1
+# marginal cost per 1k holders that is considered as non-linear scaling
+NON_LINEAR_RATIO = 1.5
+BEFORE_POINT_SNAPSHOT = 'before_maintenance_point'
+
+
+def is_enabled(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def calculate_scaling_curve(points):
+    """points is a list of (holders_count, duration_ms).
+    Returns list of (holders_count, ms per 1k holders, marginal ms per 1k
+    holders since the previous point)"""
+    curve = list()
+    previous = None
+    for holders_count, duration in sorted(points):
+        ms_per_1k = 1000.0 * duration / holders_count
+        marginal = None
+        if previous is not None and holders_count > previous[0]:
+            marginal = 1000.0 * (duration - previous[1]) / \
+                (holders_count - previous[0])
+        curve.append((holders_count, ms_per_1k, marginal))
+        previous = holders_count, duration
+    return curve
+
+
+def find_non_linear_point(curve):
+    """Returns holders count where marginal cost grows NON_LINEAR_RATIO
+    times compared to the first segment"""
+    marginals = [(holders_count, marginal) for holders_count, _, marginal
+                 in curve if marginal is not None]
+    if not marginals or marginals[0][1] <= 0:
+        return None
+    base = marginals[0][1]
+    for holders_count, marginal in marginals[1:]:
+        if marginal > base * NON_LINEAR_RATIO:
+            return holders_count
+    return None
+
+
+@pytest.fixture(scope='module')
+def maintenance_points(results_store, benchmark_params):
+    # revenue assets count -> list of (holders_count, duration_ms)
+    points = dict()
+    yield points
+
+    for revenue_assets_count, series in sorted(points.items()):
+        curve = calculate_scaling_curve(series)
+        for holders_count, ms_per_1k, marginal in curve:
+            params = dict(benchmark_params, holders_count=holders_count,
+                          issuer_assets_count=revenue_assets_count)
+            logger.info(
+                'revenue assets: %s, holders: %s, %.2f ms per 1k holders, '
+                'marginal: %s' % (revenue_assets_count, holders_count,
+                                  ms_per_1k, marginal))
+            results_store.record('maintenance_ms_per_1k_holders', ms_per_1k,
+                                 'ms', params, marginal_ms_per_1k=marginal)
+        non_linear_point = find_non_linear_point(curve)
+        if non_linear_point is not None:
+            logger.info('Maintenance stops scaling linearly at %s holders '
+                        '(%s revenue assets)' % (non_linear_point,
+                                                 revenue_assets_count))
+
+
+@pytest.fixture(scope='module')
+def chain_population():
+    # holders and revenue assets per issuers pair created on this chain,
+    # used when points cannot be started from a snapshot
+    return dict(holders_count=0, revenue_assets_count=0)
+
+
+def create_revenue_assets(issuer, count):
+    options = prepare_reward_user_asset_options(REVENUE_ASSET_MARKET_FEE, 0)
+    return create_new_user_assets(issuer.name, REVENUE_ASSET_PRECISION, count,
+                                  options)
+
+
+def distribute_stock_asset(stock_asset, holders):
+    with CLI_WALLET.batch() as batch:
+        for holder in holders:
+            batch.send_request(
+                "transfer", [stock_asset.registrar, holder.name,
+                             STOCK_AMOUNT_PER_HOLDER, stock_asset.name, "",
+                             True])
+    wait_blocks()
+
+
+def trade_revenue_assets(revenue_assets, sellers):
+    """Sellers are paired: the first one sells revenue asset for BTS, the
+    second one buys it, so market fee is charged in revenue asset"""
+    pairs = zip(sellers[::2], sellers[1::2])
+    for asset in revenue_assets:
+        for asset_seller, _ in pairs:
+            CLI_WALLET.issue_asset(asset_seller.name, TRADE_AMOUNT, asset.name)
+    wait_blocks()
+    for asset in revenue_assets:
+        for asset_seller, asset_buyer in pairs:
+            CLI_WALLET.sell_asset(asset_seller.name, TRADE_AMOUNT, asset.name,
+                                  TRADE_AMOUNT, 'BTS', 300)
+            CLI_WALLET.sell_asset(asset_buyer.name, TRADE_AMOUNT, 'BTS',
+                                  TRADE_AMOUNT, asset.name, 300)
+    wait_blocks()
+
+
+def populate_chain(issuers_pairs_count, revenue_assets_count, holders_count,
+                   sellers_count, bts_for_issuers, with_fba):
+    log_step('Create %s issuers pairs' % issuers_pairs_count)
+    issuers = create_accounts(2 * issuers_pairs_count,
+                              balance=bts_for_issuers, lifetime=True)
+    revenue_issuers, stock_issuers = issuers[::2], issuers[1::2]
+
+    log_step('Create %s revenue assets per pair' % revenue_assets_count)
+    revenue_assets = list()
+    for revenue_issuer in revenue_issuers:
+        revenue_assets.append(
+            create_revenue_assets(revenue_issuer, revenue_assets_count))
+
+    log_step('Create %s holders' % holders_count)
+    holders = create_accounts(holders_count, balance=HOLDER_BALANCE)
+
+    if is_enabled(with_fba):
+        log_step('Create stock assets and distribute them between holders')
+        holders_per_pair = max(holders_count // issuers_pairs_count, 1)
+        for index, stock_issuer in enumerate(stock_issuers):
+            pair_holders = holders[index * holders_per_pair:
+                                   (index + 1) * holders_per_pair]
+            stock_asset = create_stock_asset(
+                stock_issuer.name, STOCK_AMOUNT_PER_HOLDER * len(pair_holders),
+                STOCK_ASSET_PRECISION,
+                [asset.id for asset in revenue_assets[index]])
+            distribute_stock_asset(stock_asset, pair_holders)
+
+    log_step('Trade revenue assets by %s sellers' % sellers_count)
+    # every seller places an order for each revenue asset of every pair
+    orders_count = issuers_pairs_count * revenue_assets_count
+    sellers = create_accounts(sellers_count,
+                              balance=orders_count * (TRADE_AMOUNT +
+                                                      ORDER_FEE))
+    for assets in revenue_assets:
+        trade_revenue_assets(assets, sellers)
+
+
+def test_maintenance_time_scaling(docker_dir, issuers_pairs_count,
+                                  holders_sweep_count,
+                                  revenue_assets_sweep_count, sellers_count,
+                                  bts_for_issuers, with_fba, csv_file_name,
+                                  benchmark_params, maintenance_points,
+                                  chain_snapshots, chain_population):
+    log_file_path = os.path.join(docker_dir, 'log')
+    if not os.path.exists(log_file_path):
+        pytest.skip('witness log is not found in %s' % docker_dir)
+    holders_count = int(holders_sweep_count)
+    revenue_assets_count = int(revenue_assets_sweep_count)
+    params = dict(benchmark_params, holders_count=holders_count,
+                  issuer_assets_count=revenue_assets_count)
+    if chain_snapshots is not None:
+        # the first point saves the chain, the next ones restore it, so
+        # maintenances of the same blocks are logged again
+        chain_snapshots.checkpoint(BEFORE_POINT_SNAPSHOT, lambda: None)
+        get_log_index(log_file_path).skip_scanned()
+
+    populate_chain(int(issuers_pairs_count), revenue_assets_count,
+                   holders_count, int(sellers_count), bts_for_issuers,
+                   with_fba)
+    if chain_snapshots is None:
+        chain_population['holders_count'] += holders_count
+        chain_population['revenue_assets_count'] += revenue_assets_count
+        params.update(
+            chain_holders_count=chain_population['holders_count'],
+            chain_issuer_assets_count=chain_population[
+                'revenue_assets_count'])
+        logger.info('Chain is not restored between points, it has %s '
+                    'holders and %s revenue assets per pair' % (
+                        chain_population['holders_count'],
+                        chain_population['revenue_assets_count']))
+
+    log_step('Measure the next maintenance')
+    block_before_maintenance = CLI_WALLET.get_head_block_number()
+    wait_until_maintenance_finished()
+    # witness writes "Finished" line after the maintenance block
+    wait_blocks(2)
+    duration = check_maintenance_time(docker_dir, block_before_maintenance)
+    logger.info('Maintenance time: %s ms' % duration)
+
+    write_result_to_csv(csv_file_name, duration, params=params)
+    maintenance_points.setdefault(revenue_assets_count, []).append(
+        (holders_count, duration))
@@ -0,0 +1,48 @@
+# Order ids of the open-loop order load generator, see utils/order_load.py
+
+import time
+import pytest
+from datetime import datetime
+from utils.order_load import OrderLoadGenerator, prepare_order_load
+from utils.sim_chain import get_sim_chain
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+@pytest.fixture
+def clock():
+    """(clock, sleep) of the generator, the virtual clock of the simulated
+    chain produces blocks while the generator sleeps"""
+    chain = get_sim_chain()
+    if chain is None:
+        return time.time, time.sleep
+    return lambda: (chain.now() - EPOCH).total_seconds(), chain.sleep
+
+
+@pytest.mark.parametrize('with_results', [True, False])
+def test_all_orders_are_filled(monkeypatch, clock, with_results):
+    # an account places one order: the same order of the same account
+    # would be a duplicate transaction
+    pairs, asset = prepare_order_load(2)
+    generator = OrderLoadGenerator(pairs, asset, orders_per_second=2,
+                                   duration=2, concurrency=2,
+                                   clock=clock[0], sleep=clock[1])
+    if not with_results:
+        sell_asset = generator.wallet.sell_asset
+
+        def sell_asset_without_results(*arguments):
+            # cli_wallet replies with signed transaction only, order ids
+            # are read from blocks
+            result = sell_asset(*arguments)
+            result.pop('operation_results', None)
+            return result
+        monkeypatch.setattr(generator.wallet, 'sell_asset',
+                            sell_asset_without_results)
+
+    report = generator.run()
+
+    assert report['accepted'] == report['scheduled'] == 4
+    assert report['filled'] == 4
+    assert report['unfilled'] == 0
+    assert report['fill_latency_p50'] is not None
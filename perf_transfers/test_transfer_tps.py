@@ -0,0 +1,240 @@
+# Transfer throughput through cli_wallet. The same number of transfers
+# between funded accounts is broadcast in three ways:
+#   serial    - one "transfer" call after another
+#   pipelined - "transfer" calls from a Pipeline, without waiting for
+#               previous calls; swept over concurrency levels
+#   builder   - CliWallet.build_transactions with up to --builder_ops
+#               transfers per transaction
+# Accepted transactions of every way are confirmed with await_included().
+# Run e.g.:
+#   python -m pytest perf_transfers/ --transfer_senders=20 \
+#       --transfers_count=1000 --transfer_concurrency_sweep=1,8,32,128
+
+import time
+import itertools
+import pytest
+from utils.account import create_accounts
+from utils.async_client import gather
+from utils.b3_exceptions import BitshareStatusCodeError
+from utils.cli_wallet import CLI_WALLET, split_operations
+from utils.constants import DEFAULT_CORE_ASSET, TRANSFER_OPERATION
+from utils.order_load import calculate_percentile, LATENCY_PERCENTILES
+from utils.pipeline import (Pipeline, await_included, get_signed_transaction,
+                            get_transaction_ids)
+from utils.py_logger import log_step, logger
+
+
+CORE_ASSET_ID = '1.3.0'
+CORE_ASSET_PRECISION = 5
+SENDER_BALANCE = 100000
+# transfers with the same sender, receiver and amount are duplicate
+# transactions, so every transfer of the session gets its own amount
+MAX_AMOUNT = 99999
+
+_amounts = itertools.count()
+
+
+def get_transfers(senders, count):
+    """Returns list of (from, to, satoshi amount), every sender sends to
+    the next one"""
+    transfers = list()
+    for index in xrange(count):
+        sender = senders[index % len(senders)]
+        receiver = senders[(index + 1) % len(senders)]
+        transfers.append((sender, receiver, next(_amounts) % MAX_AMOUNT + 1))
+    return transfers
+
+
+def format_amount(satoshi):
+    return '%.*f' % (CORE_ASSET_PRECISION,
+                     satoshi / float(10 ** CORE_ASSET_PRECISION))
+
+
+def prepare_transfer_operation(transfer):
+    sender, receiver, satoshi = transfer
+    return [TRANSFER_OPERATION, {
+        "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+        "from": sender.id,
+        "to": receiver.id,
+        "amount": {"amount": satoshi, "asset_id": CORE_ASSET_ID},
+        "extensions": []
+    }]
+
+
+def timed_call(ops_count, function, *arguments):
+    """Returns (latency in seconds, error message or None, ops_count,
+    signed transaction or None)"""
+    started = time.time()
+    try:
+        result = function(*arguments)
+    except BitshareStatusCodeError as e:
+        return time.time() - started, str(e), ops_count, None
+    return time.time() - started, None, ops_count, \
+        get_signed_transaction(result)
+
+
+def send_transfer(wallet, transfer):
+    sender, receiver, satoshi = transfer
+    return timed_call(1, wallet.transfer, sender.name, receiver.name,
+                      format_amount(satoshi), DEFAULT_CORE_ASSET)
+
+
+def send_builder_transaction(wallet, arguments):
+    """arguments are operations that fit into one transaction and
+    maximum transaction size they are split by"""
+    operations, max_size = arguments
+
+    def broadcast():
+        transaction, = wallet.build_transactions(
+            operations, len(operations), max_size)
+        return transaction
+    return timed_call(len(operations), broadcast)
+
+
+def count_ops_per_block(results, first_block):
+    """Waits for transactions of accepted calls, returns counts of their
+    operations in blocks that include any of them"""
+    accepted = [(transaction, ops_count)
+                for _, error, ops_count, transaction in results if not error]
+    tx_ids = get_transaction_ids([transaction for transaction, _ in accepted])
+    blocks = await_included(tx_ids, first_block)
+    counts = dict()
+    for tx_id, (_, ops_count) in zip(tx_ids, accepted):
+        counts[blocks[tx_id]] = counts.get(blocks[tx_id], 0) + ops_count
+    return [counts[number] for number in sorted(counts)]
+
+
+def make_report(results, broadcast_time, ops_per_block):
+    """results is a list of (latency, error, ops_count, transaction) of
+    every call. Counts and rates are per operation, latencies are per
+    call"""
+    latencies = sorted(latency for latency, error, _, _ in results
+                       if not error)
+    errors = [error for _, error, _, _ in results if error]
+    accepted = sum(ops_count for _, error, ops_count, _ in results
+                   if not error)
+    rejected = sum(ops_count for _, error, ops_count, _ in results if error)
+    report = {
+        'accepted': accepted,
+        'rejected': rejected,
+        'rejection_rate': float(rejected) / (accepted + rejected)
+        if accepted + rejected else 0.0,
+        'tps': accepted / broadcast_time if broadcast_time else 0.0,
+        'ops_per_block': float(sum(ops_per_block)) / len(ops_per_block)
+        if ops_per_block else 0.0,
+        'max_ops_per_block': max(ops_per_block) if ops_per_block else 0,
+        'first_error': errors[0] if errors else None,
+    }
+    for percent in LATENCY_PERCENTILES:
+        latency = calculate_percentile(latencies, percent)
+        report['latency_p%s_ms' % percent] = None if latency is None \
+            else latency * 1000
+    return report
+
+
+def run_transfers(path, calls, send, concurrency=1):
+    """calls is a list of arguments of send(wallet, arguments), they send
+    transfers"""
+    log_step('Broadcast %s %s calls with concurrency %s' % (
+        len(calls), path, concurrency))
+    first_block = CLI_WALLET.get_head_block_number() + 1
+    if concurrency > 1:
+        with Pipeline(concurrency) as pipeline:
+            started = time.time()
+            results = gather([pipeline.call(send, arguments)
+                              for arguments in calls])
+            broadcast_time = time.time() - started
+    else:
+        started = time.time()
+        results = [send(CLI_WALLET, arguments) for arguments in calls]
+        broadcast_time = time.time() - started
+
+    log_step('Wait for accepted transfers to be included into blocks')
+    ops_per_block = count_ops_per_block(results, first_block)
+    report = make_report(results, broadcast_time, ops_per_block)
+    logger.info('%s transfers report: %s' % (path, report))
+    return report
+
+
+def record_report(results_store, report, params):
+    results_store.record('transfer_tps', report['tps'], 'op/s', params,
+                         higher_is_better=True, accepted=report['accepted'])
+    results_store.record('transfer_ops_per_block', report['ops_per_block'],
+                         'op', params, higher_is_better=True,
+                         max_ops_per_block=report['max_ops_per_block'])
+    results_store.record('transfer_rejection_rate', report['rejection_rate'],
+                         'ratio', params, first_error=report['first_error'])
+    for percent in LATENCY_PERCENTILES:
+        latency = report['latency_p%s_ms' % percent]
+        if latency is not None:
+            results_store.record('transfer_broadcast_latency_p%s' % percent,
+                                 latency, 'ms', params)
+
+
+@pytest.fixture(scope='module')
+def senders(request):
+    count = int(request.config.getoption('transfer_senders'))
+    log_step('Create %s funded senders' % count)
+    accounts = create_accounts(count, balance=SENDER_BALANCE)
+    # ids are needed by builder transactions, get them before measuring
+    for account in accounts:
+        account.id
+    return accounts
+
+
+@pytest.fixture(scope='module')
+def rejection_points(results_store, benchmark_params):
+    # concurrency -> rejection rate of pipelined transfers
+    points = dict()
+    yield points
+
+    rejecting = [concurrency for concurrency, rate in sorted(points.items())
+                 if rate > 0]
+    if rejecting:
+        logger.info('Node starts rejecting transfers at concurrency %s' %
+                    rejecting[0])
+        results_store.record('transfer_rejection_concurrency', rejecting[0],
+                             'threads', benchmark_params,
+                             higher_is_better=True)
+    elif points:
+        logger.info('No rejected transfers up to concurrency %s' %
+                    max(points))
+
+
+def test_serial_transfer_tps(senders, transfers_count, results_store,
+                             benchmark_params):
+    transfers = get_transfers(senders, int(transfers_count))
+    report = run_transfers('serial', transfers, send_transfer)
+    record_report(results_store, report,
+                  dict(benchmark_params, path='serial', concurrency=1))
+    assert report['accepted'] > 0
+
+
+def test_pipelined_transfer_tps(senders, transfers_count, transfer_concurrency,
+                                results_store, benchmark_params,
+                                rejection_points):
+    concurrency = int(transfer_concurrency)
+    transfers = get_transfers(senders, int(transfers_count))
+    report = run_transfers('pipelined', transfers, send_transfer,
+                           concurrency)
+    rejection_points[concurrency] = report['rejection_rate']
+    record_report(results_store, report,
+                  dict(benchmark_params, path='pipelined',
+                       concurrency=concurrency))
+    assert report['accepted'] > 0
+
+
+def test_builder_transfer_tps(senders, transfers_count, builder_ops,
+                              results_store, benchmark_params):
+    ops = int(builder_ops)
+    transfers = get_transfers(senders, int(transfers_count))
+    max_size = CLI_WALLET.get_global_parameters()['maximum_transaction_size']
+    chunks = split_operations(
+        [prepare_transfer_operation(transfer) for transfer in transfers],
+        max_size, ops)
+    report = run_transfers('builder', [(chunk, max_size) for chunk in chunks],
+                           send_builder_transaction)
+    record_report(results_store, report,
+                  dict(benchmark_params, path='builder', concurrency=1,
+                       builder_ops=ops))
+    assert report['accepted'] > 0
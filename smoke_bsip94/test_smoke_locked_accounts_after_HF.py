@@ -1,5 +1,5 @@
 from utils.py_logger import log_step, logger
-from utils.account import create_account_with_balance
+from utils.account import create_account_with_balance, create_accounts
 from utils.b3_exceptions import BitshareStatusCodeError
 
 
@@ -33,9 +33,7 @@ def test_try_to_link_account_to_account_with_empty_authority():
 
 def test_try_to_lock_account_via_cycle():
     log_step('Create 3 accounts')
-    account_1 = create_account_with_balance()
-    account_2 = create_account_with_balance()
-    account_3 = create_account_with_balance()
+    account_1, account_2, account_3 = create_accounts(3)
 
     log_step('Set account_2 to account_1 authorities')
     account_1.update_authorities(
@@ -59,10 +57,7 @@ def test_try_to_lock_account_via_cycle():
 def test_create_locked_in_depth_account():
     log_step('Create 4 accounts')
 
-    account_1 = create_account_with_balance()
-    account_2 = create_account_with_balance()
-    account_3 = create_account_with_balance()
-    account_4 = create_account_with_balance()
+    account_1, account_2, account_3, account_4 = create_accounts(4)
 
     log_step('Link account_1 authorities to account_2')
     account_1.update_authorities(
@@ -89,10 +84,7 @@ def test_create_locked_in_depth_account():
 def test_create_locked_in_depth_account_reverse_order():
     log_step('Create 4 accounts')
 
-    account_1 = create_account_with_balance()
-    account_2 = create_account_with_balance()
-    account_3 = create_account_with_balance()
-    account_4 = create_account_with_balance()
+    account_1, account_2, account_3, account_4 = create_accounts(4)
 
     log_step('Link account_3 authorities to account_4')
     account_3.update_authorities(
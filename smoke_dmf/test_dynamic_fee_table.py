@@ -0,0 +1,52 @@
+# Dynamic fee table lookup of utils/fee_oracle.py, no chain is needed
+
+import pytest
+from utils.fee_oracle import DynamicFeeTable, DynamicFees
+
+
+EXTENSIONS = {
+    "dynamic_fees": {
+        "maker_fee": [{"amount": 0, "percent": 500},
+                      {"amount": 1000, "percent": 100}],
+        "taker_fee": [{"amount": 0, "percent": 2000},
+                      {"amount": 1000, "percent": 1000},
+                      {"amount": 5000, "percent": 0}]
+    }
+}
+
+
+@pytest.mark.parametrize('volume, percent', [
+    (0, 2000), (999, 2000), (1000, 1000), (1001, 1000), (4999, 1000),
+    (5000, 0), (10 ** 18, 0)])
+def test_taker_percent_at_amount_boundaries(volume, percent):
+    assert DynamicFees(EXTENSIONS).get_percents(volume, False) == [percent]
+
+
+@pytest.mark.parametrize('volume, percent', [
+    (0, 500), (999, 500), (1000, 100)])
+def test_maker_percent_at_amount_boundaries(volume, percent):
+    assert DynamicFees(EXTENSIONS).get_percents(volume, True) == [percent]
+
+
+def test_volume_below_first_row_has_no_fee():
+    table = DynamicFeeTable([{"amount": 100, "percent": 1000}])
+    assert table.get_percents([0, 99, 100]) == [0, 0, 1000]
+
+
+def test_unsorted_rows_and_first_of_same_amount():
+    table = DynamicFeeTable([{"amount": 1000, "percent": 100},
+                             {"amount": 0, "percent": 300},
+                             {"amount": 1000, "percent": 200}])
+    assert table.get_percents([999, 1000]) == [300, 100]
+
+
+def test_fees_of_boundary_percents_are_rounded_down():
+    extensions = {
+        "dynamic_fees": {
+            "maker_fee": [{"amount": 0, "percent": 1}],
+            "taker_fee": [{"amount": 0, "percent": 10000}]
+        }
+    }
+    fees = DynamicFees(extensions)
+    assert fees.calculate_fees([9999, 9999], 0, [True, False]) == [0, 9999]
+    assert fees.calculate_fees(9999, 0, False, max_market_fees=400) == [400]
@@ -1,14 +1,17 @@
 import pytest
 from utils.py_logger import log_step
-from utils.account import create_account_with_balance
 from utils.dmf_asset import (create_dmf_asset, prepare_dmf_asset_options,
                              DMFAsset)
+from utils.cli_wallet import CLI_WALLET
 from utils.constants import DEFAULT_CORE_ASSET
-from utils.testutil import calculate_percent, generate_new_asset_name
+from utils.fee_oracle import DynamicFees
+from utils.testutil import (calculate_trade_statistics,
+                            generate_new_asset_name, wait_blocks,
+                            wait_until_maintenance_finished)
 
 
 @pytest.mark.parametrize('taker_fee_percent', [0, 1, 9999, 10000])
-def test_set_boundary_percent_then_trade_dmf_and_check_taker_balance(taker_fee_percent):  # noqa flake8
+def test_set_boundary_percent_then_trade_dmf_and_check_taker_balance(taker_fee_percent, take_account):  # noqa flake8
 
     precision = 0
     precision_value = 10 ** precision
@@ -16,9 +19,9 @@ def test_set_boundary_percent_then_trade_dmf_and_check_taker_balance(taker_fee_p
     amount_to_issue = 100000
     amount_to_sell = 10000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -38,8 +41,8 @@ def test_set_boundary_percent_then_trade_dmf_and_check_taker_balance(taker_fee_p
                          dmf_asset.name)
 
     log_step('Calculate expected taker balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               taker_fee_percent)
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=0, is_maker=False)[0]
     expected_account_2_balance = amount_to_sell - expected_account_2_fee
 
     log_step('Check taker balance')
@@ -48,7 +51,7 @@ def test_set_boundary_percent_then_trade_dmf_and_check_taker_balance(taker_fee_p
 
 
 @pytest.mark.parametrize('maker_fee_percent', [0, 1, 9999, 10000])
-def test_set_boundary_percent_then_trade_dmf_and_check_maker_balance(maker_fee_percent):  # noqa flake8
+def test_set_boundary_percent_then_trade_dmf_and_check_maker_balance(maker_fee_percent, take_account):  # noqa flake8
 
     precision = 0
     precision_value = 10 ** precision
@@ -56,9 +59,9 @@ def test_set_boundary_percent_then_trade_dmf_and_check_maker_balance(maker_fee_p
     amount_to_issue = 100000
     amount_to_sell = 10000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -78,8 +81,8 @@ def test_set_boundary_percent_then_trade_dmf_and_check_maker_balance(maker_fee_p
                          DEFAULT_CORE_ASSET)
 
     log_step('Calculate expected maker balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               maker_fee_percent)
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=0, is_maker=True)[0]
     expected_account_2_balance = amount_to_sell - expected_account_2_fee
 
     log_step('Check taker balance')
@@ -87,7 +90,7 @@ def test_set_boundary_percent_then_trade_dmf_and_check_maker_balance(maker_fee_p
     assert account_2_balance == expected_account_2_balance
 
 
-def test_amount_to_sell_is_more_than_first_border_value_so_check_that_applied_fee_is_correct():  # noqa flake8
+def test_amount_to_sell_is_more_than_first_border_value_so_check_that_applied_fee_is_correct(take_account):  # noqa flake8
 
     precision = 0
     precision_value = 10 ** precision
@@ -98,9 +101,9 @@ def test_amount_to_sell_is_more_than_first_border_value_so_check_that_applied_fe
     taker_fee_percent_1 = 2000
     taker_fee_percent_2 = 1000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -121,8 +124,8 @@ def test_amount_to_sell_is_more_than_first_border_value_so_check_that_applied_fe
                          dmf_asset.name)
 
     log_step('Calculate expected taker balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               taker_fee_percent_1)
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=0, is_maker=False)[0]
     expected_account_2_balance = amount_to_sell - expected_account_2_fee
 
     log_step('Check taker balance')
@@ -130,7 +133,8 @@ def test_amount_to_sell_is_more_than_first_border_value_so_check_that_applied_fe
     assert account_2_balance == expected_account_2_balance
 
 
-def test_update_taker_trade_statistics_and_check_that_applied_fee_is_correct():
+def test_update_taker_trade_statistics_and_check_that_applied_fee_is_correct(
+        take_account):
 
     precision = 0
     precision_value = 10 ** precision
@@ -141,9 +145,9 @@ def test_update_taker_trade_statistics_and_check_that_applied_fee_is_correct():
     taker_fee_percent_1 = 2000
     taker_fee_percent_2 = 1000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -174,8 +178,10 @@ def test_update_taker_trade_statistics_and_check_that_applied_fee_is_correct():
                          dmf_asset.name)
 
     log_step('Calculate expected account balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               taker_fee_percent_2)
+    # the first trade is in the trade statistics
+    volume = amount_to_sell * precision_value
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=volume, is_maker=False)[0]
     expected_account_2_balance = amount_to_sell - expected_account_2_fee
 
     log_step('Check account balance')
@@ -183,7 +189,8 @@ def test_update_taker_trade_statistics_and_check_that_applied_fee_is_correct():
     assert account_2_balance == expected_account_2_balance
 
 
-def test_update_maker_trade_statistics_and_check_that_applied_fee_is_correct():
+def test_update_maker_trade_statistics_and_check_that_applied_fee_is_correct(
+        take_account):
 
     precision = 0
     precision_value = 10 ** precision
@@ -194,9 +201,9 @@ def test_update_maker_trade_statistics_and_check_that_applied_fee_is_correct():
     maker_fee_percent_1 = 2000
     maker_fee_percent_2 = 1000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -227,8 +234,10 @@ def test_update_maker_trade_statistics_and_check_that_applied_fee_is_correct():
                          DEFAULT_CORE_ASSET)
 
     log_step('Calculate expected account balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               maker_fee_percent_2)
+    # the first trade is in the trade statistics
+    volume = amount_to_sell * precision_value
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=volume, is_maker=True)[0]
     expected_account_2_balance = amount_to_sell - expected_account_2_fee
 
     log_step('Check account balance')
@@ -236,7 +245,7 @@ def test_update_maker_trade_statistics_and_check_that_applied_fee_is_correct():
     assert account_2_balance == expected_account_2_balance
 
 
-def test_update_trade_statistics_as_taker_then_use_it_as_maker():
+def test_update_trade_statistics_as_taker_then_use_it_as_maker(take_account):
 
     precision = 0
     precision_value = 10 ** precision
@@ -250,9 +259,9 @@ def test_update_trade_statistics_as_taker_then_use_it_as_maker():
     taker_fee_percent_1 = 2000
     taker_fee_percent_2 = 1000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -284,8 +293,10 @@ def test_update_trade_statistics_as_taker_then_use_it_as_maker():
                          DEFAULT_CORE_ASSET)
 
     log_step('Calculate expected account balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               maker_fee_percent_2)
+    # the first trade is in the trade statistics
+    volume = amount_to_sell * precision_value
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=volume, is_maker=True)[0]
     expected_account_2_balance = amount_to_sell - expected_account_2_fee
 
     log_step('Check account balance')
@@ -293,7 +304,7 @@ def test_update_trade_statistics_as_taker_then_use_it_as_maker():
     assert account_2_balance == expected_account_2_balance
 
 
-def test_update_trade_statistics_as_maker_then_use_it_as_taker():
+def test_update_trade_statistics_as_maker_then_use_it_as_taker(take_account):
 
     precision = 0
     precision_value = 10 ** precision
@@ -307,9 +318,9 @@ def test_update_trade_statistics_as_maker_then_use_it_as_taker():
     taker_fee_percent_1 = 2000
     taker_fee_percent_2 = 1000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -341,8 +352,10 @@ def test_update_trade_statistics_as_maker_then_use_it_as_taker():
                          dmf_asset.name)
 
     log_step('Calculate expected account balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               taker_fee_percent_2)
+    # the first trade is in the trade statistics
+    volume = amount_to_sell * precision_value
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=volume, is_maker=False)[0]
     expected_account_2_balance = amount_to_sell - expected_account_2_fee
 
     log_step('Check account balance')
@@ -350,14 +363,14 @@ def test_update_trade_statistics_as_maker_then_use_it_as_taker():
     assert account_2_balance == expected_account_2_balance
 
 
-def test_max_market_fee_with_dmf_asset_for_maker():
+def test_max_market_fee_with_dmf_asset_for_maker(take_account):
 
     amount_to_issue = 10000
     amount_to_sell = 1000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     max_market_fee = 400
     extensions = {
@@ -385,18 +398,22 @@ def test_max_market_fee_with_dmf_asset_for_maker():
     account_2_balance = account_2.get_asset_account_balance(dmf_asset.name)
 
     log_step('Check account dmf balance')
-    expected_account_2_balance = amount_to_sell - max_market_fee
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell, volumes=0, is_maker=True,
+        max_market_fees=max_market_fee)[0]
+    assert expected_account_2_fee == max_market_fee
+    expected_account_2_balance = amount_to_sell - expected_account_2_fee
     assert account_2_balance == expected_account_2_balance
 
 
-def test_max_market_fee_with_dmf_asset_for_taker():
+def test_max_market_fee_with_dmf_asset_for_taker(take_account):
 
     amount_to_issue = 10000
     amount_to_sell = 1000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     max_market_fee = 400
     extensions = {
@@ -424,11 +441,15 @@ def test_max_market_fee_with_dmf_asset_for_taker():
     account_2_balance = account_2.get_asset_account_balance(dmf_asset.name)
 
     log_step('Check account balance')
-    expected_account_2_balance = amount_to_sell - max_market_fee
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell, volumes=0, is_maker=False,
+        max_market_fees=max_market_fee)[0]
+    assert expected_account_2_fee == max_market_fee
+    expected_account_2_balance = amount_to_sell - expected_account_2_fee
     assert account_2_balance == expected_account_2_balance
 
 
-def test_update_dmf_asset_table_then_check_applied_fee():
+def test_update_dmf_asset_table_then_check_applied_fee(take_account):
 
     precision = 0
     precision_value = 10 ** precision
@@ -439,9 +460,9 @@ def test_update_dmf_asset_table_then_check_applied_fee():
     taker_fee_percent_1 = 1000
     taker_fee_percent_2 = 500
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -478,8 +499,10 @@ def test_update_dmf_asset_table_then_check_applied_fee():
                          dmf_asset.name)
 
     log_step('Calculate expected account balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               taker_fee_percent_2)
+    # the first trade is in the trade statistics
+    volume = amount_to_sell * precision_value
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=volume, is_maker=False)[0]
     expected_account_2_balance = amount_to_sell - expected_account_2_fee
 
     log_step('Check account balance')
@@ -487,7 +510,8 @@ def test_update_dmf_asset_table_then_check_applied_fee():
     assert account_2_balance == expected_account_2_balance
 
 
-def test_trade_dmf_asset_and_check_if_accumulated_fees_are_correct():
+def test_trade_dmf_asset_and_check_if_accumulated_fees_are_correct(
+        take_account):
 
     precision = 0
     precision_value = 10 ** precision
@@ -498,9 +522,9 @@ def test_trade_dmf_asset_and_check_if_accumulated_fees_are_correct():
     maker_fee_percent = 2000
     taker_fee_percent = 1000
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
-    account_2 = create_account_with_balance(20000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
 
     extensions = {
         "dynamic_fees": {
@@ -520,9 +544,54 @@ def test_trade_dmf_asset_and_check_if_accumulated_fees_are_correct():
                          dmf_asset.name)
 
     log_step('Calculate expected account balance')
-    expected_account_2_fee = calculate_percent(amount_to_sell*precision_value,
-                                               taker_fee_percent)
+    expected_account_2_fee = DynamicFees(extensions).calculate_fees(
+        amount_to_sell * precision_value, volumes=0, is_maker=False)[0]
 
     log_step('Check accumulated fees')
     accumulated_fees = dmf_asset.get_accumulated_fees()
     assert accumulated_fees == expected_account_2_fee
+
+
+def test_trade_statistics_decay_after_maintenance(docker_dir, take_account):
+
+    precision = 0
+    amount_to_issue = 100000
+    amount_to_sell = 10000
+
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
+    account_2 = take_account()
+
+    extensions = {
+        "dynamic_fees": {
+            "maker_fee": [{"amount": 0, "percent": 500}],
+            "taker_fee": [{"amount": 0, "percent": 1000}]
+        }
+    }
+
+    log_step('Create dmf asset')
+    dmf_asset = create_dmf_asset(account_1.name, amount_to_issue,
+                                 precision=precision, extensions=extensions)
+
+    log_step('Sell assets between accounts')
+    account_1.sell_asset(amount_to_sell, dmf_asset.name, amount_to_sell,
+                         DEFAULT_CORE_ASSET)
+    account_2.sell_asset(amount_to_sell, DEFAULT_CORE_ASSET, amount_to_sell,
+                         dmf_asset.name)
+    wait_blocks()
+    first_block = CLI_WALLET.get_head_block_number()
+    start_amount = CLI_WALLET.get_trade_statistics(account_2.id,
+                                                   dmf_asset.id)
+    assert start_amount > 0
+
+    log_step('Wait for maintenance')
+    wait_until_maintenance_finished()
+    wait_blocks()
+    last_block = CLI_WALLET.get_head_block_number()
+
+    log_step('Check trade statistics decayed by performed maintenances')
+    expected_amount = calculate_trade_statistics(start_amount, first_block,
+                                                 last_block, docker_dir)
+    assert expected_amount < start_amount
+    amount = CLI_WALLET.get_trade_statistics(account_2.id, dmf_asset.id)
+    assert amount == expected_amount
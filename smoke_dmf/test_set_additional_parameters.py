@@ -1,6 +1,5 @@
 import pytest
 from utils.py_logger import log_step
-from utils.account import create_account_with_balance
 from utils.dmf_asset import (create_dmf_asset, prepare_dmf_asset_options,
                              DMFAsset)
 from utils.user_asset import create_user_asset
@@ -9,7 +8,7 @@ from copy import deepcopy
 from utils.testutil import generate_new_asset_name
 
 
-def test_create_dynamic_market_fee_asset():
+def test_create_dynamic_market_fee_asset(take_account):
 
     dmf_asset_flag = 512
     extensions = {
@@ -21,8 +20,8 @@ def test_create_dynamic_market_fee_asset():
         }
     }
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Create dmf asset')
     dmf_name = generate_new_asset_name()
@@ -38,10 +37,10 @@ def test_create_dynamic_market_fee_asset():
 
 
 @pytest.mark.parametrize('incorrect_flag', [256, 0])
-def test_try_to_create_dmf_asset_with_wrong_flag(incorrect_flag):
+def test_try_to_create_dmf_asset_with_wrong_flag(incorrect_flag, take_account):
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Try to create DMF asset with "%s" flag' % incorrect_flag)
     dmf_asset = DMFAsset(account_1.name)
@@ -57,10 +56,10 @@ def test_try_to_create_dmf_asset_with_wrong_flag(incorrect_flag):
     assert expected_error_message in response['error']['message']
 
 
-def test_try_to_create_dmf_asset_with_empty_table():
+def test_try_to_create_dmf_asset_with_empty_table(take_account):
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Prepare options with wrong flag')
     dmf_asset = DMFAsset(account_1.name)
@@ -98,10 +97,11 @@ def test_try_to_create_dmf_asset_with_empty_table():
 
 
 @pytest.mark.parametrize('trader', ['maker', 'taker'])
-def test_try_to_create_dmf_asset_with_only_non_zero_amount_in_table(trader):
+def test_try_to_create_dmf_asset_with_only_non_zero_amount_in_table(
+        trader, take_account):
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Prepare options with non zero amount in table')
     dmf_asset = DMFAsset(account_1.name)
@@ -128,10 +128,11 @@ def test_try_to_create_dmf_asset_with_only_non_zero_amount_in_table(trader):
 
 
 @pytest.mark.parametrize('trader', ['maker', 'taker'])
-def test_try_to_create_dmf_asset_with_incorrect_fee_percent_in_table(trader):
+def test_try_to_create_dmf_asset_with_incorrect_fee_percent_in_table(
+        trader, take_account):
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Prepare options with non zero amount in table')
     dmf_asset = DMFAsset(account_1.name)
@@ -158,10 +159,10 @@ def test_try_to_create_dmf_asset_with_incorrect_fee_percent_in_table(trader):
 
 
 @pytest.mark.parametrize('trader_fee', ['maker_fee', 'taker_fee'])
-def test_try_to_create_dmf_asset_with_duplicated_fee_amount_in_table(trader_fee):  # noqa flake8
+def test_try_to_create_dmf_asset_with_duplicated_fee_amount_in_table(trader_fee, take_account):  # noqa flake8
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Prepare options with non zero amount in table')
     dmf_asset = DMFAsset(account_1.name)
@@ -183,10 +184,11 @@ def test_try_to_create_dmf_asset_with_duplicated_fee_amount_in_table(trader_fee)
     assert dmf_asset.get_options()['extensions'] == extensions
 
 
-def test_create_dmf_asset_when_zero_amount_is_not_in_first_position_in_table():
+def test_create_dmf_asset_when_zero_amount_is_not_in_first_position_in_table(
+        take_account):
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Prepare options with non zero amount in table')
     dmf_asset = DMFAsset(account_1.name)
@@ -212,10 +214,10 @@ def test_create_dmf_asset_when_zero_amount_is_not_in_first_position_in_table():
     assert dmf_asset.get_options()['extensions'] == extensions
 
 
-def test_update_dmf_asset_to_user_asset():
+def test_update_dmf_asset_to_user_asset(take_account):
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Create dmf asset')
     dmf_asset = create_dmf_asset(account_1.name, 100000)
@@ -237,9 +239,10 @@ def test_update_dmf_asset_to_user_asset():
     assert final_options == new_options
 
 
-def test_change_only_flag_and_try_to_update_dmf_asset_to_user_asset():
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+def test_change_only_flag_and_try_to_update_dmf_asset_to_user_asset(
+        take_account):
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Create dmf asset')
     dmf_asset = create_dmf_asset(account_1.name, 100000)
@@ -259,9 +262,10 @@ def test_change_only_flag_and_try_to_update_dmf_asset_to_user_asset():
     assert expected_error_message in response['error']['message']
 
 
-def test_remove_only_fee_table_and_try_to_update_dmf_asset_to_user_asset():
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+def test_remove_only_fee_table_and_try_to_update_dmf_asset_to_user_asset(
+        take_account):
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Create dmf asset')
     dmf_asset = create_dmf_asset(account_1.name, 100000)
@@ -281,10 +285,10 @@ def test_remove_only_fee_table_and_try_to_update_dmf_asset_to_user_asset():
     assert expected_error_message in response['error']['message']
 
 
-def test_update_user_asset_to_dmf_asset():
+def test_update_user_asset_to_dmf_asset(take_account):
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Create user asset')
     user_asset = create_user_asset(account_1.name, 10000, 1,
@@ -304,10 +308,11 @@ def test_update_user_asset_to_dmf_asset():
     assert final_options == new_options
 
 
-def test_try_to_update_user_asset_with_zero_permissions_int_to_dmf_asset():
+def test_try_to_update_user_asset_with_zero_permissions_int_to_dmf_asset(
+        take_account):
 
-    log_step('Create new account')
-    account_1 = create_account_with_balance(10000)
+    log_step('Take new accounts from pool')
+    account_1 = take_account()
 
     log_step('Create user asset')
     user_asset = create_user_asset(account_1.name, 10000, 1,
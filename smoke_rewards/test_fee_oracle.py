@@ -0,0 +1,66 @@
+# Integer fee sharing math of utils/fee_oracle.py, no chain is needed
+
+import pytest
+from collections import namedtuple
+from utils.fee_oracle import (calculate_market_fees, calculate_rewards,
+                              to_satoshi)
+from utils.testutil import calculate_account_reward_amount
+
+
+Asset = namedtuple('Asset', 'name precision')
+
+
+@pytest.mark.parametrize('fee_percent, expected_fee', [
+    (0, 0), (1, 0), (9999, 9998), (10000, 9999)])
+def test_market_fee_bounds(fee_percent, expected_fee):
+    assert calculate_market_fees(9999, fee_percent) == [expected_fee]
+
+
+def test_market_fee_is_rounded_down_and_capped():
+    assert calculate_market_fees([199, 10000], 50, [None, 10]) == [0, 10]
+
+
+@pytest.mark.parametrize('reward_percent', [0, 10000])
+def test_reward_bounds(reward_percent):
+    rewards = calculate_rewards(1000, 1000, reward_percent, 0)
+    assert rewards['market_fee'] == [100]
+    assert rewards['reward'] == [100 * reward_percent // 10000]
+    assert rewards['accumulated_fee'] == [100 - rewards['reward'][0]]
+
+
+@pytest.mark.parametrize('referrer_percent, referrer_reward', [
+    (0, 0), (1000, 0), (3333, 2), (10000, 7)])
+def test_registrar_gets_referrer_remainder(referrer_percent,
+                                           referrer_reward):
+    # market fee 70, reward 7
+    rewards = calculate_rewards(700, 1000, 1000, referrer_percent)
+    assert rewards['reward'] == [7]
+    assert rewards['referrer_reward'] == [referrer_reward]
+    assert rewards['registrar_reward'] == [7 - referrer_reward]
+
+
+def test_account_reward_amounts_add_up_to_reward():
+    asset = Asset('TEST', 1)
+    # market fee 70 satoshi, reward 7, referrer gets 30%
+    referrer_reward = calculate_account_reward_amount(asset, 70, 1000, 1000,
+                                                      30)
+    registrar_reward = calculate_account_reward_amount(
+        asset, 70, 1000, 1000, 70, is_registrar=True)
+    assert (referrer_reward, registrar_reward) == (2, 5)
+
+
+def test_rewards_columns():
+    rewards = calculate_rewards([100, 150], 1000, 5000, [2000, 0])
+    assert rewards == {
+        'market_fee': [10, 15],
+        'reward': [5, 7],
+        'referrer_reward': [1, 0],
+        'registrar_reward': [4, 7],
+        'accumulated_fee': [5, 8],
+    }
+
+
+def test_to_satoshi():
+    assert to_satoshi([1, '0.5', 0.001], 3) == [1000, 500, 1]
+    with pytest.raises(ValueError):
+        to_satoshi(0.0001, 3)
@@ -22,7 +22,8 @@ def test_check_mfs_vesting_balance_with_zero_asset_rewards():
     assert account_1_list_rewards == []
 
 
-def test_check_mfs_vesting_balance_with_one_asset_reward(init_balances):
+def test_check_mfs_vesting_balance_with_one_asset_reward(
+        init_balances, take_lifetime_account):
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -33,8 +34,8 @@ def test_check_mfs_vesting_balance_with_one_asset_reward(init_balances):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -89,7 +90,8 @@ def test_check_mfs_vesting_balance_with_one_asset_reward(init_balances):
     assert mfs_vesting_balance.allowed_withdraw == asset_2_dict
 
 
-def test_check_mfs_vesting_balance_after_reward_updates(init_balances):
+def test_check_mfs_vesting_balance_after_reward_updates(
+        init_balances, take_lifetime_account):
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -102,8 +104,8 @@ def test_check_mfs_vesting_balance_after_reward_updates(init_balances):
 
     sells_count = 2
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -160,7 +162,7 @@ def test_check_mfs_vesting_balance_after_reward_updates(init_balances):
 
 
 def test_check_updated_mfs_vesting_balances_after_added_new_reward(
-        init_balances):
+        init_balances, take_lifetime_account):
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -171,8 +173,8 @@ def test_check_updated_mfs_vesting_balances_after_added_new_reward(
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -248,7 +250,7 @@ def test_check_updated_mfs_vesting_balances_after_added_new_reward(
     assert ref_1_asset_2_mfs_vb.asset_amount == exp_ref_1_asset_2_reward
 
 
-def test_check_updated_mfs_vesting_balances_after_withdraw_vesting_reward(init_balances):  # noqa flake8
+def test_check_updated_mfs_vesting_balances_after_withdraw_vesting_reward(init_balances, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -259,8 +261,8 @@ def test_check_updated_mfs_vesting_balances_after_withdraw_vesting_reward(init_b
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -353,7 +355,8 @@ def test_check_updated_mfs_vesting_balances_after_withdraw_vesting_reward(init_b
     assert current_ref_1_asset_2_mfs_vb.asset_amount == 0
 
 
-def test_check_list_account_rewards_with_wrong_values(init_balances):
+def test_check_list_account_rewards_with_wrong_values(
+        init_balances, take_lifetime_account):
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -364,8 +367,8 @@ def test_check_list_account_rewards_with_wrong_values(init_balances):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -412,7 +415,8 @@ def test_check_list_account_rewards_with_wrong_values(init_balances):
         assert 'assert_exception' in response['error']['message']
 
 
-def test_enumerate_2_rewards_on_referrer_vesting_balance(init_balances):
+def test_enumerate_2_rewards_on_referrer_vesting_balance(
+        init_balances, take_lifetime_account):
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -422,7 +426,7 @@ def test_enumerate_2_rewards_on_referrer_vesting_balance(init_balances):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer = create_account_with_balance(20000, lifetime=True)
+    referrer = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer.name,
@@ -482,7 +486,8 @@ def test_enumerate_2_rewards_on_referrer_vesting_balance(init_balances):
         assert mfs_vesting_balance.allowed_withdraw in assets_list
 
 
-def test_100_percent_as_max_asset_reward_value(init_balances):
+def test_100_percent_as_max_asset_reward_value(
+        init_balances, take_lifetime_account):
     precision = 0
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -493,8 +498,8 @@ def test_100_percent_as_max_asset_reward_value(init_balances):
     asset_1_amount = 10000
     asset_2_amount = 20000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -551,13 +556,13 @@ def test_100_percent_as_max_asset_reward_value(init_balances):
 
 @pytest.mark.skip(reason='Remove "skip" when functionality is merged')
 @pytest.mark.parametrize('reward_percent', [10100, 10001, -1, 'text', '#$%'])
-def test_check_asset_creation_with_incorrect_reward_value(init_balances,
-                                                          reward_percent):
+def test_check_asset_creation_with_incorrect_reward_value(
+        init_balances, reward_percent, take_lifetime_account):
     precision = 0
     asset_percent = 1000  # 1000 means 10%
     ref_percent = 10
 
-    referrer = create_account_with_balance(20000, lifetime=True)
+    referrer = take_lifetime_account()
 
     account = create_account_with_balance(balance=1000000,
                                           referrer=referrer.name,
@@ -575,7 +580,8 @@ def test_check_asset_creation_with_incorrect_reward_value(init_balances,
         print e.message
 
 
-def test_0_percent_as_min_asset_reward_value(init_balances):
+def test_0_percent_as_min_asset_reward_value(
+        init_balances, take_lifetime_account):
     precision = 0
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -586,10 +592,10 @@ def test_0_percent_as_min_asset_reward_value(init_balances):
     asset_1_amount = 10000
     asset_2_amount = 20000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
-    issuer_1 = create_account_with_balance(20000, lifetime=True)
-    issuer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
+    issuer_1 = take_lifetime_account()
+    issuer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
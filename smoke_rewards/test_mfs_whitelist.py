@@ -10,7 +10,7 @@ from utils.constants import DEFAULT_CORE_ASSET
 from utils.user_asset import UserAsset
 
 
-def test_add_registrar_to_mfs_whitelist_and_check_registrar_reward(init_balances):  # noqa flake8
+def test_add_registrar_to_mfs_whitelist_and_check_registrar_reward(init_balances, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -21,9 +21,9 @@ def test_add_registrar_to_mfs_whitelist_and_check_registrar_reward(init_balances
 
     registrar_2_percent = 100 - ref_2_percent
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -62,7 +62,7 @@ def test_add_registrar_to_mfs_whitelist_and_check_registrar_reward(init_balances
     log_step('Get expected registrar_2 reward')
     expected_registrar_2_reward = calculate_account_reward_amount(
         asset_1, asset_1_amount, asset_1_percent, reward_percent,
-        registrar_2_percent)
+        registrar_2_percent, is_registrar=True)
 
     log_step('Check mfs vesting balances of registrar_2 is correct')
     asset_1_dict = {'asset_id': asset_1.id,
@@ -74,7 +74,7 @@ def test_add_registrar_to_mfs_whitelist_and_check_registrar_reward(init_balances
     assert mfs_vesting_balance.allowed_withdraw == asset_1_dict
 
 
-def test_add_registrar_to_mfs_whitelist_and_check_referrer_reward(init_balances):  # noqa flake8
+def test_add_registrar_to_mfs_whitelist_and_check_referrer_reward(init_balances, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -83,9 +83,9 @@ def test_add_registrar_to_mfs_whitelist_and_check_referrer_reward(init_balances)
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -136,7 +136,8 @@ def test_add_registrar_to_mfs_whitelist_and_check_referrer_reward(init_balances)
     assert mfs_vesting_balance.allowed_withdraw == asset_1_dict
 
 
-def test_add_referrer_to_mfs_whitelist_and_check_all_rewards(init_balances):
+def test_add_referrer_to_mfs_whitelist_and_check_all_rewards(
+        init_balances, take_lifetime_account):
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -145,9 +146,9 @@ def test_add_referrer_to_mfs_whitelist_and_check_all_rewards(init_balances):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -192,7 +193,7 @@ def test_add_referrer_to_mfs_whitelist_and_check_all_rewards(init_balances):
     assert referrer_2_list_rewards == []
 
 
-def test_referrer_has_100_reward_percents_and_registrar_is_in_mfs_whitelist(init_balances):  # noqa flake8
+def test_referrer_has_100_reward_percents_and_registrar_is_in_mfs_whitelist(init_balances, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -201,9 +202,9 @@ def test_referrer_has_100_reward_percents_and_registrar_is_in_mfs_whitelist(init
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -254,7 +255,7 @@ def test_referrer_has_100_reward_percents_and_registrar_is_in_mfs_whitelist(init
     assert mfs_vesting_balance.allowed_withdraw == asset_1_dict
 
 
-def test_referrer_has_0_reward_percents_and_registrar_is_in_mfs_whitelist(init_balances):  # noqa flake8
+def test_referrer_has_0_reward_percents_and_registrar_is_in_mfs_whitelist(init_balances, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -263,9 +264,9 @@ def test_referrer_has_0_reward_percents_and_registrar_is_in_mfs_whitelist(init_b
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -305,7 +306,7 @@ def test_referrer_has_0_reward_percents_and_registrar_is_in_mfs_whitelist(init_b
 
 
 @pytest.mark.parametrize('referrer_percent', [100, 0])
-def test_referrer_has_0_or_100_reward_percents_and_referrer_is_in_mfs_whitelist(init_balances, referrer_percent):  # noqa flake8
+def test_referrer_has_0_or_100_reward_percents_and_referrer_is_in_mfs_whitelist(init_balances, referrer_percent, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -314,9 +315,9 @@ def test_referrer_has_0_or_100_reward_percents_and_referrer_is_in_mfs_whitelist(
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -361,7 +362,7 @@ def test_referrer_has_0_or_100_reward_percents_and_referrer_is_in_mfs_whitelist(
     assert referrer_2_list_rewards == []
 
 
-def test_add_1_of_2_registrars_to_mfs_whitelist_and_check_rewards(init_balances):  # noqa flake8
+def test_add_1_of_2_registrars_to_mfs_whitelist_and_check_rewards(init_balances, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -371,11 +372,11 @@ def test_add_1_of_2_registrars_to_mfs_whitelist_and_check_rewards(init_balances)
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    registrar_1 = create_account_with_balance(20000, lifetime=True)
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_1 = take_lifetime_account()
+    registrar_2 = take_lifetime_account()
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             registrar=registrar_1.name,
@@ -461,7 +462,7 @@ def test_try_to_create_asset_with_wrong_value_in_mfs_whitelist(init_balances, ca
     assert 'error' in result
 
 
-def test_remove_account_from_mfs_whitelist_by_updating_asset_so_mfs_whitelist_is_empty(init_balances):  # noqa flake8
+def test_remove_account_from_mfs_whitelist_by_updating_asset_so_mfs_whitelist_is_empty(init_balances, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -472,9 +473,9 @@ def test_remove_account_from_mfs_whitelist_by_updating_asset_so_mfs_whitelist_is
 
     registrar_2_percent = 100 - ref_2_percent
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -519,7 +520,7 @@ def test_remove_account_from_mfs_whitelist_by_updating_asset_so_mfs_whitelist_is
     log_step('Get expected registrar_2 reward')
     expected_registrar_2_reward = calculate_account_reward_amount(
         asset_1, asset_1_amount, asset_1_percent, reward_percent,
-        registrar_2_percent)
+        registrar_2_percent, is_registrar=True)
 
     log_step('Check mfs vesting balances of registrar_2 is correct')
     asset_1_dict = {'asset_id': asset_1.id,
@@ -531,7 +532,8 @@ def test_remove_account_from_mfs_whitelist_by_updating_asset_so_mfs_whitelist_is
     assert mfs_vesting_balance.allowed_withdraw == asset_1_dict
 
 
-def test_add_account_to_mfs_whitelist_by_updating_asset(init_balances):
+def test_add_account_to_mfs_whitelist_by_updating_asset(
+        init_balances, take_lifetime_account):
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -542,9 +544,9 @@ def test_add_account_to_mfs_whitelist_by_updating_asset(init_balances):
 
     registrar_2_percent = 100 - ref_2_percent
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -591,7 +593,7 @@ def test_add_account_to_mfs_whitelist_by_updating_asset(init_balances):
     log_step('Get expected registrar_2 reward')
     expected_registrar_2_reward = calculate_account_reward_amount(
         asset_1, asset_1_amount, asset_1_percent, reward_percent,
-        registrar_2_percent)
+        registrar_2_percent, is_registrar=True)
 
     log_step('Check mfs vesting balances of registrar_2 is correct')
     asset_1_dict = {'asset_id': asset_1.id,
@@ -603,7 +605,7 @@ def test_add_account_to_mfs_whitelist_by_updating_asset(init_balances):
     assert mfs_vesting_balance.allowed_withdraw == asset_1_dict
 
 
-def test_remove_account_from_mfs_whitelist_so_account_can_not_get_reward(init_balances):  # noqa flake8
+def test_remove_account_from_mfs_whitelist_so_account_can_not_get_reward(init_balances, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     reward_percent = 1000  # 1000 means 10%
@@ -612,9 +614,9 @@ def test_remove_account_from_mfs_whitelist_so_account_can_not_get_reward(init_ba
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    registrar_2 = create_account_with_balance(20000, lifetime=True)
+    registrar_2 = take_lifetime_account()
 
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000)
     account_2 = create_account_with_balance(balance=1000000,
@@ -36,3 +36,7 @@ def test_cli_wallet_transfer(params):
 
     amount = CLI_WALLET.get_core_account_balance(params) - balance
     assert amount == int(float(amount_to_transfer) * 100000)
+
+
+def test_cli_wallet_balance_of_unknown_asset():
+    assert CLI_WALLET.get_asset_account_balance('nathan', 'NOSUCHASSET') == 0
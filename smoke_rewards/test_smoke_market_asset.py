@@ -8,7 +8,8 @@ from utils.testutil import (calculate_account_reward_amount, wait_blocks,
 from utils.market_asset import create_market_asset
 
 
-def test_check_that_market_assets_transferred_when_order_was_closed(committee):
+def test_check_that_market_assets_transferred_when_order_was_closed(
+        committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 100  # 100 means 1%
     asset_2_percent = 200  # 200 means 2%
@@ -19,8 +20,8 @@ def test_check_that_market_assets_transferred_when_order_was_closed(committee):
     asset_1_amount = 400000
     asset_2_amount = 800000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -76,7 +77,8 @@ def test_check_that_market_assets_transferred_when_order_was_closed(committee):
             asset_1_amount * (10 ** precision) - asset_1_full_fee)
 
 
-def test_check_accumulated_fees_after_order_was_closed(committee):
+def test_check_accumulated_fees_after_order_was_closed(
+        committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 100  # 100 means 1%
     asset_2_percent = 200  # 200 means 2%
@@ -87,8 +89,8 @@ def test_check_accumulated_fees_after_order_was_closed(committee):
     asset_1_amount = 400000
     asset_2_amount = 800000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -146,7 +148,7 @@ def test_check_accumulated_fees_after_order_was_closed(committee):
     assert asset_2_accumulated_fees == asset_2_full_fee - asset_2_reward_amount
 
 
-def test_check_referrer_asset_reward(committee):
+def test_check_referrer_asset_reward(committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 100  # 100 means 1%
     asset_2_percent = 200  # 200 means 2%
@@ -157,8 +159,8 @@ def test_check_referrer_asset_reward(committee):
     asset_1_amount = 400000
     asset_2_amount = 800000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -214,7 +216,7 @@ def test_check_referrer_asset_reward(committee):
     assert referrer_2_mfs_vb.asset_amount == expected_referrer_2_reward
 
 
-def test_check_registrar_asset_reward(committee):
+def test_check_registrar_asset_reward(committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 100  # 100 means 1%
     asset_2_percent = 200  # 200 means 2%
@@ -225,8 +227,8 @@ def test_check_registrar_asset_reward(committee):
     asset_1_amount = 400000
     asset_2_amount = 800000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -271,10 +273,10 @@ def test_check_registrar_asset_reward(committee):
 
     expected_registrar_1_reward = calculate_account_reward_amount(
         asset_2, asset_2_amount, asset_2_percent, reward_percent,
-        acc1_registrar_percent)
+        acc1_registrar_percent, is_registrar=True)
     expected_registrar_2_reward = calculate_account_reward_amount(
         asset_1, asset_1_amount, asset_1_percent, reward_percent,
-        acc2_registrar_percent)
+        acc2_registrar_percent, is_registrar=True)
 
     log_step('Check registrars asset rewards')
     registrar_1_mfs_vb = CLI_WALLET.get_mfs_vesting_balance('nathan',
@@ -286,7 +288,7 @@ def test_check_registrar_asset_reward(committee):
     assert registrar_2_mfs_vb.asset_amount == expected_registrar_2_reward
 
 
-def test_check_withdraw_vesting_by_referrer(committee):
+def test_check_withdraw_vesting_by_referrer(committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 100  # 100 means 1%
     asset_2_percent = 200  # 200 means 2%
@@ -297,8 +299,8 @@ def test_check_withdraw_vesting_by_referrer(committee):
     asset_1_amount = 400000
     asset_2_amount = 800000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -368,7 +370,7 @@ def test_check_withdraw_vesting_by_referrer(committee):
     assert referrer_2_mfs_vb_after.asset_amount == 0
 
 
-def test_check_withdraw_vesting_by_registrar(committee):
+def test_check_withdraw_vesting_by_registrar(committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 100  # 100 means 1%
     asset_2_percent = 200  # 200 means 2%
@@ -379,8 +381,8 @@ def test_check_withdraw_vesting_by_registrar(committee):
     asset_1_amount = 400000
     asset_2_amount = 800000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -6,7 +6,7 @@ from utils.assets import (prepare_reward_user_asset_options,
                           create_new_user_asset)
 
 
-def test_check_partial_order_matching(committee):
+def test_check_partial_order_matching(committee, take_lifetime_account):
     precision = 0
     precision_value = 10 ** precision
     asset_1_percent = 1000  # 1000 means 10%
@@ -22,8 +22,8 @@ def test_check_partial_order_matching(committee):
     acc2_asset_2_amount_to_sell = 1000
     acc2_asset_1_amount_to_buy = 1000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -130,7 +130,7 @@ def test_check_partial_order_matching(committee):
     assert registrar_2_mfs_vb.asset_amount == exp_reg_2_reward
 
 
-def test_check_full_order_matching(committee):
+def test_check_full_order_matching(committee, take_lifetime_account):
     precision = 0
     precision_value = 10 ** precision
     asset_1_percent = 1000  # 1000 means 10%
@@ -146,8 +146,8 @@ def test_check_full_order_matching(committee):
     acc2_asset_2_amount_to_sell = 1000
     acc2_asset_1_amount_to_buy = 1000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -7,7 +7,8 @@ from utils.assets import (prepare_reward_user_asset_options,
                           create_new_user_asset)
 
 
-def test_check_that_user_assets_transferred_when_order_was_closed(committee):
+def test_check_that_user_assets_transferred_when_order_was_closed(
+        committee, take_lifetime_account):
     precision = 0
     precision_value = 10 ** precision
     asset_1_percent = 1000  # 1000 means 10%
@@ -19,8 +20,8 @@ def test_check_that_user_assets_transferred_when_order_was_closed(committee):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -75,7 +76,8 @@ def test_check_that_user_assets_transferred_when_order_was_closed(committee):
             asset_1_amount * precision_value - asset_1_full_fee)
 
 
-def test_check_accumulated_fees_after_order_was_closed(committee):
+def test_check_accumulated_fees_after_order_was_closed(
+        committee, take_lifetime_account):
     precision = 0
     precision_value = 10 ** precision
     asset_1_percent = 1000  # 1000 means 10%
@@ -87,8 +89,8 @@ def test_check_accumulated_fees_after_order_was_closed(committee):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -144,7 +146,7 @@ def test_check_accumulated_fees_after_order_was_closed(committee):
     assert asset_2_accumulated_fees == asset_2_full_fee - asset_2_reward_amount
 
 
-def test_check_referrer_asset_reward(committee):
+def test_check_referrer_asset_reward(committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -155,8 +157,8 @@ def test_check_referrer_asset_reward(committee):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -210,7 +212,7 @@ def test_check_referrer_asset_reward(committee):
     assert referrer_2_mfs_vb.asset_amount == expected_referrer_2_reward
 
 
-def test_check_registrar_asset_reward(committee):
+def test_check_registrar_asset_reward(committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -221,8 +223,8 @@ def test_check_registrar_asset_reward(committee):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -264,10 +266,10 @@ def test_check_registrar_asset_reward(committee):
 
     expected_registrar_1_reward = calculate_account_reward_amount(
         asset_2, asset_2_amount, asset_2_percent, reward_percent,
-        acc1_registrar_percent)
+        acc1_registrar_percent, is_registrar=True)
     expected_registrar_2_reward = calculate_account_reward_amount(
         asset_1, asset_1_amount, asset_1_percent, reward_percent,
-        acc2_registrar_percent)
+        acc2_registrar_percent, is_registrar=True)
 
     log_step('Check registrars asset rewards')
     registrar_1_mfs_vb = CLI_WALLET.get_mfs_vesting_balance('nathan',
@@ -279,7 +281,7 @@ def test_check_registrar_asset_reward(committee):
     assert registrar_2_mfs_vb.asset_amount == expected_registrar_2_reward
 
 
-def test_check_withdraw_vesting_by_referrer(committee):
+def test_check_withdraw_vesting_by_referrer(committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -290,8 +292,8 @@ def test_check_withdraw_vesting_by_referrer(committee):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -358,7 +360,7 @@ def test_check_withdraw_vesting_by_referrer(committee):
     assert referrer_2_mfs_vb_after.asset_amount == 0
 
 
-def test_check_withdraw_vesting_by_registrar(committee):
+def test_check_withdraw_vesting_by_registrar(committee, take_lifetime_account):
     precision = 0
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -369,8 +371,8 @@ def test_check_withdraw_vesting_by_registrar(committee):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -7,7 +7,8 @@ from utils.assets import (prepare_reward_user_asset_options,
 from decimal import Decimal
 
 
-def test_check_partial_withdraw_vesting_by_referrer(committee):
+def test_check_partial_withdraw_vesting_by_referrer(
+        committee, take_lifetime_account):
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -18,8 +19,8 @@ def test_check_partial_withdraw_vesting_by_referrer(committee):
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
@@ -91,7 +92,7 @@ def test_check_partial_withdraw_vesting_by_referrer(committee):
     assert referrer_1_mfs_vb_final.asset_amount == quarter_fee
 
 
-def test_withdraw_vesting_then_accumulation_and_withdraw_vesting_again(committee):  # noqa flake8
+def test_withdraw_vesting_then_accumulation_and_withdraw_vesting_again(committee, take_lifetime_account):  # noqa flake8
     precision = 1
     asset_1_percent = 1000  # 1000 means 10%
     asset_2_percent = 2000  # 2000 means 20%
@@ -102,8 +103,8 @@ def test_withdraw_vesting_then_accumulation_and_withdraw_vesting_again(committee
     asset_1_amount = 4000
     asset_2_amount = 8000
 
-    referrer_1 = create_account_with_balance(20000, lifetime=True)
-    referrer_2 = create_account_with_balance(20000, lifetime=True)
+    referrer_1 = take_lifetime_account()
+    referrer_2 = take_lifetime_account()
 
     account_1 = create_account_with_balance(balance=1000000,
                                             referrer=referrer_1.name,
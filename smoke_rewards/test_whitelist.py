@@ -299,7 +299,8 @@ def test_add_registrar_and_referrer_to_whitelist_so_all_of_them_can_get_reward(w
     log_step('Check that registrar_2 has reward')
     whitelist_tc_manager.check_if_reward_amount_is_correct(
         whitelist_tc_manager.registrar_2.name,
-        whitelist_tc_manager.reg_2_percent)
+        whitelist_tc_manager.reg_2_percent,
+        is_registrar=True)
 
     log_step('Check that referrer_2 has reward')
     whitelist_tc_manager.check_if_reward_amount_is_correct(
@@ -330,7 +331,8 @@ def test_add_registrar_and_referrer_to_whitelist_and_registrar_to_mfs_whitelist_
     log_step('Check that registrar_2 has reward')
     whitelist_tc_manager.check_if_reward_amount_is_correct(
         whitelist_tc_manager.registrar_2.name,
-        whitelist_tc_manager.reg_2_percent)
+        whitelist_tc_manager.reg_2_percent,
+        is_registrar=True)
 
     log_step('Check that referrer_2 has reward')
     whitelist_tc_manager.check_if_reward_amount_is_correct(
@@ -392,7 +394,8 @@ def test_add_registrar_and_referrer_to_whitelist_and_to_mfs_whitelist_so_all_of_
     log_step('Check that registrar_2 has reward')
     whitelist_tc_manager.check_if_reward_amount_is_correct(
         whitelist_tc_manager.registrar_2.name,
-        whitelist_tc_manager.reg_2_percent)
+        whitelist_tc_manager.reg_2_percent,
+        is_registrar=True)
 
     log_step('Check that referrer_2 has reward')
     whitelist_tc_manager.check_if_reward_amount_is_correct(
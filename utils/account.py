@@ -1,7 +1,10 @@
 from testutil import (create_account_update_operation_auth,
                       generate_random_name, wait_blocks)
 from utils.cli_wallet import CLI_WALLET
-from utils.constants import DEFAULT_CORE_ASSET, PUBLIC_KEY, PRIVATE_KEY
+from utils.py_logger import logger
+from utils.constants import (DEFAULT_CORE_ASSET, PUBLIC_KEY, PRIVATE_KEY,
+                             ACCOUNT_UPDATE_OPERATION)
+from utils.workers import get_funding_account
 
 
 class Account(object):
@@ -43,17 +46,13 @@ class Account(object):
     def update_authorities(self, owner_weight_threshold,
                            owner_account_auths, active_weight_threshold,
                            active_account_auths):
-        transaction_handle = CLI_WALLET.get_transaction_handle()
         acc_upd_op = create_account_update_operation_auth(
             self.id, owner_weight_threshold=owner_weight_threshold,
             owner_account_auths=owner_account_auths,
             active_weight_threshold=active_weight_threshold,
             active_account_auths=active_account_auths)
-        CLI_WALLET.add_operation_to_builder_transaction(transaction_handle,
-                                                        acc_upd_op)
-        CLI_WALLET.set_fees_on_builder_transaction(transaction_handle)
-        result = CLI_WALLET.sign_builder_transaction(transaction_handle)
-        return result
+        return CLI_WALLET.build_transactions(
+            [[ACCOUNT_UPDATE_OPERATION, acc_upd_op]])[0]
 
     def get_mfs_vesting_balance(self, asset_id):
         balance = CLI_WALLET.get_mfs_vesting_balance(self.name, asset_id)
@@ -63,14 +62,46 @@ class Account(object):
 def create_account_with_balance(balance='1000', registrar='nathan',
                                 referrer='nathan', referrer_percent='0',
                                 lifetime=False):
-    new_account = Account()
-    CLI_WALLET.register_account(
-        new_account.name, new_account.pub_key, new_account.pub_key, registrar,
-        referrer, referrer_percent)
+    new_account = create_accounts(
+        1, balance=balance, registrar=registrar, referrer=referrer,
+        referrer_percent=referrer_percent, lifetime=lifetime)[0]
+    return new_account
+
+
+def _get_account_value(value, index):
+    # create_accounts arguments are either common or given per account
+    return value[index] if isinstance(value, (list, tuple)) else value
+
+
+def create_accounts(count, balance='1000', registrar='nathan',
+                    referrer='nathan', referrer_percent='0', lifetime=False):
+    """balance, registrar, referrer and referrer_percent are common values
+    or lists with a value per account"""
+    # every stage is sent for all accounts in one batch and only then is
+    # waited for, so creation costs the same number of round trips and
+    # blocks for any count
+    new_accounts = [Account() for _ in xrange(count)]
+    logger.info('Registering %s new accounts' % count)
+    with CLI_WALLET.batch() as batch:
+        for index, new_account in enumerate(new_accounts):
+            batch.send_request(
+                "register_account",
+                [new_account.name, new_account.pub_key, new_account.pub_key,
+                 _get_account_value(registrar, index),
+                 _get_account_value(referrer, index),
+                 _get_account_value(referrer_percent, index), True])
     wait_blocks()
-    CLI_WALLET.transfer('nathan', new_account.name, balance)
+    with CLI_WALLET.batch() as batch:
+        for index, new_account in enumerate(new_accounts):
+            batch.send_request(
+                "transfer", [get_funding_account(), new_account.name,
+                             _get_account_value(balance, index),
+                             DEFAULT_CORE_ASSET, "", True])
     wait_blocks()
     if lifetime:
-        CLI_WALLET.upgrade_account(new_account.name)
+        with CLI_WALLET.batch() as batch:
+            for new_account in new_accounts:
+                batch.send_request("upgrade_account",
+                                   [new_account.name, True])
         wait_blocks()
-    return new_account
+    return new_accounts
@@ -0,0 +1,49 @@
+import threading
+
+
+class AssetCache(object):
+    """Two-way asset symbol <-> id mapping. Both values are immutable after
+    asset creation, so cached entries never expire"""
+    def __init__(self):
+        self._symbols_by_id = dict()
+        self._ids_by_symbol = dict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._symbols_by_id)
+
+    def add(self, asset):
+        if not isinstance(asset, dict):
+            return
+        if 'id' not in asset or 'symbol' not in asset:
+            return
+        with self._lock:
+            self._symbols_by_id[asset['id']] = asset['symbol']
+            self._ids_by_symbol[asset['symbol']] = asset['id']
+
+    def _lookup(self, mapping, key):
+        with self._lock:
+            value = mapping.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def get_symbol(self, asset_id):
+        return self._lookup(self._symbols_by_id, asset_id)
+
+    def get_id(self, asset_symbol):
+        return self._lookup(self._ids_by_symbol, asset_symbol)
+
+    def clear(self):
+        with self._lock:
+            self._symbols_by_id.clear()
+            self._ids_by_symbol.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        return {'size': len(self), 'hits': self.hits, 'misses': self.misses}
@@ -188,6 +188,22 @@ def create_new_user_asset(account_name, precision, asset_name=None,
     return asset
 
 
+def create_new_user_assets(account_name, precision, count, options=None):
+    # the same as create_new_user_asset, but all assets are created in the
+    # same block
+    logger.info('Creating %s new user assets...' % count)
+    options = prepare_market_asset_options(ASSET_PERMISSIONS, ASSET_FLAGS) \
+        if options is None else options
+
+    assets = [UserAsset(account_name, precision) for _ in xrange(count)]
+    for asset in assets:
+        asset.create_asset(options)
+    wait_blocks()
+    logger.info('New user assets created: %s' % ', '.join(
+        asset.name for asset in assets))
+    return assets
+
+
 def publish_asset_feed(account_name, asset_name, asset_id):
     core_asset_id = str(CLI_WALLET.get_asset_id_by_symbol("BTS"))
     price_feed = {
@@ -0,0 +1,48 @@
+# Concurrent client for the cli_wallet RPC endpoint.
+# Code base still runs on python 2, so there is no asyncio here: every call
+# is executed by a thread pool and an AsyncResult ("future") is returned.
+# Use gather() to wait for a group of calls.
+
+from multiprocessing.pool import ThreadPool
+from cli_wallet import CliWallet, uri as cli_wallet_uri
+
+
+# number of requests that can be in flight at the same time
+DEFAULT_CONCURRENCY = 100
+
+
+class AsyncCliWallet(object):
+    """Has the same methods as CliWallet, but each of them returns
+    AsyncResult object instead of result"""
+    def __init__(self, uri=cli_wallet_uri, concurrency=DEFAULT_CONCURRENCY):
+        self.wallet = CliWallet(uri, pool_size=concurrency)
+        self.pool = ThreadPool(concurrency)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.wallet, name)
+        if not callable(attribute):
+            return attribute
+
+        def call_async(*arguments, **kwargs):
+            return self.pool.apply_async(attribute, arguments, kwargs)
+        return call_async
+
+    def call(self, function, *arguments):
+        """Runs function(wallet, *arguments) in the pool, for calls that
+        need several requests or measure their own latency"""
+        return self.pool.apply_async(function, (self.wallet,) + arguments)
+
+    def map(self, method_name, arguments_list):
+        method = getattr(self, method_name)
+        return [method(*arguments) for arguments in arguments_list]
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self.wallet.rpc.close()
+
+
+def gather(async_results, timeout=None):
+    """Waits for all results and returns them in the same order.
+    The first exception raised by a call is re-raised here"""
+    return [async_result.get(timeout) for async_result in async_results]
@@ -0,0 +1,116 @@
+import math
+import time
+from datetime import datetime
+import dateutil.parser as dt
+from cli_wallet import CLI_WALLET
+from utils.py_logger import logger
+from utils.time_profiler import PROFILER, WAIT
+
+
+# delay between block production and its appearance in cli_wallet
+BLOCK_DELAY_MARGIN = 0.05
+# how long a block may be late before its slot is considered as missed
+LATE_BLOCK_TOLERANCE = 0.5
+# how often head block is checked while a late block is expected
+POLL_INTERVAL = 0.1
+
+
+class BlockWatcher(object):
+    """Waits for chain progress by predicting the time of the next block
+    from head block time and block_interval, so every wait wakes up right
+    after the expected block instead of polling with a fixed period"""
+    def __init__(self, wallet, sleep=time.sleep, now=datetime.utcnow):
+        self.wallet = wallet
+        self.sleep = sleep
+        self.now = now
+        self.requests_count = 0
+        self.block_producer = None
+        self._block_interval = None
+        self._next_maintenance_time = None
+
+    def get_dynamic_global_properties(self):
+        props = self.wallet.get_dynamic_global_properties()
+        self.requests_count += 1
+        # global parameters can be changed only by maintenance
+        if props["next_maintenance_time"] != self._next_maintenance_time:
+            self._next_maintenance_time = props["next_maintenance_time"]
+            self._block_interval = None
+        return props
+
+    @property
+    def block_interval(self):
+        if self._block_interval is None:
+            self._block_interval = self.wallet.get_block_interval()
+            self.requests_count += 1
+        return self._block_interval
+
+    def seconds_until_next_block(self, props):
+        interval = self.block_interval
+        head_block_time = dt.parse(props["time"])
+        elapsed = (self.now() - head_block_time).total_seconds()
+        if elapsed < interval:
+            return interval - elapsed + BLOCK_DELAY_MARGIN
+        # next slot is already passed: block is late or the slot is missed
+        since_last_slot = elapsed % interval
+        if since_last_slot < LATE_BLOCK_TOLERANCE:
+            return POLL_INTERVAL
+        return interval - since_last_slot + BLOCK_DELAY_MARGIN
+
+    def set_block_producer(self, producer):
+        """producer(count) generates count blocks at once. It is used while
+        head block time is ahead of wall clock (after chain time was
+        skipped), because witnesses do not produce blocks until then"""
+        self.block_producer = producer
+
+    def _is_stalled(self, props):
+        return self.block_producer is not None and \
+            dt.parse(props["time"]) > self.now()
+
+    def _sleep(self, seconds):
+        logger.debug('Sleep %.3f seconds' % seconds)
+        self.sleep(seconds)
+
+    def wait_for_block(self, block_number, props=None):
+        with PROFILER.section(WAIT):
+            while True:
+                if props is None:
+                    props = self.get_dynamic_global_properties()
+                blocks_left = block_number - props["head_block_number"]
+                if blocks_left <= 0:
+                    return props
+                if self._is_stalled(props):
+                    self.block_producer(blocks_left)
+                    props = None
+                    continue
+                delay = self.seconds_until_next_block(props) + \
+                    (blocks_left - 1) * self.block_interval
+                self._sleep(delay)
+                props = None
+
+    def wait_blocks(self, num_blocks=1):
+        with PROFILER.section(WAIT):
+            props = self.get_dynamic_global_properties()
+            return self.wait_for_block(
+                props["head_block_number"] + num_blocks, props)
+
+    def wait_for_time(self, timestamp):
+        """Waits until head block time reaches timestamp"""
+        with PROFILER.section(WAIT):
+            while True:
+                props = self.get_dynamic_global_properties()
+                head_block_time = dt.parse(props["time"])
+                if timestamp <= head_block_time:
+                    return props
+                if self._is_stalled(props):
+                    seconds_left = (timestamp -
+                                    head_block_time).total_seconds()
+                    self.block_producer(
+                        int(math.ceil(seconds_left / self.block_interval)))
+                    continue
+                seconds_left = (timestamp - self.now()).total_seconds()
+                delay = max(seconds_left + BLOCK_DELAY_MARGIN,
+                            self.seconds_until_next_block(props))
+                self._sleep(delay)
+
+
+BLOCK_WATCHER = BlockWatcher(CLI_WALLET)
@@ -0,0 +1,211 @@
+# Snapshots of local witness node state. The node is stopped, its data
+# dir items (blockchain database by default) are copied to
+# <docker_dir>/snapshots/<name> and the node is started again. Restoring
+# copies them back the same way, so an expensive precondition (committee
+# membership, funded accounts, assets) is built once:
+#   snapshots = ChainSnapshots('/path/to/witness/dir',
+#                              'docker stop witness', 'docker start witness')
+#   metadata = snapshots.checkpoint('committee', setup_committee)
+# Stop and start commands are shell commands, they are expected to
+# stop/start cli_wallet as well if it does not survive node restart.
+# Every snapshot records chain id and the head block it was built on, and
+# is restored only if that block is still in the live chain, e.g. not
+# onto a chain started again from genesis.
+# Enabled by --snapshot_stop_command and --snapshot_start_command options,
+# see conftest.py.
+
+import os
+import json
+import time
+import copy
+import shutil
+import subprocess
+from requests.exceptions import RequestException
+from b3_exceptions import BitshareBaseException, BitshareConditionError
+from cli_wallet import CLI_WALLET
+from utils.py_logger import logger
+
+
+SNAPSHOTS_DIR = 'snapshots'
+DATA_ITEMS = ('blockchain',)
+METADATA_FILE = 'metadata.json'
+DEFAULT_RPC_TIMEOUT = 120
+RPC_POLL_INTERVAL = 1
+
+
+def get_chain_state(wallet=CLI_WALLET):
+    info = wallet.info()
+    return {'chain_id': info['chain_id'],
+            'head_block_num': info['head_block_num'],
+            'head_block_id': info['head_block_id']}
+
+
+def get_chain_mismatch(state, wallet=CLI_WALLET):
+    """Returns why a snapshot with recorded chain state cannot be restored
+    onto the live chain, None if it can"""
+    live_state = get_chain_state(wallet)
+    if live_state['chain_id'] != state['chain_id']:
+        return 'chain id %s differs from %s' % (state['chain_id'],
+                                                live_state['chain_id'])
+    if live_state['head_block_num'] < state['head_block_num']:
+        return 'block %s is above head block %s' % (
+            state['head_block_num'], live_state['head_block_num'])
+    block = wallet.get_block(state['head_block_num']) or dict()
+    if block.get('block_id') != state['head_block_id']:
+        return 'block %s %s is not in the live chain' % (
+            state['head_block_num'], state['head_block_id'])
+    return None
+
+
+class ChainSnapshots(object):
+    def __init__(self, docker_dir, stop_command, start_command,
+                 data_items=DATA_ITEMS, rpc_timeout=DEFAULT_RPC_TIMEOUT,
+                 wallet=CLI_WALLET):
+        self.docker_dir = docker_dir
+        self.snapshots_dir = os.path.join(docker_dir, SNAPSHOTS_DIR)
+        self.stop_command = stop_command
+        self.start_command = start_command
+        self.data_items = data_items
+        self.rpc_timeout = rpc_timeout
+        self.wallet = wallet
+
+    def get_path(self, name):
+        return os.path.join(self.snapshots_dir, name)
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.get_path(name),
+                                           METADATA_FILE))
+
+    def clear(self):
+        if os.path.exists(self.snapshots_dir):
+            shutil.rmtree(self.snapshots_dir)
+
+    def _run(self, command):
+        logger.info('Run "%s"' % command)
+        subprocess.check_call(command, shell=True)
+
+    def wait_for_rpc(self):
+        deadline = time.time() + self.rpc_timeout
+        while True:
+            try:
+                self.wallet.rpc.reconnect()
+                self.wallet.get_dynamic_global_properties()
+                break
+            except (BitshareBaseException, RequestException, ValueError):
+                if time.time() >= deadline:
+                    raise
+                time.sleep(RPC_POLL_INTERVAL)
+        # restored chain may have other assets under the same names
+        self.wallet.asset_cache.clear()
+
+    def _copy_items(self, source_dir, destination_dir):
+        for item in self.data_items:
+            source = os.path.join(source_dir, item)
+            destination = os.path.join(destination_dir, item)
+            if os.path.isdir(destination):
+                shutil.rmtree(destination)
+            elif os.path.exists(destination):
+                os.remove(destination)
+            if os.path.isdir(source):
+                shutil.copytree(source, destination, symlinks=True)
+            elif os.path.exists(source):
+                shutil.copy2(source, destination)
+
+    def take(self, name, metadata=None, chain_state=None):
+        """metadata is JSON-compatible data returned by restore.
+        chain_state is the state the snapshot is built on, the current one
+        by default"""
+        logger.info('Taking "%s" chain snapshot...' % name)
+        if chain_state is None:
+            chain_state = get_chain_state(self.wallet)
+        path = self.get_path(name)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+        self._run(self.stop_command)
+        try:
+            self._copy_items(self.docker_dir, path)
+        finally:
+            self._run(self.start_command)
+        with open(os.path.join(path, METADATA_FILE), 'w') as metadata_file:
+            json.dump({'chain': chain_state, 'metadata': metadata},
+                      metadata_file)
+        self.wait_for_rpc()
+        logger.info('Chain snapshot "%s" is saved to %s' % (name, path))
+
+    def _load(self, name):
+        with open(os.path.join(self.get_path(name),
+                               METADATA_FILE)) as metadata_file:
+            return json.load(metadata_file)
+
+    def get_mismatch(self, name):
+        return get_chain_mismatch(self._load(name)['chain'], self.wallet)
+
+    def restore(self, name):
+        logger.info('Restoring "%s" chain snapshot...' % name)
+        path = self.get_path(name)
+        saved = self._load(name)
+        mismatch = get_chain_mismatch(saved['chain'], self.wallet)
+        if mismatch is not None:
+            raise BitshareConditionError(
+                'Chain snapshot "%s" does not match the live chain: %s' % (
+                    name, mismatch))
+        metadata = saved['metadata']
+        self._run(self.stop_command)
+        try:
+            self._copy_items(path, self.docker_dir)
+        finally:
+            self._run(self.start_command)
+        self.wait_for_rpc()
+        logger.info('Chain snapshot "%s" is restored' % name)
+        return metadata
+
+    def checkpoint(self, name, build):
+        """Restores the snapshot if it exists and matches the live chain,
+        otherwise calls build() and saves its result with a new snapshot.
+        Returns the result"""
+        if self.exists(name):
+            mismatch = self.get_mismatch(name)
+            if mismatch is None:
+                return self.restore(name)
+            logger.info('Chain snapshot "%s" is built again: %s' % (
+                name, mismatch))
+        chain_state = get_chain_state(self.wallet)
+        metadata = build()
+        self.take(name, metadata, chain_state)
+        return metadata
+
+
+class SimChainSnapshots(object):
+    """Same interface for the simulated chain, snapshots are kept in
+    memory and include the virtual clock"""
+    def __init__(self, chain, wallet=CLI_WALLET):
+        self.chain = chain
+        self.wallet = wallet
+        self.snapshots = dict()
+
+    def exists(self, name):
+        return name in self.snapshots
+
+    def clear(self):
+        self.snapshots.clear()
+
+    def take(self, name, metadata=None):
+        with self.chain.lock:
+            state = dict((key, value) for key, value
+                         in self.chain.__dict__.items() if key != 'lock')
+            self.snapshots[name] = copy.deepcopy((state, metadata))
+
+    def restore(self, name):
+        with self.chain.lock:
+            state, metadata = copy.deepcopy(self.snapshots[name])
+            self.chain.__dict__.update(state)
+        self.wallet.asset_cache.clear()
+        return metadata
+
+    def checkpoint(self, name, build):
+        if self.exists(name):
+            return self.restore(name)
+        metadata = build()
+        self.take(name, metadata)
+        return metadata
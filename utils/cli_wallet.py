@@ -1,15 +1,24 @@
-from connection import JsonRpc
-from constants import DEFAULT_CORE_ASSET
+import json
+from connection import create_rpc, RpcBatch, DEFAULT_POOL_SIZE
+from constants import DEFAULT_CORE_ASSET, ACCOUNT_UPDATE_OPERATION
 import dateutil.parser as dt
 from utils.py_logger import logger
-from b3_exceptions import BitshareConditionError
+from b3_exceptions import BitshareConditionError, BitshareStatusCodeError
 from vesting_balances import VestingBalance
+from asset_cache import AssetCache
 from decimal import Decimal
 
 
 class CliWallet(object):
-    def __init__(self, uri):
-        self.rpc = JsonRpc(uri)
+    def __init__(self, uri, pool_size=DEFAULT_POOL_SIZE):
+        self.rpc = create_rpc(uri, pool_size=pool_size)
+        self.asset_cache = AssetCache()
+
+    def connect(self, uri):
+        logger.info('Connecting cli_wallet client to %s' % uri)
+        old_rpc = self.rpc
+        self.rpc = create_rpc(uri, pool_size=old_rpc.pool_size)
+        old_rpc.close()
 
     def send_request(self, method, *arguments, **kwargs):
         # args_param = arguments[0] if arguments else []
@@ -21,6 +30,14 @@ class CliWallet(object):
         # logger.debug('%s\n' % response)
         return response
 
+    def batch(self):
+        """Usage:
+            with CLI_WALLET.batch() as batch:
+                asset = batch.send_request("get_object", ["1.3.0"])
+            asset.result()
+        """
+        return RpcBatch(self.rpc)
+
     def try_send_request(self, method, *arguments, **kwargs):
         kwargs.update(expected_code=None)
         logger.debug('Try send "%s" request...' % method)
@@ -50,15 +67,30 @@ class CliWallet(object):
         logger.info('%s balance: %s' % (account, balances_dict))
         return balances_dict
 
+    def get_dict_account_balances(self, accounts):
+        logger.info('Get %s accounts balances and combine them to dicts' %
+                    len(accounts))
+        with self.batch() as batch:
+            futures = [batch.send_request("list_account_balances", [account])
+                       for account in accounts]
+        balances = dict()
+        for account, future in zip(accounts, futures):
+            balances[account] = combine_balances(future.result())
+        return balances
+
     def get_asset_account_balance(self, account,
                                   asset_name=DEFAULT_CORE_ASSET):
         result = self.get_account_balance(account)
 
         if 0 < len(result):
+            # symbol is resolved once, balances are compared by id
+            try:
+                asset_id = self.get_asset_id_by_symbol(asset_name)
+            except BitshareStatusCodeError:
+                # there is no such asset, so there is no balance of it
+                return 0
             for asset_balance in result:
-                asset_symbol = self.get_asset_symbol_by_id(
-                    asset_balance["asset_id"])
-                if asset_symbol == asset_name:
+                if asset_balance["asset_id"] == asset_id:
                     return int(asset_balance["amount"])
         return 0
 
@@ -79,28 +111,71 @@ class CliWallet(object):
         return result
 
     def get_current_supply(self, asset_id='1.3.0'):
-        asset_data = self.get_object(asset_id)
-        dynamic_asset_data_id = asset_data[0]['dynamic_asset_data_id']
-        dynamic_asset_data = self.get_object(dynamic_asset_data_id)
+        dynamic_asset_data = self.get_dynamic_asset_data_list([asset_id])
         current_supply = dynamic_asset_data[0]['current_supply']
         return current_supply
 
     def get_object(self, obj):
         return self.send_request("get_object", [obj])["result"]
 
+    def get_objects(self, objects):
+        with self.batch() as batch:
+            futures = [batch.send_request("get_object", [obj])
+                       for obj in objects]
+        return [future.result()[0] for future in futures]
+
+    def get_dynamic_asset_data_list(self, asset_ids):
+        assets_data = self.get_objects(asset_ids)
+        dynamic_asset_data_ids = [asset_data['dynamic_asset_data_id']
+                                  for asset_data in assets_data]
+        return self.get_objects(dynamic_asset_data_ids)
+
     def get_account(self, account):
         return self.send_request("get_account", [account])["result"]
 
     def get_asset(self, symbol_or_id):
-        return self.send_request("get_asset", [symbol_or_id])["result"]
+        asset = self.send_request("get_asset", [symbol_or_id])["result"]
+        self.asset_cache.add(asset)
+        return asset
 
     def get_asset_symbol_by_id(self, asset_id):
-        response = self.send_request("get_asset", [asset_id])
-        return response["result"]["symbol"]
+        asset_symbol = self.asset_cache.get_symbol(asset_id)
+        if asset_symbol is None:
+            asset_symbol = self.get_asset(asset_id)["symbol"]
+        return asset_symbol
 
     def get_asset_id_by_symbol(self, asset_symbol):
-        response = self.send_request("get_asset", [asset_symbol])
-        return response["result"]["id"]
+        asset_id = self.asset_cache.get_id(asset_symbol)
+        if asset_id is None:
+            asset_id = self.get_asset(asset_symbol)["id"]
+        return asset_id
+
+    def list_assets(self, lowerbound='', limit=100):
+        response = self.send_request("list_assets", [lowerbound, limit])
+        assets = response["result"]
+        for asset in assets:
+            self.asset_cache.add(asset)
+        return assets
+
+    def preload_asset_cache(self, page_size=100):
+        # list_assets includes lowerbound, so every next page repeats the
+        # last asset of the previous one
+        if page_size < 2:
+            raise ValueError('page_size should be at least 2')
+        logger.info('Preloading asset symbols and ids...')
+        lowerbound = ''
+        while True:
+            assets = self.list_assets(lowerbound, page_size)
+            new_assets = [asset for asset in assets
+                          if asset['symbol'] != lowerbound]
+            if not new_assets or len(assets) < page_size:
+                break
+            lowerbound = new_assets[-1]['symbol']
+        logger.info('Asset cache is preloaded: %s' %
+                    self.asset_cache.get_stats())
+
+    def get_asset_cache_stats(self):
+        return self.asset_cache.get_stats()
 
     def sell_asset(self, seller, amount_to_sell, symbol_to_sell,
                    minimum_to_receive, symbol_to_receive, timeout):
@@ -128,6 +203,9 @@ class CliWallet(object):
         response = self.send_request("get_global_properties")
         return response["result"]
 
+    def info(self):
+        return self.send_request("info")["result"]
+
     def get_global_parameters(self):
         return self.get_global_properties()["parameters"]
 
@@ -201,7 +279,7 @@ class CliWallet(object):
     def issue_asset(self, account, amount, asset_name, memo=''):
         logger.info(
             'Issuing %s "%s" asset by %s' % (amount, asset_name, account))
-        response = CLI_WALLET.send_request(
+        response = self.send_request(
             "issue_asset", [account, amount, asset_name, memo, True])
         return response['result']
 
@@ -238,9 +316,7 @@ class CliWallet(object):
 
     def get_accumulated_fees(self, asset_id):
         logger.info('Getting accumulated fee for %s asset' % asset_id)
-        asset_data = self.get_object(asset_id)
-        dynamic_asset_data_id = asset_data[0]['dynamic_asset_data_id']
-        dynamic_asset_data = self.get_object(dynamic_asset_data_id)
+        dynamic_asset_data = self.get_dynamic_asset_data_list([asset_id])
         accumulated_fees = dynamic_asset_data[0]['accumulated_fees']
         logger.info(
             'Accumulated fee for %s: %s' % (asset_id, accumulated_fees))
@@ -346,11 +422,12 @@ class CliWallet(object):
         global_properties = self.get_global_properties()
         return global_properties["active_witnesses"]
 
-    def add_operation_to_builder_transaction(self, transaction_handle,
-                                             account_update_operation):
+    def add_operation_to_builder_transaction(
+            self, transaction_handle, operation,
+            operation_type=ACCOUNT_UPDATE_OPERATION):
         self.send_request(
             'add_operation_to_builder_transaction',
-            [transaction_handle, [6, account_update_operation]])
+            [transaction_handle, [operation_type, operation]])
 
     def get_transaction_handle(self):
         result = self.send_request('begin_builder_transaction')['result']
@@ -370,6 +447,60 @@ class CliWallet(object):
         logger.info('Transaction: %s' % result)
         return result
 
+    def build_transactions(self, operations, max_operations=None,
+                           max_size=None):
+        """operations is a list of [operation_type, operation]. They are
+        split into transactions within maximum_transaction_size (or
+        max_size) and max_operations, every transaction is signed and
+        broadcast once. Returns the signed transactions"""
+        if max_size is None and len(operations) > 1:
+            max_size = self.get_global_parameters()[
+                'maximum_transaction_size']
+        transactions = list()
+        for chunk in split_operations(operations, max_size, max_operations):
+            handle = self.get_transaction_handle()
+            with self.batch() as batch:
+                for operation_type, operation in chunk:
+                    batch.send_request(
+                        'add_operation_to_builder_transaction',
+                        [handle, [operation_type, operation]])
+            self.set_fees_on_builder_transaction(handle)
+            transactions.append(self.sign_builder_transaction(handle))
+        logger.info('%s operations are sent by %s transactions' % (
+            len(operations), len(transactions)))
+        return transactions
+
+
+# room for signatures, expiration and reference block of a transaction
+TRANSACTION_OVERHEAD = 200
+
+
+def get_operation_size(operation):
+    """JSON size, serialized operations are smaller, so it is an upper
+    bound"""
+    return len(json.dumps(operation, separators=(',', ':')))
+
+
+def split_operations(operations, max_size, max_operations=None):
+    """Splits [operation_type, operation] list into chunks which fit into
+    one transaction. An operation larger than max_size gets its own
+    chunk, max_size None means no limit"""
+    chunks = list()
+    chunk = list()
+    chunk_size = TRANSACTION_OVERHEAD
+    for operation in operations:
+        size = get_operation_size(operation)
+        too_large = max_size is not None and chunk_size + size > max_size
+        if chunk and (too_large or len(chunk) == max_operations):
+            chunks.append(chunk)
+            chunk = list()
+            chunk_size = TRANSACTION_OVERHEAD
+        chunk.append(operation)
+        chunk_size += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
 
 def combine_balances(balances_list):
     result_dict = dict()
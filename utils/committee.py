@@ -24,11 +24,16 @@ class Committee(object):
         return obj[0]["active"]["account_auths"]
 
     def update_global_property(self, member1, member2, field_name, value):
-        logger.info('Updating %s to "%s"...' % (field_name, value))
+        self.update_global_properties(member1, member2, {field_name: value})
+
+    def update_global_properties(self, member1, member2, values):
+        """All parameters are changed by one proposal, so it costs one
+        maintenance for any number of them"""
+        logger.info('Updating global properties to %s...' % values)
         expiration = get_expiration_time(7 * CLI_WALLET.get_block_interval())
 
         CLI_WALLET.propose_parameter_change(
-            [member1, expiration, {field_name: value}, True])
+            [member1, expiration, values, True])
 
         wait_blocks(1)
 
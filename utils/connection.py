@@ -1,38 +1,323 @@
 import requests
 import json
-from b3_exceptions import BitshareStatusCodeError
+import time
+import threading
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.exceptions import NewConnectionError
+from b3_exceptions import BitshareStatusCodeError, BitshareConditionError
+from rpc_stats import RPC_STATS
+from time_profiler import PROFILER, RPC
+from utils.py_logger import logger
+
+
+# number of keep-alive connections kept open to one endpoint
+DEFAULT_POOL_SIZE = 10
+# how many times a request is resent after the connection has been dropped
+# (e.g. cli_wallet was restarted)
+DEFAULT_RECONNECT_ATTEMPTS = 1
+# methods that do not change the chain, they are resent after any
+# connection error. Others are resent only if they were not sent at all,
+# so a broadcast is never repeated
+READ_ONLY_PREFIXES = ('get_', 'list_', 'lookup_', 'is_', 'info', 'about')
+
+
+def is_read_only(method):
+    return method.startswith(READ_ONLY_PREFIXES)
+
+
+def is_not_sent(error):
+    """True if connection was not established, so the request was not
+    sent"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
 
 
 class JsonRpc(object):
-    def __init__(self, uri):
+    def __init__(self, uri, pool_size=DEFAULT_POOL_SIZE,
+                 reconnect_attempts=DEFAULT_RECONNECT_ATTEMPTS):
         self.id = 0
         self.uri = uri
+        self.pool_size = pool_size
+        self.reconnect_attempts = reconnect_attempts
+        self._id_lock = threading.Lock()
+        self._session_lock = threading.Lock()
+        # counters of sessions that have already been closed
+        self._closed_connections_opened = 0
+        self._closed_requests_sent = 0
+        self.reconnects = 0
+        # switched off after the first rejected batch
+        self.batch_supported = True
+        self.session = self._create_session()
 
-    def send_request(self, method, *arguments, **kwargs):
-        expected_code = kwargs.get('expected_code', 200)
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                              pool_block=True)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _get_connection_pools(self, session):
+        pools = list()
+        for adapter in session.adapters.values():
+            pool_manager = adapter.poolmanager
+            for key in pool_manager.pools.keys():
+                pool = pool_manager.pools.get(key)
+                if pool is not None and pool not in pools:
+                    pools.append(pool)
+        return pools
+
+    def _count_session_usage(self, session):
+        connections_opened = 0
+        requests_sent = 0
+        for pool in self._get_connection_pools(session):
+            connections_opened += pool.num_connections
+            requests_sent += pool.num_requests
+        return connections_opened, requests_sent
+
+    def reconnect(self):
+        logger.info('Reconnecting to %s...' % self.uri)
+        with self._session_lock:
+            old_session = self.session
+            connections_opened, requests_sent = self._count_session_usage(
+                old_session)
+            self._closed_connections_opened += connections_opened
+            self._closed_requests_sent += requests_sent
+            self.session = self._create_session()
+            self.reconnects += 1
+        old_session.close()
+
+    def close(self):
+        self.session.close()
+
+    @property
+    def connections_opened(self):
+        connections_opened, _ = self._count_session_usage(self.session)
+        return self._closed_connections_opened + connections_opened
+
+    @property
+    def connections_reused(self):
+        connections_opened, requests_sent = self._count_session_usage(
+            self.session)
+        all_connections = self._closed_connections_opened + connections_opened
+        all_requests = self._closed_requests_sent + requests_sent
+        return all_requests - all_connections
+
+    def get_connection_stats(self):
+        return {'connections_opened': self.connections_opened,
+                'connections_reused': self.connections_reused,
+                'reconnects': self.reconnects}
 
-        push_json = {
+    def _next_id(self):
+        with self._id_lock:
+            request_id = self.id
+            self.id += 1
+        return request_id
+
+    def _post(self, push_json):
+        requests_json = push_json if isinstance(push_json, list) \
+            else [push_json]
+        read_only = all(is_read_only(request["method"])
+                        for request in requests_json)
+        attempt = 0
+        while True:
+            try:
+                return self.session.post(self.uri, json=push_json)
+            except requests.exceptions.ConnectionError as e:
+                if attempt >= self.reconnect_attempts or \
+                        not (read_only or is_not_sent(e)):
+                    raise
+                attempt += 1
+                logger.info('Connection to %s is lost: %s' % (self.uri, e))
+                self.reconnect()
+
+    def _prepare_request(self, method, arguments):
+        return {
             "jsonrpc": "2.0",
             "method": method,
             "params": list(*arguments),
-            "id": self.id
+            "id": self._next_id()
         }
 
-        response = requests.post(self.uri, json=push_json)
-
-        result = json.loads(response.content)
-        status_code = response.status_code
-        response.close()
-
-        assert result["id"] == -1 or result["id"] == self.id
+    def _check_response(self, result, request_id, status_code,
+                        expected_code):
+        assert result["id"] == -1 or result["id"] == request_id
 
         del result["id"]
 
-        self.id += 1
-
         if expected_code is None:
             pass
         elif status_code != expected_code:
             raise BitshareStatusCodeError(result)
 
         return result
+
+    def _record_failure(self, requests_json, started):
+        """Requests without response (connection error, timeout, broken
+        content) are errors of RPC_STATS too"""
+        if not RPC_STATS.enabled:
+            return
+        elapsed_ms = (time.time() - started) * 1000
+        for request in requests_json:
+            RPC_STATS.record(request["method"],
+                             elapsed_ms / len(requests_json),
+                             len(json.dumps(request)), 0, True)
+
+    def send_request(self, method, *arguments, **kwargs):
+        expected_code = kwargs.get('expected_code', 200)
+
+        push_json = self._prepare_request(method, arguments)
+
+        started = time.time()
+        try:
+            with PROFILER.section(RPC):
+                response = self._post(push_json)
+
+                # content is read completely here, so the connection goes
+                # back to the pool and is reused by the next request
+                result = json.loads(response.content)
+        except (requests.exceptions.RequestException, ValueError):
+            self._record_failure([push_json], started)
+            raise
+        status_code = response.status_code
+
+        if RPC_STATS.enabled:
+            RPC_STATS.record(method, (time.time() - started) * 1000,
+                             len(json.dumps(push_json)),
+                             len(response.content), 'error' in result)
+
+        return self._check_response(result, push_json["id"], status_code,
+                                    expected_code)
+
+    def _send_sequentially(self, calls):
+        responses = list()
+        for method, arguments, expected_code in calls:
+            responses.append(self.send_request(
+                method, *arguments, expected_code=expected_code))
+        return responses
+
+    def send_batch(self, calls):
+        """calls is a list of (method, arguments, expected_code) tuples.
+        Returns list of responses in the same order as calls"""
+        if not calls:
+            return list()
+        if not self.batch_supported:
+            return self._send_sequentially(calls)
+
+        push_json = [self._prepare_request(method, arguments)
+                     for method, arguments, _ in calls]
+
+        started = time.time()
+        try:
+            with PROFILER.section(RPC):
+                response = self._post(push_json)
+                try:
+                    result = json.loads(response.content)
+                except ValueError:
+                    result = None
+        except requests.exceptions.RequestException:
+            self._record_failure(push_json, started)
+            raise
+        elapsed_ms = (time.time() - started) * 1000
+
+        if not isinstance(result, list):
+            # the whole batch is rejected, so none of calls is executed
+            logger.info(
+                'Batch requests are not supported by %s. Sending requests '
+                'one by one' % self.uri)
+            self.batch_supported = False
+            return self._send_sequentially(calls)
+
+        results_by_id = dict((item.get("id"), item) for item in result)
+        responses = list()
+        for request, (_, _, expected_code) in zip(push_json, calls):
+            request_id = request["id"]
+            item = results_by_id.get(request_id)
+            if item is None:
+                raise BitshareStatusCodeError(
+                    'No response for "%s" request in batch: %s' % (
+                        request["method"], result))
+            # status code is common for the whole batch, so it is derived
+            # from every response item separately
+            status_code = 200 if 'error' not in item else 500
+            if RPC_STATS.enabled:
+                # the batch is one round trip, its cost is shared by calls
+                RPC_STATS.record(request["method"], elapsed_ms / len(calls),
+                                 len(json.dumps(request)),
+                                 len(json.dumps(item)), 'error' in item)
+            responses.append(self._check_response(
+                item, request_id, status_code, expected_code))
+        return responses
+
+
+class RpcFuture(object):
+    def __init__(self, method):
+        self.method = method
+        self._done = False
+        self._response = None
+
+    def set_response(self, response):
+        self._response = response
+        self._done = True
+
+    def done(self):
+        return self._done
+
+    def response(self):
+        if not self._done:
+            raise BitshareConditionError(
+                '"%s" request is not sent yet' % self.method)
+        return self._response
+
+    def result(self):
+        return self.response().get("result")
+
+
+class RpcBatch(object):
+    """Collects requests and sends them as one JSON-RPC batch.
+    Futures returned by send_request are filled on execute() or on leaving
+    "with" block"""
+    def __init__(self, rpc):
+        self.rpc = rpc
+        self._calls = list()
+        self._futures = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def send_request(self, method, *arguments, **kwargs):
+        expected_code = kwargs.get('expected_code', 200)
+        future = RpcFuture(method)
+        self._calls.append((method, arguments, expected_code))
+        self._futures.append(future)
+        return future
+
+    def execute(self):
+        calls, futures = self._calls, self._futures
+        self._calls, self._futures = list(), list()
+        responses = self.rpc.send_batch(calls)
+        for future, response in zip(futures, responses):
+            future.set_response(response)
+        return [future.response() for future in futures]
+
+
+_rpc_factory = {'factory': JsonRpc}
+
+
+def set_rpc_factory(factory):
+    """factory(uri, pool_size) is used by all clients to create their rpc
+    objects. JsonRpc is used by default, sim_chain replaces it"""
+    _rpc_factory['factory'] = factory
+
+
+def create_rpc(uri, pool_size=DEFAULT_POOL_SIZE):
+    return _rpc_factory['factory'](uri, pool_size=pool_size)
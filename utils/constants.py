@@ -19,3 +19,10 @@ DEFAULT_EXTENSIONS = {
 }
 
 DMF_ASSET_FLAG = 512
+
+# graphene operation ids
+TRANSFER_OPERATION = 0
+LIMIT_ORDER_CREATE_OPERATION = 1
+ACCOUNT_UPDATE_OPERATION = 6
+ACCOUNT_WHITELIST_OPERATION = 7
+ASSET_ISSUE_OPERATION = 14
@@ -0,0 +1,150 @@
+# Expected market fees and fee sharing rewards with the chain's integer
+# math (graphene detail::calculate_percent): every percent is in basis
+# points, 10000 means 100%, and every division rounds down.
+# Functions take columns (lists) of trades; a scalar argument is used for
+# every trade. Results are columns of integer satoshi amounts, e.g.
+#   fees = calculate_market_fees([100, 150], 1000)        # [10, 15]
+#   rewards = calculate_rewards([100, 150], 1000, 5000, [2000, 0])
+#   rewards['referrer_reward']                             # [1, 0]
+# Dynamic market fee tables of DMF assets:
+#   fees = DynamicFees(DEFAULT_EXTENSIONS)
+#   fees.calculate_fees([10000, 10000], volumes=[0, 5000], is_maker=False)
+
+import bisect
+from decimal import Decimal
+
+
+PERCENT_100 = 10000
+
+
+def broadcast_columns(*columns):
+    """Returns lists of the same length, scalars are repeated"""
+    lengths = set(len(column) for column in columns
+                  if isinstance(column, (list, tuple)))
+    if len(lengths) > 1:
+        raise ValueError('Columns have different lengths: %s' %
+                         sorted(lengths))
+    length = lengths.pop() if lengths else 1
+    return [list(column) if isinstance(column, (list, tuple))
+            else [column] * length for column in columns]
+
+
+def calculate_percent(value, percent):
+    return value * percent // PERCENT_100
+
+
+def calculate_percents(values, percents):
+    values, percents = broadcast_columns(values, percents)
+    return [value * percent // PERCENT_100
+            for value, percent in zip(values, percents)]
+
+
+def to_satoshi(amounts, precisions):
+    """Converts amounts in asset units to integer satoshi amounts"""
+    amounts, precisions = broadcast_columns(amounts, precisions)
+    result = list()
+    for amount, precision in zip(amounts, precisions):
+        value = Decimal(str(amount)) * 10 ** int(precision)
+        if value != value.to_integral_value():
+            raise ValueError('%s has more than %s decimals' % (amount,
+                                                               precision))
+        result.append(int(value))
+    return result
+
+
+def calculate_market_fees(amounts, fee_percents, max_market_fees=None):
+    """amounts are received satoshi amounts"""
+    amounts, fee_percents, max_market_fees = broadcast_columns(
+        amounts, fee_percents, max_market_fees)
+    fees = calculate_percents(amounts, fee_percents)
+    return [fee if max_fee is None else min(fee, int(max_fee))
+            for fee, max_fee in zip(fees, max_market_fees)]
+
+
+def calculate_rewards(amounts, fee_percents, reward_percents,
+                      referrer_percents, max_market_fees=None):
+    """referrer_percents are referrer_rewards_percentage of sellers, use 0
+    when the referrer is the registrar. Returns dict of columns:
+    market_fee, reward, referrer_reward, registrar_reward and
+    accumulated_fee (what stays in asset's accumulated fees)"""
+    amounts, fee_percents, reward_percents, referrer_percents, \
+        max_market_fees = broadcast_columns(
+            amounts, fee_percents, reward_percents, referrer_percents,
+            max_market_fees)
+    market_fees = calculate_market_fees(amounts, fee_percents,
+                                        max_market_fees)
+    rewards = calculate_percents(market_fees, reward_percents)
+    referrer_rewards = calculate_percents(rewards, referrer_percents)
+    return {
+        'market_fee': market_fees,
+        'reward': rewards,
+        'referrer_reward': referrer_rewards,
+        'registrar_reward': [reward - referrer_reward for reward,
+                             referrer_reward in zip(rewards,
+                                                    referrer_rewards)],
+        'accumulated_fee': [fee - reward for fee, reward in zip(market_fees,
+                                                                rewards)],
+    }
+
+
+class DynamicFeeTable(object):
+    """maker_fee or taker_fee table of dynamic_fees extension. Like the
+    chain, rows are sorted by amount and the first of rows with the same
+    amount is used"""
+    def __init__(self, rows):
+        unique_rows = dict()
+        for row in rows:
+            unique_rows.setdefault(int(row['amount']), int(row['percent']))
+        self.amounts = sorted(unique_rows)
+        self.percents = [unique_rows[amount] for amount in self.amounts]
+
+    def get_percent(self, volume):
+        """Percent of the row with the largest amount not above volume"""
+        index = bisect.bisect_right(self.amounts, volume) - 1
+        return self.percents[index] if index >= 0 else 0
+
+    def get_percents(self, volumes):
+        volumes, = broadcast_columns(volumes)
+        return [self.get_percent(volume) for volume in volumes]
+
+
+class DynamicFees(object):
+    def __init__(self, extensions):
+        dynamic_fees = extensions['dynamic_fees']
+        self.maker = DynamicFeeTable(dynamic_fees['maker_fee'])
+        self.taker = DynamicFeeTable(dynamic_fees['taker_fee'])
+
+    def get_percents(self, volumes, is_maker):
+        volumes, is_maker = broadcast_columns(volumes, is_maker)
+        return [(self.maker if maker else self.taker).get_percent(volume)
+                for volume, maker in zip(volumes, is_maker)]
+
+    def calculate_fees(self, amounts, volumes, is_maker,
+                       max_market_fees=None):
+        """volumes are trade statistics of the receiving accounts before
+        the fills"""
+        amounts, volumes, is_maker = broadcast_columns(amounts, volumes,
+                                                       is_maker)
+        return calculate_market_fees(
+            amounts, self.get_percents(volumes, is_maker), max_market_fees)
+
+
+def decay_trade_statistics(volumes, maintenances_counts):
+    """Trade statistics volumes after maintenances_counts maintenances.
+    Every maintenance keeps floor(59 * volume / 60); the floors do not
+    compose into one power of 59/60, so steps are applied one by one, but
+    only while a volume is non zero: that takes at most ~2.5k steps for
+    any 64-bit volume, whatever the number of maintenances"""
+    volumes, maintenances_counts = broadcast_columns(volumes,
+                                                     maintenances_counts)
+    result = list()
+    for volume, count in zip(volumes, maintenances_counts):
+        while volume > 0 and count > 0:
+            if volume < 60:
+                # floor(59 * volume / 60) is volume - 1 here
+                volume = max(volume - count, 0)
+                break
+            volume = volume * 59 // 60
+            count -= 1
+        result.append(volume)
+    return result
@@ -1,4 +1,4 @@
-from account import create_account_with_balance
+from account import create_account_with_balance, create_accounts
 
 
 def create_self_locked_account():
@@ -16,9 +16,7 @@ def create_linked_to_self_locked_account():
 
 
 def create_cycled_accounts():
-    account_1 = create_account_with_balance()
-    account_2 = create_account_with_balance()
-    account_3 = create_account_with_balance()
+    account_1, account_2, account_3 = create_accounts(3)
 
     account_1.update_authorities(
         1, [[account_2.id, 1]], 1, [[account_2.id, 1]])
@@ -31,9 +29,7 @@ def create_cycled_accounts():
 
 
 def create_double_locked_accounts():
-    account_1 = create_account_with_balance()
-    account_2 = create_account_with_balance()
-    account_3 = create_account_with_balance()
+    account_1, account_2, account_3 = create_accounts(3)
 
     account_1.update_authorities(
         1, [[account_2.id, 1]], 1, [[account_2.id, 1]])
@@ -0,0 +1,192 @@
+# Incremental scanner of witness_node log for maintenance markers:
+#   1234000ms th_a ... Started in block=#120 ...
+#   1234500ms th_a ... Finished in block=#120 ...
+# The file is memory-mapped and only bytes appended since the previous scan
+# are read, so repeated queries over gigabyte logs stay cheap.
+
+import os
+import re
+import mmap
+import threading
+from collections import namedtuple
+from Queue import Queue
+from rpc_stats import RPC_STATS
+from utils.py_logger import logger
+
+
+MAINTENANCE_MARKER = re.compile(
+    r'^(\d+)ms\b[^\n]*?(Started|Finished) in block=#(\d+)', re.MULTILINE)
+# how often (in seconds) the follower checks the log for new lines
+DEFAULT_POLL_INTERVAL = 0.5
+
+MaintenanceTiming = namedtuple('MaintenanceTiming',
+                               ['block', 'start_ms', 'finish_ms',
+                                'duration_ms'])
+
+
+class MaintenanceLogIndex(object):
+    """Index of maintenance start/finish times (ms) by block number.
+    offset is the position after the last complete line already scanned,
+    it can be saved and passed back to continue from the same place"""
+    def __init__(self, log_file_path, offset=0):
+        self.log_file_path = log_file_path
+        self.offset = offset
+        self.started = dict()
+        self.finished = dict()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        self.offset = 0
+        self.started.clear()
+        self.finished.clear()
+
+    def skip_scanned(self):
+        """Forgets markers logged so far and keeps only the ones appended
+        later, e.g. after a chain snapshot is restored and the same block
+        numbers are produced again"""
+        self.update()
+        with self._lock:
+            self.started.clear()
+            self.finished.clear()
+
+    def update(self):
+        """Scans bytes appended since the previous call"""
+        with self._lock:
+            if not os.path.exists(self.log_file_path):
+                return self.offset
+            size = os.path.getsize(self.log_file_path)
+            if size < self.offset:
+                # log was truncated or recreated by a new container
+                self.reset()
+            if size == self.offset:
+                return self.offset
+            with open(self.log_file_path, 'rb') as log_file:
+                mapped = mmap.mmap(log_file.fileno(), size,
+                                   access=mmap.ACCESS_READ)
+                try:
+                    self._scan(mapped, size)
+                finally:
+                    mapped.close()
+            return self.offset
+
+    def _scan(self, mapped, size):
+        # the last line may be written right now, so it is left for later
+        end = mapped.rfind(b'\n', self.offset, size) + 1
+        if end <= self.offset:
+            return
+        for match in MAINTENANCE_MARKER.finditer(mapped, self.offset, end):
+            time_ms, marker, block = match.groups()
+            markers = self.started if marker == b'Started' else self.finished
+            markers.setdefault(int(block), int(time_ms))
+        self.offset = end
+
+    def find_maintenance_after(self, block_number):
+        """Returns (block, start_ms, finish_ms) of the first maintenance
+        started after block_number. Times are None if not logged yet"""
+        self.update()
+        blocks = [block for block in self.started if block > block_number]
+        if not blocks:
+            return None, None, None
+        block = min(blocks)
+        return block, self.started[block], self.finished.get(block)
+
+    def get_finished_maintenances(self):
+        with self._lock:
+            return [MaintenanceTiming(block, self.started[block],
+                                      self.finished[block],
+                                      self.finished[block] -
+                                      self.started[block])
+                    for block in sorted(self.started)
+                    if block in self.finished]
+
+
+class MaintenanceLogFollower(object):
+    """Tails witness log in a background thread and publishes every
+    finished maintenance as MaintenanceTiming to the queue and to callback.
+    Maintenances finished before start() are skipped unless from_start"""
+    def __init__(self, log_file_path, callback=None,
+                 poll_interval=DEFAULT_POLL_INTERVAL, from_start=False):
+        self.index = get_log_index(log_file_path)
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+        self.queue = Queue()
+        self.timings = list()
+        self._published = set()
+        self._poll_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not self.from_start:
+            self.index.update()
+            self._published.update(
+                timing.block
+                for timing in self.index.get_finished_maintenances())
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._follow,
+                                        name='maintenance-log-follower')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # lines written right before stop() are published too
+        self.poll()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _follow(self):
+        # callbacks may call the node, that is not a part of the test
+        RPC_STATS.set_background()
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.info('Failed to read %s: %s' % (
+                    self.index.log_file_path, e))
+            self._stopped.wait(self.poll_interval)
+
+    def poll(self):
+        """Publishes maintenances finished since the previous poll"""
+        with self._poll_lock:
+            self.index.update()
+            new_timings = [timing for timing in
+                           self.index.get_finished_maintenances()
+                           if timing.block not in self._published]
+            for timing in new_timings:
+                self._published.add(timing.block)
+                self.timings.append(timing)
+                logger.info('Maintenance in block #%s took %s ms' % (
+                    timing.block, timing.duration_ms))
+                self.queue.put(timing)
+                if self.callback is not None:
+                    self.callback(timing)
+            return new_timings
+
+    def get(self, timeout=None):
+        """Waits for the next published maintenance"""
+        return self.queue.get(timeout=timeout)
+
+
+_indexes = dict()
+_indexes_lock = threading.Lock()
+
+
+def get_log_index(log_file_path):
+    """Returns index shared by all callers of the same log file"""
+    log_file_path = os.path.abspath(log_file_path)
+    with _indexes_lock:
+        index = _indexes.get(log_file_path)
+        if index is None:
+            index = MaintenanceLogIndex(log_file_path)
+            _indexes[log_file_path] = index
+        return index
@@ -0,0 +1,266 @@
+# Open-loop order flow between pairs of accounts. Every pair places two
+# crossing orders (seller sells ASSET for BTS, buyer sells BTS for ASSET)
+# at the scheduled time, independently of how fast previous orders were
+# accepted, so slow responses show up as latency instead of lower load.
+#
+# Usage:
+#   pairs, asset = prepare_order_load(10, asset_kind=DMF_ASSET_KIND)
+#   report = OrderLoadGenerator(pairs, asset, orders_per_second=5,
+#                               duration=60).run()
+
+import time
+import threading
+from account import create_accounts
+from assets import create_new_user_asset, prepare_reward_user_asset_options
+from async_client import AsyncCliWallet, gather
+from b3_exceptions import BitshareStatusCodeError
+from cli_wallet import CLI_WALLET
+from constants import DEFAULT_CORE_ASSET, LIMIT_ORDER_CREATE_OPERATION
+from dmf_asset import create_dmf_asset
+from testutil import seller_list_generator, wait_blocks
+from utils.py_logger import logger
+
+
+USER_ASSET_KIND = 'user_asset'
+DMF_ASSET_KIND = 'dmf_asset'
+DEFAULT_CONCURRENCY = 50
+# how often open orders are checked for fill
+DEFAULT_POLL_INTERVAL = 0.5
+# how long unfilled orders are waited for after the last submission
+DEFAULT_DRAIN_TIMEOUT = 30
+# blocks an included order waits for its transaction id to be registered,
+# orders of other clients are dropped after that
+INCLUDED_ORDERS_BLOCKS = 10
+ORDER_EXPIRATION = 3600
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+def prepare_order_load(pairs_count, asset_kind=USER_ASSET_KIND,
+                       registrar='init1', asset_balance=1000000,
+                       bts_balance=1000000, options=None):
+    """Creates pairs_count (seller, buyer) pairs: sellers get the new
+    asset, buyers get BTS. Returns (pairs, asset)"""
+    sellers = create_accounts(pairs_count, balance=bts_balance)
+    buyers = create_accounts(pairs_count, balance=bts_balance)
+    if asset_kind == DMF_ASSET_KIND:
+        asset = create_dmf_asset(registrar, asset_balance * pairs_count)
+        for seller in sellers:
+            CLI_WALLET.transfer(registrar, seller.name, asset_balance,
+                                asset=asset.name)
+    else:
+        options = prepare_reward_user_asset_options(100, 1000) \
+            if options is None else options
+        asset = create_new_user_asset(registrar, 0, options=options)
+        for seller in sellers:
+            CLI_WALLET.issue_asset(seller.name, asset_balance, asset.name)
+    wait_blocks()
+    return list(seller_list_generator(sellers, buyers)), asset
+
+
+def calculate_percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = int(round(percent / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+class OrderLoadGenerator(object):
+    def __init__(self, pairs, asset, orders_per_second, duration,
+                 amount=1, price=1, quote_asset=DEFAULT_CORE_ASSET,
+                 concurrency=DEFAULT_CONCURRENCY,
+                 poll_interval=DEFAULT_POLL_INTERVAL,
+                 drain_timeout=DEFAULT_DRAIN_TIMEOUT, wallet_uri=None,
+                 clock=time.time, sleep=time.sleep):
+        """orders_per_second counts single orders, a pair places two"""
+        self.pairs = pairs
+        self.asset = asset
+        self.orders_per_second = float(orders_per_second)
+        self.duration = duration
+        self.amount = amount
+        self.price = price
+        self.quote_asset = quote_asset
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self.clock = clock
+        self.sleep = sleep
+        self.client = AsyncCliWallet(wallet_uri or CLI_WALLET.rpc.uri,
+                                     concurrency)
+        self.wallet = self.client.wallet
+        self._lock = threading.Lock()
+        # order id -> scheduled time
+        self._open_orders = dict()
+        # transaction id -> scheduled time of orders not found in blocks yet
+        self._unresolved_orders = dict()
+        # transaction id -> (order id, block number) of new orders in
+        # scanned blocks, the transaction id may be registered after its
+        # block is scanned
+        self._included_orders = dict()
+        self._next_block = self.wallet.get_head_block_number() + 1
+        self.submit_latencies = list()
+        self.fill_latencies = list()
+        self.accepted = 0
+        self.rejected = 0
+        self.errors = list()
+
+    def _get_order(self, index):
+        seller, buyer = self.pairs[(index // 2) % len(self.pairs)]
+        if index % 2 == 0:
+            return (seller.name, self.amount, self.asset.name,
+                    self.amount * self.price, self.quote_asset)
+        return (buyer.name, self.amount * self.price, self.quote_asset,
+                self.amount, self.asset.name)
+
+    def _get_order_id(self, result):
+        """cli_wallet replies with signed transaction without
+        operation_results, then None is returned and the order id is read
+        from the block that includes the transaction"""
+        operation_results = result.get('operation_results')
+        if operation_results:
+            return operation_results[0][1]
+        return None
+
+    def _submit(self, wallet, order, scheduled):
+        try:
+            result = wallet.sell_asset(*(order + (ORDER_EXPIRATION,)))
+        except BitshareStatusCodeError as e:
+            with self._lock:
+                self.rejected += 1
+                self.errors.append(str(e))
+            return
+        now = self.clock()
+        order_id = self._get_order_id(result)
+        if order_id is None:
+            tx_id = wallet.send_request('get_transaction_id',
+                                        [result])['result']
+        with self._lock:
+            self.accepted += 1
+            self.submit_latencies.append(now - scheduled)
+            if order_id is None:
+                order_id, _ = self._included_orders.pop(tx_id, (None, None))
+            if order_id is None:
+                self._unresolved_orders[tx_id] = scheduled
+            else:
+                self._open_orders[order_id] = scheduled
+
+    def _resolve_included_orders(self):
+        """Finds ids of unresolved orders in blocks applied since the
+        previous call"""
+        head_block = self.wallet.get_head_block_number()
+        if head_block < self._next_block:
+            return
+        first_block = self._next_block
+        with self.wallet.batch() as batch:
+            blocks = [batch.send_request('get_block', [number])
+                      for number in xrange(first_block, head_block + 1)]
+        self._next_block = head_block + 1
+        with self._lock:
+            for number, block in enumerate(blocks, first_block):
+                block = block.result() or dict()
+                for tx_id, transaction in zip(block.get('transaction_ids', []),
+                                              block.get('transactions', [])):
+                    op_type, _ = transaction['operations'][0]
+                    if op_type != LIMIT_ORDER_CREATE_OPERATION:
+                        continue
+                    order_id = transaction['operation_results'][0][1]
+                    scheduled = self._unresolved_orders.pop(tx_id, None)
+                    if scheduled is None:
+                        self._included_orders[tx_id] = order_id, number
+                    else:
+                        self._open_orders[order_id] = scheduled
+            oldest_block = head_block - INCLUDED_ORDERS_BLOCKS
+            for tx_id, (_, number) in self._included_orders.items():
+                if number < oldest_block:
+                    del self._included_orders[tx_id]
+
+    def _check_fills(self):
+        self._resolve_included_orders()
+        with self._lock:
+            order_ids = self._open_orders.keys()
+        if not order_ids:
+            return
+        orders = self.wallet.get_objects(order_ids)
+        now = self.clock()
+        with self._lock:
+            for order_id, order in zip(order_ids, orders):
+                if order is None:
+                    scheduled = self._open_orders.pop(order_id)
+                    self.fill_latencies.append(now - scheduled)
+
+    def run(self):
+        orders_count = int(self.orders_per_second * self.duration)
+        logger.info('Placing %s orders with %s orders per second...' % (
+            orders_count, self.orders_per_second))
+        started = self.clock()
+        next_check = started + self.poll_interval
+        async_results = list()
+        for index in xrange(orders_count):
+            # open loop: the schedule does not depend on responses
+            scheduled = started + index / self.orders_per_second
+            while True:
+                now = self.clock()
+                if now >= next_check:
+                    self._check_fills()
+                    next_check = now + self.poll_interval
+                if now >= scheduled:
+                    break
+                self.sleep(min(scheduled, next_check) - now)
+            async_results.append(self.client.call(
+                self._submit, self._get_order(index), scheduled))
+        gather(async_results)
+        submitted = self.clock()
+        # all transaction ids are registered, the rest are orders of others
+        with self._lock:
+            self._included_orders.clear()
+
+        deadline = submitted + self.drain_timeout
+        while self._has_open_orders() and self.clock() < deadline:
+            self._check_fills()
+            if self._has_open_orders():
+                self.sleep(self.poll_interval)
+        self.close()
+        report = self.get_report(orders_count, submitted - started)
+        logger.info('Order load report: %s' % report)
+        return report
+
+    def _has_open_orders(self):
+        return bool(self._open_orders or self._unresolved_orders)
+
+    def close(self):
+        self.client.close()
+
+    def get_report(self, orders_count, submission_time):
+        submitted = self.accepted + self.rejected
+        fill_latencies = sorted(self.fill_latencies)
+        submit_latencies = sorted(self.submit_latencies)
+        report = {
+            'scheduled': orders_count,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'rejection_rate': float(self.rejected) / submitted if submitted
+            else 0.0,
+            'target_tps': self.orders_per_second,
+            'achieved_tps': self.accepted / submission_time
+            if submission_time else 0.0,
+            'filled': len(fill_latencies),
+            'unfilled': len(self._open_orders) +
+            len(self._unresolved_orders),
+        }
+        for percent in LATENCY_PERCENTILES:
+            report['fill_latency_p%s' % percent] = calculate_percentile(
+                fill_latencies, percent)
+            report['submit_latency_p%s' % percent] = calculate_percentile(
+                submit_latencies, percent)
+        return report
+
+
+def record_order_load_report(results_store, report, params=None):
+    params = dict(params or dict(), target_tps=report['target_tps'])
+    results_store.record('order_load_tps', report['achieved_tps'], 'tx/s',
+                         params, higher_is_better=True)
+    results_store.record('order_load_rejection_rate',
+                         report['rejection_rate'], 'ratio', params)
+    for percent in LATENCY_PERCENTILES:
+        latency = report['fill_latency_p%s' % percent]
+        if latency is not None:
+            results_store.record('order_fill_latency_p%s' % percent,
+                                 latency, 's', params)
@@ -0,0 +1,121 @@
+# Pipelined broadcast of cli_wallet write operations. Calls are sent from
+# a thread pool without waiting for each other, returned transactions are
+# collected, and one await_included() confirms all of them by the
+# transaction ids of new blocks. Reads (get_*, list_* and so on) are sent
+# the same way, but their results are not taken for transactions:
+#   with Pipeline() as pipeline:
+#       for account in accounts:
+#           pipeline.transfer('nathan', account.name, 100)
+#       pipeline.issue_asset(account.name, 10, asset.name)
+#   pipeline.await_included()
+# instead of waiting for a block after every call.
+
+from async_client import AsyncCliWallet
+from b3_exceptions import BitshareConditionError
+from block_watcher import BLOCK_WATCHER
+from cli_wallet import CLI_WALLET
+from connection import is_read_only
+from utils.py_logger import logger
+
+
+DEFAULT_CONCURRENCY = 20
+# blocks a transaction may wait for inclusion, it expires after that anyway
+DEFAULT_MAX_BLOCKS = 60
+
+
+def get_signed_transaction(value):
+    """Write helpers return either the transaction or the whole response"""
+    if isinstance(value, dict) and 'operations' not in value and \
+            'result' in value:
+        value = value['result']
+    if not isinstance(value, dict) or 'operations' not in value:
+        raise BitshareConditionError('Not a transaction: %s' % value)
+    return value
+
+
+def get_transaction_ids(transactions, wallet=CLI_WALLET):
+    with wallet.batch() as batch:
+        tx_ids = [batch.send_request('get_transaction_id', [transaction])
+                  for transaction in transactions]
+    return [tx_id.result() for tx_id in tx_ids]
+
+
+def await_included(tx_ids, first_block, max_blocks=DEFAULT_MAX_BLOCKS,
+                   wallet=CLI_WALLET, watcher=BLOCK_WATCHER):
+    """Waits until all transactions are in blocks starting from
+    first_block. New blocks are read with one batch per wait. Returns dict
+    of transaction id -> block number"""
+    pending = set(tx_ids)
+    included = dict()
+    next_block = first_block
+    while pending:
+        if next_block - first_block >= max_blocks:
+            raise BitshareConditionError(
+                '%s transactions are not included in %s blocks: %s' % (
+                    len(pending), max_blocks, sorted(pending)))
+        props = watcher.wait_for_block(next_block)
+        head_block = props['head_block_number']
+        with wallet.batch() as batch:
+            blocks = [batch.send_request('get_block', [number])
+                      for number in xrange(next_block, head_block + 1)]
+        for number, block in zip(xrange(next_block, head_block + 1),
+                                 blocks):
+            block = block.result() or dict()
+            for tx_id in block.get('transaction_ids', []):
+                if tx_id in pending:
+                    pending.remove(tx_id)
+                    included[tx_id] = number
+        next_block = head_block + 1
+    logger.info('%s transactions are included into blocks %s..%s' % (
+        len(included), first_block, next_block - 1))
+    return included
+
+
+class Pipeline(AsyncCliWallet):
+    """Has the same methods as CliWallet. Every call is sent immediately
+    from a thread pool and returns AsyncResult; transactions of all
+    broadcast calls are awaited at once by await_included()"""
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, wallet=CLI_WALLET):
+        super(Pipeline, self).__init__(wallet.rpc.uri, concurrency)
+        self.main_wallet = wallet
+        # results of broadcast calls only
+        self.results = list()
+        # transactions are sent after the current head block
+        self.first_block = wallet.get_head_block_number() + 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getattr__(self, name):
+        call_async = super(Pipeline, self).__getattr__(name)
+        if not callable(call_async) or is_read_only(name):
+            return call_async
+
+        def broadcast(*arguments, **kwargs):
+            result = call_async(*arguments, **kwargs)
+            self.results.append(result)
+            return result
+        return broadcast
+
+    def get_transactions(self):
+        """Waits for all broadcast calls, the first failed call raises
+        here. Calls that broadcast several transactions (e.g.
+        build_transactions) return a list of them"""
+        transactions = list()
+        for result in self.results:
+            value = result.get()
+            values = value if isinstance(value, list) else [value]
+            transactions.extend(get_signed_transaction(transaction)
+                                for transaction in values)
+        return transactions
+
+    def get_transaction_ids(self):
+        return get_transaction_ids(self.get_transactions(),
+                                   self.main_wallet)
+
+    def await_included(self, max_blocks=DEFAULT_MAX_BLOCKS):
+        return await_included(self.get_transaction_ids(), self.first_block,
+                              max_blocks, self.main_wallet)
@@ -1,5 +1,7 @@
 import logging
 from utils.step_generator import StepGenerator
+from utils.workers import is_xdist_worker, get_worker_id
+from utils.time_profiler import PROFILER
 
 
 msg_fmt = '%(asctime)s |  %(funcName)-25s |  %(levelname)-5s |%(message)s'
@@ -20,7 +22,9 @@ logger.setLevel(logging.DEBUG)
 def log_step(message):
     step_generator = StepGenerator()
     step_number = step_generator.increment()
-    logger.log(25, '=== Step %s. %s' % (step_number, message))
+    worker = '[%s] ' % get_worker_id() if is_xdist_worker() else ''
+    logger.log(25, '=== %sStep %s. %s' % (worker, step_number, message))
+    PROFILER.start_step(message)
 
 
 # Add key that below to CLI command for showing only test steps messages
@@ -0,0 +1,119 @@
+import threading
+from collections import defaultdict
+from Queue import Queue, Empty
+from account import create_accounts
+from assets import create_new_user_assets
+from b3_exceptions import BitshareConditionError
+from rpc_stats import RPC_STATS
+from utils.py_logger import logger
+
+
+ORDINARY_ACCOUNT = 'account'
+LIFETIME_ACCOUNT = 'lifetime_account'
+USER_ASSET = 'user_asset'
+
+# how long (in seconds) a test may wait for a resource before it fails
+DEFAULT_TAKE_TIMEOUT = 300
+
+
+class ResourcePool(object):
+    """Pre-creates funded accounts and user assets in background threads and
+    hands them out to tests. A new batch of some kind is created as soon as
+    number of its ready objects drops below low_water_mark"""
+    def __init__(self, batch_size=10, low_water_mark=3, balance=1000000,
+                 asset_registrar='init1', asset_precision=0,
+                 take_timeout=DEFAULT_TAKE_TIMEOUT):
+        self.batch_size = batch_size
+        self.low_water_mark = low_water_mark
+        self.balance = balance
+        self.asset_registrar = asset_registrar
+        self.asset_precision = asset_precision
+        self.take_timeout = take_timeout
+        self._factories = {
+            ORDINARY_ACCOUNT: self._create_ordinary_accounts,
+            LIFETIME_ACCOUNT: self._create_lifetime_accounts,
+            USER_ASSET: self._create_user_assets,
+        }
+        self._ready = dict((kind, Queue()) for kind in self._factories)
+        self._refill_threads = dict()
+        self._errors = dict()
+        self._lock = threading.Lock()
+        # test id -> list of (kind, object name)
+        self.consumers = defaultdict(list)
+
+    def _create_ordinary_accounts(self):
+        return create_accounts(self.batch_size, balance=self.balance)
+
+    def _create_lifetime_accounts(self):
+        return create_accounts(self.batch_size, balance=self.balance,
+                               lifetime=True)
+
+    def _create_user_assets(self):
+        return create_new_user_assets(self.asset_registrar,
+                                      self.asset_precision, self.batch_size)
+
+    def _refill(self, kind):
+        RPC_STATS.set_background()
+        try:
+            logger.info('Refilling "%s" pool...' % kind)
+            for resource in self._factories[kind]():
+                self._ready[kind].put(resource)
+            logger.info('"%s" pool is refilled' % kind)
+        except Exception as e:
+            logger.info('Refilling of "%s" pool failed: %s' % (kind, e))
+            self._errors[kind] = e
+
+    def _refill_if_needed(self, kind):
+        with self._lock:
+            if self._ready[kind].qsize() >= self.low_water_mark:
+                return
+            thread = self._refill_threads.get(kind)
+            if thread is not None and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._refill, args=(kind,),
+                                      name='refill-%s' % kind)
+            thread.daemon = True
+            self._refill_threads[kind] = thread
+            thread.start()
+
+    def start(self, kinds=None):
+        for kind in (self._factories.keys() if kinds is None else kinds):
+            self._refill_if_needed(kind)
+
+    def stop(self):
+        for thread in self._refill_threads.values():
+            thread.join()
+
+    def take(self, kind, consumer=None):
+        self._refill_if_needed(kind)
+        waited = 0
+        while True:
+            try:
+                resource = self._ready[kind].get(timeout=1)
+                break
+            except Empty:
+                waited += 1
+                error = self._errors.pop(kind, None)
+                if error is not None or waited >= self.take_timeout:
+                    raise BitshareConditionError(
+                        'No "%s" is available in pool. Refill error: %s' % (
+                            kind, error))
+                self._refill_if_needed(kind)
+        self._refill_if_needed(kind)
+        self.consumers[consumer].append((kind, resource.name))
+        logger.info('"%s" %s is taken from pool by %s' % (
+            resource.name, kind, consumer))
+        return resource
+
+    def get_account(self, consumer=None):
+        return self.take(ORDINARY_ACCOUNT, consumer)
+
+    def get_lifetime_account(self, consumer=None):
+        return self.take(LIFETIME_ACCOUNT, consumer)
+
+    def get_user_asset(self, consumer=None):
+        return self.take(USER_ASSET, consumer)
+
+    def log_consumers(self):
+        for consumer, resources in sorted(self.consumers.items()):
+            logger.info('%s consumed: %s' % (consumer, resources))
@@ -0,0 +1,221 @@
+# Append-only JSON-lines store of benchmark measurements.
+# Every line is one measurement with its run metadata, e.g.
+#   {"run_id": "...", "name": "maintenance_time", "value": 1234, "unit": "ms",
+#    "params": {"holders_count": 100}, "git_revision": "...", ...}
+# Lines are appended under an exclusive lock, so xdist workers can share
+# one file.
+#
+# Compare the last two runs:
+#   python -m utils.results_store benchmark_results.jsonl
+# Compare given runs with 5% tolerance:
+#   python -m utils.results_store benchmark_results.jsonl \
+#       --baseline <run_id> --current <run_id> --threshold 0.05
+
+import os
+import sys
+import json
+import time
+import fcntl
+import argparse
+import subprocess
+from datetime import datetime
+from contextlib import contextmanager
+from b3_exceptions import BitshareBaseException
+
+
+DEFAULT_RESULTS_FILE = 'benchmark_results.jsonl'
+# relative change of a value that is reported as regression
+DEFAULT_THRESHOLD = 0.1
+
+_metadata = dict()
+
+
+def get_run_id():
+    """One id for the whole session, shared by all xdist workers"""
+    if 'run_id' not in _metadata:
+        _metadata['run_id'] = os.environ.get(
+            'PYTEST_XDIST_TESTRUNUID',
+            datetime.utcnow().strftime('%Y%m%dT%H%M%S.%f'))
+    return _metadata['run_id']
+
+
+def get_git_revision():
+    if 'git_revision' not in _metadata:
+        repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            revision = subprocess.check_output(
+                ['git', 'rev-parse', 'HEAD'], cwd=repo_dir,
+                stderr=subprocess.STDOUT).strip()
+        except (OSError, subprocess.CalledProcessError):
+            revision = None
+        _metadata['git_revision'] = revision
+    return _metadata['git_revision']
+
+
+def get_node_version():
+    if 'node_version' not in _metadata:
+        from cli_wallet import CLI_WALLET
+        try:
+            response = CLI_WALLET.try_send_request('about')
+            result = response.get('result') or dict()
+        except (BitshareBaseException, IOError):
+            result = dict()
+        _metadata['node_version'] = result.get('client_version')
+    return _metadata['node_version']
+
+
+def format_time(timestamp):
+    if timestamp is None or isinstance(timestamp, basestring):
+        return timestamp
+    if not isinstance(timestamp, datetime):
+        timestamp = datetime.utcfromtimestamp(timestamp)
+    return timestamp.isoformat()
+
+
+class ResultsStore(object):
+    def __init__(self, file_path=DEFAULT_RESULTS_FILE):
+        self.file_path = file_path
+
+    def record(self, name, value, unit, params=None, started=None,
+               finished=None, higher_is_better=False, **extra):
+        """started and finished are datetime or unix time"""
+        measurement = {
+            'run_id': get_run_id(),
+            'name': name,
+            'value': value,
+            'unit': unit,
+            'higher_is_better': higher_is_better,
+            'params': params or dict(),
+            'git_revision': get_git_revision(),
+            'node_version': get_node_version(),
+            'started': format_time(started),
+            'finished': format_time(finished),
+            'recorded': format_time(datetime.utcnow()),
+        }
+        measurement.update(extra)
+        line = json.dumps(measurement, sort_keys=True) + '\n'
+        with open(self.file_path, 'a') as results_file:
+            fcntl.flock(results_file, fcntl.LOCK_EX)
+            try:
+                results_file.write(line)
+                results_file.flush()
+            finally:
+                fcntl.flock(results_file, fcntl.LOCK_UN)
+        return measurement
+
+    @contextmanager
+    def measure(self, name, params=None, **extra):
+        """Records wall-clock time of the block in ms"""
+        started = time.time()
+        yield
+        finished = time.time()
+        self.record(name, int((finished - started) * 1000), 'ms', params,
+                    started, finished, **extra)
+
+    def read(self):
+        if not os.path.exists(self.file_path):
+            return
+        with open(self.file_path) as results_file:
+            for line in results_file:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+RESULTS_STORE = ResultsStore()
+
+
+def set_results_file(file_path):
+    RESULTS_STORE.file_path = file_path
+
+
+def get_measurement_key(measurement):
+    return measurement['name'], json.dumps(measurement['params'],
+                                           sort_keys=True)
+
+
+def get_run_ids(measurements):
+    run_ids = list()
+    for measurement in measurements:
+        if measurement['run_id'] not in run_ids:
+            run_ids.append(measurement['run_id'])
+    return run_ids
+
+
+def average_by_key(measurements, run_id):
+    values = dict()
+    for measurement in measurements:
+        if measurement['run_id'] == run_id:
+            values.setdefault(get_measurement_key(measurement), []).append(
+                measurement)
+    return dict((key, (float(sum(m['value'] for m in group)) / len(group),
+                       group[-1]))
+                for key, group in values.items())
+
+
+def compare_runs(measurements, baseline_run_id, current_run_id,
+                 threshold=DEFAULT_THRESHOLD):
+    """Returns list of dicts for measurements present in both runs.
+    Values of the same name and params are averaged within a run"""
+    baseline = average_by_key(measurements, baseline_run_id)
+    current = average_by_key(measurements, current_run_id)
+    comparison = list()
+    for key in sorted(set(baseline) & set(current)):
+        baseline_value, _ = baseline[key]
+        current_value, measurement = current[key]
+        if baseline_value:
+            change = (current_value - baseline_value) / abs(baseline_value)
+        else:
+            change = 0.0 if current_value == baseline_value else float('inf')
+        worse = -change if measurement['higher_is_better'] else change
+        comparison.append({
+            'name': measurement['name'],
+            'params': measurement['params'],
+            'unit': measurement['unit'],
+            'baseline': baseline_value,
+            'current': current_value,
+            'change': change,
+            'regression': worse > threshold,
+        })
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Compare benchmark results of two runs')
+    parser.add_argument('results_file', nargs='?',
+                        default=DEFAULT_RESULTS_FILE)
+    parser.add_argument('--baseline', help='run id, previous run by default')
+    parser.add_argument('--current', help='run id, last run by default')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative change reported as regression')
+    args = parser.parse_args(argv)
+
+    measurements = list(ResultsStore(args.results_file).read())
+    run_ids = get_run_ids(measurements)
+    current_run_id = args.current or (run_ids[-1] if run_ids else None)
+    baseline_run_id = args.baseline
+    if baseline_run_id is None:
+        previous_run_ids = [run_id for run_id in run_ids
+                            if run_id != current_run_id]
+        baseline_run_id = previous_run_ids[-1] if previous_run_ids else None
+    if baseline_run_id is None or current_run_id is None:
+        print 'Two runs are needed for comparison, found: %s' % run_ids
+        return 2
+
+    print 'Baseline: %s, current: %s' % (baseline_run_id, current_run_id)
+    regressions = 0
+    for row in compare_runs(measurements, baseline_run_id, current_run_id,
+                            args.threshold):
+        regressions += row['regression']
+        print '%-11s %s %s: %.2f -> %.2f %s (%+.1f%%)' % (
+            'REGRESSION' if row['regression'] else 'ok',
+            row['name'], json.dumps(row['params'], sort_keys=True),
+            row['baseline'], row['current'], row['unit'],
+            row['change'] * 100)
+    print '%s regression(s) found' % regressions
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# Opt-in statistics of RPC calls made through JsonRpc: call counts, latency
+# histograms, payload sizes and errors per method and per test. Calls of
+# background threads (pool refill, log follower) are kept under their own
+# id instead of the running test.
+# Enabled by --rpc_stats option, see conftest.py.
+
+import json
+import bisect
+import threading
+from collections import defaultdict
+
+
+# upper bounds (ms) of latency histogram buckets: 0.1 ms .. ~100 s, every
+# bucket is ~19% wider than the previous one
+LATENCY_BUCKETS = [0.1 * 2 ** (i / 4.0) for i in xrange(81)]
+SESSION_TEST_ID = 'session'
+BACKGROUND_TEST_ID = 'background'
+PERCENTILES = (50, 95, 99)
+
+
+class MethodStats(object):
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, latency_ms, request_bytes, response_bytes, error):
+        self.calls += 1
+        self.errors += bool(error)
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS, latency_ms)] += 1
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.errors += other.errors
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+        self.histogram = [a + b for a, b in zip(self.histogram,
+                                                other.histogram)]
+
+    def percentile(self, percent):
+        """Upper bound of the bucket the percentile falls into"""
+        if not self.calls:
+            return 0.0
+        rank = self.calls * percent / 100.0
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank and count:
+                if index < len(LATENCY_BUCKETS):
+                    return min(LATENCY_BUCKETS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        result = {
+            'calls': self.calls,
+            'errors': self.errors,
+            'error_rate': float(self.errors) / self.calls if self.calls
+            else 0.0,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.calls, 3) if self.calls
+            else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+        }
+        for percent in PERCENTILES:
+            result['p%s_ms' % percent] = round(self.percentile(percent), 3)
+        return result
+
+
+class RpcStats(object):
+    def __init__(self):
+        self.enabled = False
+        self.current_test = SESSION_TEST_ID
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # test id -> method -> MethodStats
+        self._stats = defaultdict(lambda: defaultdict(MethodStats))
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def set_current_test(self, test_id):
+        self.current_test = test_id or SESSION_TEST_ID
+
+    def set_background(self, background=True):
+        """Calls of the current thread are not attributed to the running
+        test"""
+        self._local.background = background
+
+    def record(self, method, latency_ms, request_bytes=0, response_bytes=0,
+               error=False):
+        test_id = BACKGROUND_TEST_ID \
+            if getattr(self._local, 'background', False) \
+            else self.current_test
+        with self._lock:
+            self._stats[test_id][method].add(
+                latency_ms, request_bytes, response_bytes, error)
+
+    def get_method_stats(self):
+        """Stats of all tests merged by method"""
+        with self._lock:
+            merged = defaultdict(MethodStats)
+            for methods in self._stats.values():
+                for method, stats in methods.items():
+                    merged[method].merge(stats)
+        return merged
+
+    def get_report(self):
+        with self._lock:
+            by_test = dict(
+                (test_id, dict((method, stats.to_dict())
+                               for method, stats in methods.items()))
+                for test_id, methods in self._stats.items())
+        by_method = dict((method, stats.to_dict()) for method, stats
+                         in self.get_method_stats().items())
+        return {'methods': by_method, 'tests': by_test}
+
+    def format_summary(self, top=20):
+        lines = ['%-40s %8s %7s %10s %9s %9s %9s %12s' % (
+            'method', 'calls', 'errors', 'total ms', 'p50 ms', 'p95 ms',
+            'p99 ms', 'resp bytes')]
+        methods = sorted(self.get_method_stats().items(),
+                         key=lambda item: item[1].total_ms, reverse=True)
+        for method, stats in methods[:top]:
+            data = stats.to_dict()
+            lines.append('%-40s %8d %7d %10.1f %9.2f %9.2f %9.2f %12d' % (
+                method, data['calls'], data['errors'], data['total_ms'],
+                data['p50_ms'], data['p95_ms'], data['p99_ms'],
+                data['response_bytes']))
+        return '\n'.join(lines)
+
+    def dump(self, file_path):
+        with open(file_path, 'w') as report_file:
+            json.dump(self.get_report(), report_file, indent=2,
+                      sort_keys=True)
+
+    def record_to_results_store(self, results_store, params=None):
+        for method, stats in self.get_method_stats().items():
+            data = stats.to_dict()
+            method_params = dict(params or dict(), method=method)
+            for percent in PERCENTILES:
+                results_store.record('rpc_latency_p%s' % percent,
+                                     data['p%s_ms' % percent], 'ms',
+                                     method_params, calls=data['calls'])
+            results_store.record('rpc_error_rate', data['error_rate'],
+                                 'ratio', method_params, calls=data['calls'])
+
+
+RPC_STATS = RpcStats()
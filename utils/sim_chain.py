@@ -0,0 +1,1449 @@
+# Deterministic in-process stand-in for cli_wallet and witness_node.
+# It implements the subset of RPC methods used by CliWallet and the tests:
+# accounts, transfers, user/market/DMF assets, limit orders with market fee
+# sharing, vesting balances, builder transactions and committee proposals.
+# Blocks are produced on a virtual clock: sleeping through BlockWatcher
+# advances the clock, so waiting for blocks or maintenance costs nothing.
+#
+# The model is intentionally simple: operation fees are zero, every
+# transaction is applied at broadcast and included into the next block.
+
+import copy
+import hashlib
+import json
+import time
+import threading
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fractions import Fraction
+import dateutil.parser as dt
+from b3_exceptions import BitshareStatusCodeError
+from constants import DMF_ASSET_FLAG, PUBLIC_KEY
+from fee_oracle import calculate_percent, DynamicFeeTable, PERCENT_100
+from rpc_stats import RPC_STATS
+from time_profiler import PROFILER, RPC
+
+
+GENESIS_TIME = datetime(2020, 1, 1)
+CHAIN_ID = hashlib.sha256('bitshares-tests-sim').hexdigest()
+CORE_ASSET_ID = '1.3.0'
+CORE_SYMBOL = 'BTS'
+CORE_PRECISION = 5
+COMMITTEE_ACCOUNT_ID = '1.2.0'
+NULL_ACCOUNT_ID = '1.2.3'
+GENESIS_ACCOUNTS = ['committee-account', 'witness-account',
+                    'relaxed-committee-account', 'null-account',
+                    'temp-account', 'proxy-to-self']
+INIT_ACCOUNTS = ['init%s' % i for i in xrange(11)]
+NATHAN_BALANCE = 10 ** 15
+INIT_BALANCE = 10 ** 12
+
+DEFAULT_PARAMETERS = {
+    "block_interval": 3,
+    "maintenance_interval": 600,
+    "maintenance_skip_slots": 3,
+    "committee_proposal_review_period": 0,
+    "maximum_transaction_size": 2048,
+    "maximum_block_size": 2000000,
+    "maximum_time_until_expiration": 86400,
+    "maximum_proposal_lifetime": 2419200,
+    "maximum_asset_whitelist_authorities": 10,
+    "maximum_asset_feed_publishers": 10,
+    "maximum_witness_count": 1001,
+    "maximum_committee_count": 1001,
+    "maximum_authority_membership": 10,
+    "reserve_percent_of_fee": 2000,
+    "network_percent_of_fee": 2000,
+    "lifetime_referrer_percent_of_fee": 3000,
+    "cashback_vesting_period_seconds": 31536000,
+    "cashback_vesting_threshold": 10000000,
+    "count_non_member_votes": True,
+    "allow_non_member_whitelists": False,
+    "witness_pay_per_block": 1000000,
+    "worker_budget_per_day": "50000000000",
+    "max_predicate_opcode": 1,
+    "fee_liquidation_threshold": 10000000,
+    "accounts_per_fee_scale": 1000,
+    "account_fee_scale_bitshifts": 4,
+    "max_authority_depth": 2,
+    "gas_price": 1,
+    "gas_limit": 1000000,
+    "extensions": []
+}
+
+# graphene operation ids
+TRANSFER_OPERATION = 0
+LIMIT_ORDER_CREATE_OPERATION = 1
+FILL_ORDER_OPERATION = 4
+ACCOUNT_CREATE_OPERATION = 5
+ACCOUNT_UPDATE_OPERATION = 6
+ACCOUNT_WHITELIST_OPERATION = 7
+ACCOUNT_UPGRADE_OPERATION = 8
+ASSET_CREATE_OPERATION = 10
+ASSET_UPDATE_OPERATION = 11
+ASSET_ISSUE_OPERATION = 14
+ASSET_PUBLISH_FEED_OPERATION = 19
+PROPOSAL_CREATE_OPERATION = 22
+PROPOSAL_UPDATE_OPERATION = 23
+VESTING_BALANCE_WITHDRAW_OPERATION = 33
+CALL_ORDER_UPDATE_OPERATION = 3
+
+CHARGE_MARKET_FEE_FLAG = 0x01
+WHITE_LIST_FLAG = 0x02
+
+WHITELIST_STATUSES = {
+    'no_listing': 0,
+    'white_listed': 1,
+    'black_listed': 2,
+    'white_and_black_listed': 3,
+}
+
+
+class SimChainError(Exception):
+    pass
+
+
+def format_time(timestamp):
+    return timestamp.replace(microsecond=0).isoformat()
+
+
+def make_authority(key=None, account_auths=None):
+    return {
+        "weight_threshold": 1,
+        "account_auths": account_auths if account_auths is not None else [],
+        "key_auths": [[key, 1]] if key is not None else [],
+        "address_auths": []
+    }
+
+
+class SimChain(object):
+    def __init__(self, parameters=None):
+        self.lock = threading.RLock()
+        self.parameters = copy.deepcopy(DEFAULT_PARAMETERS)
+        if parameters is not None:
+            self.parameters.update(parameters)
+        self.wall_time = GENESIS_TIME
+        self.head_block_number = 0
+        self.head_block_time = GENESIS_TIME
+        self.next_maintenance_time = GENESIS_TIME + timedelta(
+            seconds=self.parameters["maintenance_interval"])
+        self.blocks = dict()
+        self.pending_transactions = list()
+        self.transactions = dict()
+        self.builder_transactions = dict()
+        self.next_builder_handle = 0
+        self.objects = dict()
+        self.next_instances = dict()
+        self.accounts_by_name = dict()
+        self.assets_by_symbol = dict()
+        self.balances = dict()
+        self.trade_statistics = dict()
+        self.listings = dict()
+        self.committee_votes = dict()
+        self.pending_parameters = dict()
+        self.genesis_committee = list()
+        self.active_witnesses = list()
+        self._create_genesis()
+
+    # ---------------------------------------------------------------------
+    # objects
+
+    def _new_id(self, space, type_id):
+        instance = self.next_instances.get((space, type_id), 0)
+        self.next_instances[(space, type_id)] = instance + 1
+        return '%s.%s.%s' % (space, type_id, instance)
+
+    def _add_object(self, space, type_id, obj):
+        obj['id'] = self._new_id(space, type_id)
+        self.objects[obj['id']] = obj
+        return obj
+
+    def _get_account(self, name_or_id):
+        account_id = self.accounts_by_name.get(name_or_id, name_or_id)
+        account = self.objects.get(account_id)
+        if account is None or not account_id.startswith('1.2.'):
+            raise SimChainError('Unable to find account: %s' % name_or_id)
+        return account
+
+    def _get_asset(self, symbol_or_id):
+        asset_id = self.assets_by_symbol.get(symbol_or_id, symbol_or_id)
+        asset = self.objects.get(asset_id)
+        if asset is None or not asset_id.startswith('1.3.'):
+            raise SimChainError(
+                'No asset with that symbol exists: %s' % symbol_or_id)
+        return asset
+
+    def _get_dynamic_data(self, asset):
+        return self.objects[asset['dynamic_asset_data_id']]
+
+    def _to_satoshi(self, amount, asset):
+        value = Decimal(str(amount)) * (10 ** asset['precision'])
+        if value != value.to_integral_value():
+            raise SimChainError(
+                'Insufficient precision: %s %s' % (amount, asset['symbol']))
+        return int(value)
+
+    # ---------------------------------------------------------------------
+    # genesis
+
+    def _create_genesis(self):
+        for name in GENESIS_ACCOUNTS:
+            self._create_account_object(name, None, None, None)
+        self.objects[COMMITTEE_ACCOUNT_ID]['active'] = make_authority()
+        self.objects[NULL_ACCOUNT_ID]['active'] = make_authority()
+        self.objects[NULL_ACCOUNT_ID]['owner'] = make_authority()
+
+        core = self._create_asset_object(
+            COMMITTEE_ACCOUNT_ID, CORE_SYMBOL, CORE_PRECISION,
+            {"max_supply": "1000000000000000", "market_fee_percent": 0,
+             "max_market_fee": "1000000000000000", "issuer_permissions": 0,
+             "flags": 0, "extensions": {},
+             "core_exchange_rate": {
+                 "base": {"amount": 1, "asset_id": CORE_ASSET_ID},
+                 "quote": {"amount": 1, "asset_id": CORE_ASSET_ID}},
+             "whitelist_authorities": [], "blacklist_authorities": [],
+             "whitelist_markets": [], "blacklist_markets": [],
+             "description": ""}, None)
+
+        for name in INIT_ACCOUNTS + ['nathan']:
+            account = self._create_account_object(
+                name, COMMITTEE_ACCOUNT_ID, COMMITTEE_ACCOUNT_ID, PUBLIC_KEY)
+            self._make_lifetime_member(account)
+            balance = NATHAN_BALANCE if name == 'nathan' else INIT_BALANCE
+            self._adjust_balance(account['id'], core['id'], balance)
+            self._get_dynamic_data(core)['current_supply'] += balance
+
+        for name in INIT_ACCOUNTS:
+            account_id = self.accounts_by_name[name]
+            member = self._add_object(1, 5, {
+                "committee_member_account": account_id,
+                "vote_id": "0:%s" % len(self.genesis_committee),
+                "total_votes": 0, "url": ""})
+            self.genesis_committee.append(member['id'])
+            witness = self._add_object(1, 6, {
+                "witness_account": account_id,
+                "signing_key": PUBLIC_KEY,
+                "vote_id": "1:%s" % len(self.active_witnesses),
+                "total_votes": 0, "url": "", "total_missed": 0,
+                "last_confirmed_block_num": 0})
+            self.active_witnesses.append(witness['id'])
+        self._update_committee_authority()
+
+    # ---------------------------------------------------------------------
+    # clock and blocks
+
+    def now(self):
+        return self.wall_time
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.advance_to(self.wall_time + timedelta(seconds=seconds))
+
+    def advance_to(self, timestamp):
+        with self.lock:
+            if timestamp > self.wall_time:
+                self.wall_time = timestamp
+            interval = timedelta(seconds=self.parameters["block_interval"])
+            while self.head_block_time + interval <= self.wall_time:
+                self.produce_block()
+                interval = timedelta(
+                    seconds=self.parameters["block_interval"])
+
+    def generate_blocks(self, count):
+        with self.lock:
+            for _ in xrange(count):
+                self.produce_block()
+            if self.wall_time < self.head_block_time:
+                self.wall_time = self.head_block_time
+
+    def generate_blocks_until(self, timestamp):
+        """Produces blocks until head block time reaches timestamp"""
+        with self.lock:
+            while self.head_block_time < timestamp:
+                self.produce_block()
+            if self.wall_time < self.head_block_time:
+                self.wall_time = self.head_block_time
+
+    def advance_to_next_maintenance(self):
+        with self.lock:
+            next_maintenance_time = self.next_maintenance_time
+            self.generate_blocks_until(next_maintenance_time)
+            return next_maintenance_time
+
+    def produce_block(self):
+        block_time = self.head_block_time + timedelta(
+            seconds=self.parameters["block_interval"])
+        block_number = self.head_block_number + 1
+        transactions = self.pending_transactions
+        self.pending_transactions = list()
+        witness_id = self.active_witnesses[
+            block_number % len(self.active_witnesses)]
+        previous = self.blocks.get(self.head_block_number)
+        block = {
+            "previous": previous["block_id"] if previous else "0" * 40,
+            "timestamp": format_time(block_time),
+            "witness": witness_id,
+            "transaction_merkle_root": "0" * 40,
+            "extensions": [],
+            "witness_signature": "0" * 130,
+            "transactions": [transaction for _, transaction in transactions],
+            "transaction_ids": [tx_id for tx_id, _ in transactions],
+            "block_id": "%08x%s" % (block_number, "0" * 32),
+            "signing_key": PUBLIC_KEY,
+        }
+        self.blocks[block_number] = block
+        for tx_id, _ in transactions:
+            self.transactions[tx_id]['block_num'] = block_number
+        self.head_block_number = block_number
+        self.head_block_time = block_time
+        self._process_proposals()
+        self._process_expired_orders()
+        if block_time >= self.next_maintenance_time:
+            self._perform_maintenance()
+        return block
+
+    def _perform_maintenance(self):
+        self.parameters.update(self.pending_parameters)
+        self.pending_parameters = dict()
+        self._update_committee_authority()
+        for key, amount in self.trade_statistics.items():
+            self.trade_statistics[key] = 59 * amount // 60
+        interval = timedelta(seconds=self.parameters["maintenance_interval"])
+        while self.next_maintenance_time <= self.head_block_time:
+            self.next_maintenance_time += interval
+
+    def _update_committee_authority(self):
+        voted_members = [member_id for member_id, voters in
+                         sorted(self.committee_votes.items()) if voters]
+        members = voted_members if voted_members else self.genesis_committee
+        self.active_committee_members = members
+        account_auths = [[self.objects[member_id]['committee_member_account'],
+                          1] for member_id in members]
+        committee_account = self.objects[COMMITTEE_ACCOUNT_ID]
+        committee_account['active'] = make_authority(
+            account_auths=account_auths)
+        committee_account['active']['weight_threshold'] = \
+            len(account_auths) // 2 + 1
+
+    # ---------------------------------------------------------------------
+    # transactions
+
+    def _push_transaction(self, operations):
+        """operations is a list of [op_type, op, fee_payer_id] items.
+        All operations are applied or none of them"""
+        if len(operations) > 1:
+            snapshot = self._take_snapshot()
+        results = list()
+        try:
+            for op_type, op, _ in operations:
+                results.append(self._apply_operation(op_type, op))
+        except Exception:
+            if len(operations) > 1:
+                self._restore_snapshot(snapshot)
+            raise
+        expiration = self.head_block_time + timedelta(seconds=120)
+        transaction = {
+            "ref_block_num": self.head_block_number & 0xffff,
+            "ref_block_prefix": self.head_block_number,
+            "expiration": format_time(expiration),
+            "operations": [[op_type, op] for op_type, op, _ in operations],
+            "extensions": [],
+            "signatures": ["1f" + "0" * 128],
+            "operation_results": results,
+        }
+        tx_id = hashlib.sha1(json.dumps(
+            [len(self.transactions), transaction],
+            sort_keys=True)).hexdigest()
+        self.transactions[tx_id] = {"transaction": transaction,
+                                    "block_num": None}
+        self.pending_transactions.append((tx_id, transaction))
+        for (op_type, op, fee_payer), result in zip(operations, results):
+            self._add_operation_history(fee_payer, op_type, op, result)
+        return transaction
+
+    def _take_snapshot(self):
+        return copy.deepcopy((
+            self.objects, self.next_instances, self.accounts_by_name,
+            self.assets_by_symbol, self.balances, self.trade_statistics,
+            self.listings, self.committee_votes))
+
+    def _restore_snapshot(self, snapshot):
+        (self.objects, self.next_instances, self.accounts_by_name,
+         self.assets_by_symbol, self.balances, self.trade_statistics,
+         self.listings, self.committee_votes) = snapshot
+
+    def _add_operation_history(self, account_id, op_type, op, result):
+        operation = self._add_object(1, 11, {
+            "op": [op_type, op], "result": result,
+            "block_num": self.head_block_number + 1, "trx_in_block": 0,
+            "op_in_trx": 0, "virtual_op": 0})
+        account = self.objects[account_id]
+        statistics = self.objects[account['statistics']]
+        history = self._add_object(2, 9, {
+            "account": account_id, "operation_id": operation['id'],
+            "sequence": statistics['total_ops'] + 1,
+            "next": statistics['most_recent_op']})
+        statistics['most_recent_op'] = history['id']
+        statistics['total_ops'] += 1
+
+    def _apply_operation(self, op_type, op):
+        handlers = {
+            TRANSFER_OPERATION: self._apply_transfer,
+            LIMIT_ORDER_CREATE_OPERATION: self._apply_limit_order_create,
+            ACCOUNT_CREATE_OPERATION: self._apply_account_create,
+            ACCOUNT_UPDATE_OPERATION: self._apply_account_update,
+            ACCOUNT_WHITELIST_OPERATION: self._apply_account_whitelist,
+            ACCOUNT_UPGRADE_OPERATION: self._apply_account_upgrade,
+            ASSET_CREATE_OPERATION: self._apply_asset_create,
+            ASSET_UPDATE_OPERATION: self._apply_asset_update,
+            ASSET_ISSUE_OPERATION: self._apply_asset_issue,
+            ASSET_PUBLISH_FEED_OPERATION: self._apply_asset_publish_feed,
+            CALL_ORDER_UPDATE_OPERATION: self._apply_call_order_update,
+            PROPOSAL_CREATE_OPERATION: self._apply_proposal_create,
+            PROPOSAL_UPDATE_OPERATION: self._apply_proposal_update,
+            VESTING_BALANCE_WITHDRAW_OPERATION:
+                self._apply_vesting_balance_withdraw,
+        }
+        handler = handlers.get(op_type)
+        if handler is None:
+            raise SimChainError('Operation %s is not supported' % op_type)
+        return handler(op)
+
+    def _fee_payer(self, op_type, op):
+        fields = {
+            TRANSFER_OPERATION: 'from',
+            LIMIT_ORDER_CREATE_OPERATION: 'seller',
+            ACCOUNT_CREATE_OPERATION: 'registrar',
+            ACCOUNT_UPDATE_OPERATION: 'account',
+            ACCOUNT_WHITELIST_OPERATION: 'authorizing_account',
+            ACCOUNT_UPGRADE_OPERATION: 'account_to_upgrade',
+            ASSET_CREATE_OPERATION: 'issuer',
+            ASSET_UPDATE_OPERATION: 'issuer',
+            ASSET_ISSUE_OPERATION: 'issuer',
+            ASSET_PUBLISH_FEED_OPERATION: 'publisher',
+            CALL_ORDER_UPDATE_OPERATION: 'funding_account',
+            PROPOSAL_CREATE_OPERATION: 'fee_paying_account',
+            PROPOSAL_UPDATE_OPERATION: 'fee_paying_account',
+            VESTING_BALANCE_WITHDRAW_OPERATION: 'owner',
+        }
+        return op[fields[op_type]]
+
+    def _check_active_authority(self, account_id):
+        if not self._can_sign(self.objects[account_id]['active']):
+            raise SimChainError('Missing Active Authority %s' % account_id)
+
+    def _can_sign(self, authority, depth=0, new_authorities=None):
+        """new_authorities maps account id to its not yet applied active
+        authority, so an update locking the account on itself is caught"""
+        if authority['key_auths']:
+            return True
+        if depth >= self.parameters['max_authority_depth']:
+            return False
+        new_authorities = new_authorities or dict()
+        for account_id, _ in authority['account_auths']:
+            account = self.objects.get(account_id)
+            if account is None:
+                continue
+            active = new_authorities.get(account_id, account['active'])
+            if self._can_sign(active, depth + 1, new_authorities):
+                return True
+        return False
+
+    def push_operations(self, operations):
+        """operations is a list of [op_type, op] pairs"""
+        prepared = list()
+        for op_type, op in operations:
+            fee_payer = self._fee_payer(op_type, op)
+            if op_type != ACCOUNT_CREATE_OPERATION:
+                self._check_active_authority(fee_payer)
+            prepared.append([op_type, op, fee_payer])
+        return self._push_transaction(prepared)
+
+    # ---------------------------------------------------------------------
+    # balances and accounts
+
+    def _get_balance(self, account_id, asset_id):
+        return self.balances.get(account_id, dict()).get(asset_id, 0)
+
+    def _adjust_balance(self, account_id, asset_id, delta):
+        account_balances = self.balances.setdefault(account_id, dict())
+        new_balance = account_balances.get(asset_id, 0) + delta
+        if new_balance < 0:
+            asset = self.objects[asset_id]
+            raise SimChainError(
+                'Insufficient Balance: %s has %s %s, %s required' % (
+                    self.objects[account_id]['name'],
+                    account_balances.get(asset_id, 0), asset['symbol'],
+                    -delta))
+        account_balances[asset_id] = new_balance
+
+    def _create_account_object(self, name, registrar, referrer, key,
+                               referrer_percent=0):
+        if name in self.accounts_by_name:
+            raise SimChainError('Account with name "%s" exists' % name)
+        account = {
+            "name": name,
+            "registrar": registrar,
+            "referrer": referrer,
+            "lifetime_referrer": referrer,
+            "membership_expiration_date": "1970-01-01T00:00:00",
+            "network_fee_percentage": 2000,
+            "lifetime_referrer_fee_percentage": 3000,
+            "referrer_rewards_percentage": referrer_percent,
+            "owner": make_authority(key),
+            "active": make_authority(key),
+            "options": {"memo_key": key, "voting_account": "1.2.5",
+                        "num_witness": 0, "num_committee": 0,
+                        "votes": [], "extensions": []},
+            "whitelisting_accounts": [],
+            "blacklisting_accounts": [],
+            "whitelisted_accounts": [],
+            "blacklisted_accounts": [],
+            "owner_special_authority": [0, {}],
+            "active_special_authority": [0, {}],
+            "top_n_control_flags": 0,
+        }
+        self._add_object(1, 2, account)
+        if registrar is None:
+            account['registrar'] = account['referrer'] = account['id']
+            account['lifetime_referrer'] = account['id']
+        statistics = self._add_object(2, 6, {
+            "owner": account['id'], "most_recent_op": "2.9.0",
+            "total_ops": 0, "removed_ops": 0, "total_core_in_orders": 0,
+            "lifetime_fees_paid": 0, "pending_fees": 0,
+            "pending_vested_fees": 0})
+        account['statistics'] = statistics['id']
+        self.accounts_by_name[name] = account['id']
+        return account
+
+    def _make_lifetime_member(self, account):
+        account['membership_expiration_date'] = "1969-12-31T23:59:59"
+        account['lifetime_referrer'] = account['id']
+        account['network_fee_percentage'] = 2000
+        account['lifetime_referrer_fee_percentage'] = 8000
+
+    def _apply_account_create(self, op):
+        registrar = self._get_account(op['registrar'])
+        referrer = self._get_account(op['referrer'])
+        self._check_active_authority(registrar['id'])
+        account = self._create_account_object(
+            op['name'], registrar['id'], referrer['id'],
+            op['owner']['key_auths'][0][0], op['referrer_percent'])
+        account['owner'] = copy.deepcopy(op['owner'])
+        account['active'] = copy.deepcopy(op['active'])
+        return [1, account['id']]
+
+    def _apply_account_upgrade(self, op):
+        account = self._get_account(op['account_to_upgrade'])
+        self._make_lifetime_member(account)
+        return [0, {}]
+
+    def _apply_account_update(self, op):
+        account = self._get_account(op['account'])
+        new_authorities = dict()
+        if op.get('active') is not None:
+            new_authorities[account['id']] = op['active']
+        for authority_name in ('owner', 'active'):
+            if op.get(authority_name) is None:
+                continue
+            for account_id, _ in op[authority_name]['account_auths']:
+                self._get_account(account_id)
+            if not self._can_sign(op[authority_name],
+                                  new_authorities=new_authorities):
+                raise SimChainError('Missing Authority %s' % account['id'])
+        for authority_name in ('owner', 'active'):
+            if op.get(authority_name) is not None:
+                account[authority_name] = copy.deepcopy(op[authority_name])
+        if op.get('new_options') is not None:
+            account['options'] = copy.deepcopy(op['new_options'])
+        return [0, {}]
+
+    def _apply_account_whitelist(self, op):
+        authorizing_account = self._get_account(op['authorizing_account'])
+        account = self._get_account(op['account_to_list'])
+        listing = self.listings.setdefault(
+            authorizing_account['id'], {'white': set(), 'black': set()})
+        new_listing = op['new_listing']
+        for list_name, flag in (('white', 1), ('black', 2)):
+            if new_listing & flag:
+                listing[list_name].add(account['id'])
+            else:
+                listing[list_name].discard(account['id'])
+        return [0, {}]
+
+    def _apply_transfer(self, op):
+        asset = self._get_asset(op['amount']['asset_id'])
+        from_account = self._get_account(op['from'])
+        to_account = self._get_account(op['to'])
+        for account in (from_account, to_account):
+            self._check_asset_authorization(account, asset)
+        amount = int(op['amount']['amount'])
+        if amount <= 0:
+            raise SimChainError('Transfer amount should be positive')
+        self._adjust_balance(from_account['id'], asset['id'], -amount)
+        self._adjust_balance(to_account['id'], asset['id'], amount)
+        return [0, {}]
+
+    # ---------------------------------------------------------------------
+    # assets
+
+    def _is_authorized_asset(self, account, asset):
+        if not asset['options']['flags'] & WHITE_LIST_FLAG:
+            return True
+        for authority_id in asset['options']['blacklist_authorities']:
+            listing = self.listings.get(authority_id)
+            if listing and account['id'] in listing['black']:
+                return False
+        whitelist_authorities = asset['options']['whitelist_authorities']
+        if not whitelist_authorities:
+            return True
+        for authority_id in whitelist_authorities:
+            listing = self.listings.get(authority_id)
+            if listing and account['id'] in listing['white']:
+                return True
+        return False
+
+    def _check_asset_authorization(self, account, asset):
+        if not self._is_authorized_asset(account, asset):
+            raise SimChainError(
+                '%s is not whitelisted for asset %s' % (
+                    account['name'], asset['symbol']))
+
+    def _prepare_asset_options(self, options):
+        options = copy.deepcopy(options)
+        extensions = options.get('extensions')
+        options['extensions'] = extensions if extensions else {}
+        for account_id in options.get('whitelist_authorities', []) + \
+                options.get('blacklist_authorities', []) + \
+                options['extensions'].get('whitelist_market_fee_sharing', []):
+            if not account_id.startswith('1.2.') or \
+                    account_id not in self.objects:
+                raise SimChainError('Invalid account id: "%s"' % account_id)
+        dynamic_fees = options['extensions'].get('dynamic_fees')
+        has_dmf_flag = bool(options['flags'] & DMF_ASSET_FLAG)
+        if has_dmf_flag != (dynamic_fees is not None):
+            raise SimChainError(
+                'Dynamic market fee table and charge_dynamic_market_fee '
+                'should be used in together')
+        if dynamic_fees is None:
+            return options
+        for trader in ('maker', 'taker'):
+            table = dynamic_fees.get('%s_fee' % trader)
+            if not table:
+                raise SimChainError(
+                    'Dynamic market fee (maker or taker) table should be '
+                    'non empty')
+            for row in table:
+                if not 0 <= row['percent'] <= PERCENT_100:
+                    raise SimChainError(
+                        '%s percent should be in range [0 - 10000]' %
+                        trader.title())
+            amounts = [row['amount'] for row in table]
+            if 0 not in amounts or min(amounts) < 0:
+                raise SimChainError(
+                    'Dynamic market fee %s amount should start from zero' %
+                    trader)
+            # rows are kept sorted by amount, duplicated amounts are skipped
+            unique_rows = dict()
+            for row in table:
+                unique_rows.setdefault(row['amount'], row)
+            dynamic_fees['%s_fee' % trader] = [
+                unique_rows[amount] for amount in sorted(unique_rows)]
+        return options
+
+    def _create_asset_object(self, issuer_id, symbol, precision, options,
+                             bitasset_opts):
+        if symbol in self.assets_by_symbol:
+            raise SimChainError('Asset with symbol "%s" exists' % symbol)
+        asset = {
+            "symbol": symbol,
+            "precision": precision,
+            "issuer": issuer_id,
+            "options": options,
+        }
+        self._add_object(1, 3, asset)
+        dynamic_data = self._add_object(2, 3, {
+            "current_supply": 0, "confidential_supply": 0,
+            "accumulated_fees": 0, "fee_pool": 0})
+        asset['dynamic_asset_data_id'] = dynamic_data['id']
+        if bitasset_opts is not None:
+            bitasset_data = self._add_object(2, 4, {
+                "asset_id": asset['id'], "options": bitasset_opts,
+                "feeds": [], "current_feed": None,
+                "is_prediction_market": False,
+                "settlement_fund": 0})
+            asset['bitasset_data_id'] = bitasset_data['id']
+        self.assets_by_symbol[symbol] = asset['id']
+        return asset
+
+    def _apply_asset_create(self, op):
+        issuer = self._get_account(op['issuer'])
+        options = self._prepare_asset_options(op['common_options'])
+        asset = self._create_asset_object(
+            issuer['id'], op['symbol'], op['precision'], options,
+            op.get('bitasset_opts'))
+        return [1, asset['id']]
+
+    def _apply_asset_update(self, op):
+        asset = self._get_asset(op['asset_to_update'])
+        if asset['issuer'] != op['issuer']:
+            raise SimChainError('Incorrect issuer for asset %s' %
+                                asset['symbol'])
+        new_options = self._prepare_asset_options(op['new_options'])
+        changed_flags = asset['options']['flags'] ^ new_options['flags']
+        if changed_flags & ~asset['options']['issuer_permissions']:
+            raise SimChainError(
+                'Flag change is forbidden by issuer permissions')
+        asset['options'] = new_options
+        if op.get('new_issuer'):
+            asset['issuer'] = self._get_account(op['new_issuer'])['id']
+        return [0, {}]
+
+    def _apply_asset_issue(self, op):
+        asset = self._get_asset(op['asset_to_issue']['asset_id'])
+        if asset['issuer'] != op['issuer']:
+            raise SimChainError('Incorrect issuer for asset %s' %
+                                asset['symbol'])
+        account = self._get_account(op['issue_to_account'])
+        self._check_asset_authorization(account, asset)
+        amount = int(op['asset_to_issue']['amount'])
+        dynamic_data = self._get_dynamic_data(asset)
+        if dynamic_data['current_supply'] + amount > \
+                int(asset['options']['max_supply']):
+            raise SimChainError('Max supply of %s is exceeded' %
+                                asset['symbol'])
+        dynamic_data['current_supply'] += amount
+        self._adjust_balance(account['id'], asset['id'], amount)
+        return [0, {}]
+
+    def _apply_asset_publish_feed(self, op):
+        asset = self._get_asset(op['asset_id'])
+        if 'bitasset_data_id' not in asset:
+            raise SimChainError('%s is not a market asset' % asset['symbol'])
+        bitasset_data = self.objects[asset['bitasset_data_id']]
+        bitasset_data['feeds'].append([op['publisher'], [
+            format_time(self.head_block_time), op['feed']]])
+        bitasset_data['current_feed'] = op['feed']
+        return [0, {}]
+
+    def _apply_call_order_update(self, op):
+        collateral = op['delta_collateral']
+        debt = op['delta_debt']
+        asset = self._get_asset(debt['asset_id'])
+        if 'bitasset_data_id' not in asset:
+            raise SimChainError('%s is not a market asset' % asset['symbol'])
+        self._adjust_balance(op['funding_account'], collateral['asset_id'],
+                             -collateral['amount'])
+        self._adjust_balance(op['funding_account'], debt['asset_id'],
+                             debt['amount'])
+        self._get_dynamic_data(asset)['current_supply'] += debt['amount']
+        self._add_object(1, 8, {
+            "borrower": op['funding_account'],
+            "collateral": collateral['amount'], "debt": debt['amount'],
+            "call_price": {"base": collateral, "quote": debt}})
+        return [0, {}]
+
+    # ---------------------------------------------------------------------
+    # market
+
+    def _apply_limit_order_create(self, op):
+        seller = self._get_account(op['seller'])
+        sell_asset = self._get_asset(op['amount_to_sell']['asset_id'])
+        receive_asset = self._get_asset(op['min_to_receive']['asset_id'])
+        for asset in (sell_asset, receive_asset):
+            self._check_asset_authorization(seller, asset)
+        amount_to_sell = int(op['amount_to_sell']['amount'])
+        min_to_receive = int(op['min_to_receive']['amount'])
+        if amount_to_sell <= 0 or min_to_receive <= 0:
+            raise SimChainError('Order amounts should be positive')
+        self._adjust_balance(seller['id'], sell_asset['id'], -amount_to_sell)
+        order = self._add_object(1, 7, {
+            "seller": seller['id'],
+            "for_sale": amount_to_sell,
+            "sell_price": {
+                "base": {"amount": amount_to_sell,
+                         "asset_id": sell_asset['id']},
+                "quote": {"amount": min_to_receive,
+                          "asset_id": receive_asset['id']}},
+            "expiration": op['expiration'],
+            "deferred_fee": 0})
+        self._match_order(order)
+        return [1, order['id']]
+
+    def _get_orders(self, base_asset_id, quote_asset_id):
+        orders = list()
+        for object_id, obj in self.objects.items():
+            if not object_id.startswith('1.7.'):
+                continue
+            price = obj['sell_price']
+            if price['base']['asset_id'] == base_asset_id and \
+                    price['quote']['asset_id'] == quote_asset_id:
+                orders.append(obj)
+        return orders
+
+    def _order_price(self, order):
+        price = order['sell_price']
+        return Fraction(price['base']['amount'], price['quote']['amount'])
+
+    def _match_order(self, taker):
+        taker_price = taker['sell_price']
+        makers = self._get_orders(taker_price['quote']['asset_id'],
+                                  taker_price['base']['asset_id'])
+        # the best maker gives the biggest amount per unit of taker asset
+        makers.sort(key=lambda order: (-self._order_price(order),
+                                       int(order['id'].split('.')[2])))
+        for maker in makers:
+            if taker['for_sale'] <= 0:
+                break
+            maker_price = maker['sell_price']
+            if maker_price['base']['amount'] * taker_price['base']['amount'] \
+                    < maker_price['quote']['amount'] * \
+                    taker_price['quote']['amount']:
+                break
+            self._fill_orders(taker, maker)
+        if taker['for_sale'] <= 0:
+            del self.objects[taker['id']]
+
+    def _fill_orders(self, taker, maker):
+        maker_price = self._order_price(maker)
+        taker_receives_all = int(taker['for_sale'] * maker_price)
+        if taker_receives_all >= maker['for_sale']:
+            taker_receives = maker['for_sale']
+            taker_pays = -(-taker_receives * maker_price.denominator //
+                           maker_price.numerator)
+            taker_pays = min(taker_pays, taker['for_sale'])
+        else:
+            taker_receives = taker_receives_all
+            taker_pays = taker['for_sale']
+        if taker_receives <= 0:
+            return
+        taker['for_sale'] -= taker_pays
+        maker['for_sale'] -= taker_receives
+        maker_asset_id = maker['sell_price']['base']['asset_id']
+        taker_asset_id = taker['sell_price']['base']['asset_id']
+        self._receive_fill(taker['seller'], maker_asset_id, taker_receives,
+                           is_maker=False)
+        self._receive_fill(maker['seller'], taker_asset_id, taker_pays,
+                           is_maker=True)
+        self._update_trade_statistics(taker['seller'], maker_asset_id,
+                                      taker_receives)
+        self._update_trade_statistics(maker['seller'], maker_asset_id,
+                                      taker_receives)
+        self._update_trade_statistics(taker['seller'], taker_asset_id,
+                                      taker_pays)
+        self._update_trade_statistics(maker['seller'], taker_asset_id,
+                                      taker_pays)
+        for order, pays, receives in ((taker, taker_pays, taker_receives),
+                                      (maker, taker_receives, taker_pays)):
+            self._add_operation_history(order['seller'], FILL_ORDER_OPERATION,
+                                        {"order_id": order['id'],
+                                         "account_id": order['seller'],
+                                         "pays": pays, "receives": receives},
+                                        [0, {}])
+        if maker['for_sale'] <= 0:
+            del self.objects[maker['id']]
+
+    def _update_trade_statistics(self, account_id, asset_id, amount):
+        asset = self.objects[asset_id]
+        if not asset['options']['flags'] & DMF_ASSET_FLAG:
+            return
+        key = (account_id, asset_id)
+        self.trade_statistics[key] = self.trade_statistics.get(key, 0) + \
+            amount
+
+    def _get_market_fee_percent(self, account_id, asset, is_maker):
+        options = asset['options']
+        if options['flags'] & DMF_ASSET_FLAG:
+            table = options['extensions']['dynamic_fees'][
+                'maker_fee' if is_maker else 'taker_fee']
+            volume = self.trade_statistics.get((account_id, asset['id']), 0)
+            return DynamicFeeTable(table).get_percent(volume)
+        if options['flags'] & CHARGE_MARKET_FEE_FLAG:
+            return options['market_fee_percent']
+        return 0
+
+    def _receive_fill(self, account_id, asset_id, amount, is_maker):
+        asset = self.objects[asset_id]
+        percent = self._get_market_fee_percent(account_id, asset, is_maker)
+        market_fee = min(calculate_percent(amount, percent),
+                         int(asset['options']['max_market_fee']))
+        self._adjust_balance(account_id, asset_id, amount - market_fee)
+        if market_fee <= 0:
+            return
+        reward = self._pay_market_fee_rewards(account_id, asset, market_fee)
+        self._get_dynamic_data(asset)['accumulated_fees'] += \
+            market_fee - reward
+
+    def _pay_market_fee_rewards(self, account_id, asset, market_fee):
+        extensions = asset['options']['extensions']
+        reward_percent = extensions.get('reward_percent')
+        if not reward_percent:
+            return 0
+        seller = self.objects[account_id]
+        registrar = self.objects[seller['registrar']]
+        referrer = self.objects[seller['referrer']]
+        whitelist = extensions.get('whitelist_market_fee_sharing')
+        if whitelist and registrar['id'] not in whitelist:
+            return 0
+        reward = calculate_percent(market_fee, reward_percent)
+        if reward <= 0 or not self._is_authorized_asset(registrar, asset):
+            return 0
+        registrar_reward = reward
+        if referrer['id'] != registrar['id']:
+            referrer_reward = calculate_percent(
+                reward, seller['referrer_rewards_percentage'])
+            if referrer_reward > 0 and \
+                    self._is_authorized_asset(referrer, asset):
+                registrar_reward -= referrer_reward
+                self._deposit_market_fee_vesting_balance(
+                    referrer['id'], asset['id'], referrer_reward)
+        self._deposit_market_fee_vesting_balance(
+            registrar['id'], asset['id'], registrar_reward)
+        return reward
+
+    def _deposit_market_fee_vesting_balance(self, account_id, asset_id,
+                                            amount):
+        for vesting_balance in self._get_vesting_balances(account_id):
+            if vesting_balance['balance_type'] == 'market_fee_sharing' and \
+                    vesting_balance['balance']['asset_id'] == asset_id:
+                vesting_balance['balance']['amount'] += amount
+                return
+        self._add_object(1, 13, {
+            "owner": account_id,
+            "balance": {"amount": amount, "asset_id": asset_id},
+            "policy": [2, {}],
+            "balance_type": "market_fee_sharing"})
+
+    def _get_vesting_balances(self, account_id):
+        return [obj for object_id, obj in sorted(self.objects.items())
+                if object_id.startswith('1.13.') and
+                obj['owner'] == account_id]
+
+    def _apply_vesting_balance_withdraw(self, op):
+        vesting_balance = self.objects.get(op['vesting_balance'])
+        if vesting_balance is None:
+            raise SimChainError('Unable to find vesting balance %s' %
+                                op['vesting_balance'])
+        amount = int(op['amount']['amount'])
+        if amount > vesting_balance['balance']['amount']:
+            raise SimChainError('Insufficient vesting balance')
+        vesting_balance['balance']['amount'] -= amount
+        self._adjust_balance(vesting_balance['owner'],
+                             op['amount']['asset_id'], amount)
+        return [0, {}]
+
+    def _process_expired_orders(self):
+        for order in self._get_all_orders():
+            if dt.parse(order['expiration']) <= self.head_block_time:
+                self._adjust_balance(order['seller'],
+                                     order['sell_price']['base']['asset_id'],
+                                     order['for_sale'])
+                del self.objects[order['id']]
+
+    def _get_all_orders(self):
+        return [obj for object_id, obj in self.objects.items()
+                if object_id.startswith('1.7.')]
+
+    # ---------------------------------------------------------------------
+    # proposals
+
+    def _apply_proposal_create(self, op):
+        proposal = self._add_object(1, 10, {
+            "expiration_time": op['expiration_time'],
+            "proposed_transaction": {
+                "operations": op['proposed_ops']},
+            "required_active_approvals": [COMMITTEE_ACCOUNT_ID],
+            "available_active_approvals": [],
+            "required_owner_approvals": [],
+            "available_owner_approvals": [],
+            "available_key_approvals": [],
+            "proposer": op['fee_paying_account']})
+        return [1, proposal['id']]
+
+    def _apply_proposal_update(self, op):
+        proposal = self.objects.get(op['proposal'])
+        if proposal is None:
+            raise SimChainError('Unable to find proposal %s' %
+                                op['proposal'])
+        for account_id in op['active_approvals_to_add']:
+            if account_id not in proposal['available_active_approvals']:
+                proposal['available_active_approvals'].append(account_id)
+        return [0, {}]
+
+    def _is_proposal_approved(self, proposal):
+        authority = self.objects[COMMITTEE_ACCOUNT_ID]['active']
+        weight = sum(1 for account_id, _ in authority['account_auths']
+                     if account_id in proposal['available_active_approvals'])
+        return weight >= authority['weight_threshold']
+
+    def _process_proposals(self):
+        for object_id, proposal in sorted(self.objects.items()):
+            if not object_id.startswith('1.10.'):
+                continue
+            if dt.parse(proposal['expiration_time']) > self.head_block_time:
+                continue
+            if self._is_proposal_approved(proposal):
+                for changed_values in \
+                        proposal['proposed_transaction']['operations']:
+                    self.pending_parameters.update(changed_values)
+            del self.objects[object_id]
+
+    # ---------------------------------------------------------------------
+    # RPC methods
+
+    def _core_object(self, object_id):
+        if object_id == '2.0.0':
+            return self.get_global_properties()
+        if object_id == '2.1.0':
+            return self.get_dynamic_global_properties()
+        return self.objects.get(object_id)
+
+    def get_object(self, object_id):
+        return [copy.deepcopy(self._core_object(object_id))]
+
+    def get_objects(self, object_ids):
+        return [self.get_object(object_id)[0] for object_id in object_ids]
+
+    def get_account(self, name_or_id):
+        return copy.deepcopy(self._get_account(name_or_id))
+
+    def get_accounts(self, account_ids):
+        return [self.get_account(account_id) for account_id in account_ids]
+
+    def get_asset(self, symbol_or_id):
+        return copy.deepcopy(self._get_asset(symbol_or_id))
+
+    def list_assets(self, lowerbound, limit):
+        symbols = sorted(symbol for symbol in self.assets_by_symbol
+                         if symbol >= lowerbound)[:limit]
+        return [self.get_asset(symbol) for symbol in symbols]
+
+    def list_account_balances(self, name_or_id):
+        account = self._get_account(name_or_id)
+        balances = self.balances.get(account['id'], dict())
+        return [{"amount": amount, "asset_id": asset_id} for asset_id, amount
+                in sorted(balances.items(),
+                          key=lambda item: int(item[0].split('.')[2]))]
+
+    def get_chain_properties(self):
+        return {"id": "2.11.0", "chain_id": CHAIN_ID,
+                "immutable_parameters": {"min_committee_member_count": 11,
+                                         "min_witness_count": 11}}
+
+    def get_global_properties(self):
+        return {"id": "2.0.0",
+                "parameters": copy.deepcopy(self.parameters),
+                "next_available_vote_id": 22,
+                "active_committee_members": list(
+                    self.active_committee_members),
+                "active_witnesses": list(self.active_witnesses)}
+
+    def get_dynamic_global_properties(self):
+        head_block = self.blocks.get(self.head_block_number)
+        return {
+            "id": "2.1.0",
+            "head_block_number": self.head_block_number,
+            "head_block_id": head_block["block_id"] if head_block
+            else "0" * 40,
+            "time": format_time(self.head_block_time),
+            "current_witness": head_block["witness"] if head_block
+            else self.active_witnesses[0],
+            "next_maintenance_time": format_time(self.next_maintenance_time),
+            "last_budget_time": format_time(self.head_block_time),
+            "witness_budget": 0,
+            "accounts_registered_this_interval": 0,
+            "recently_missed_count": 0,
+            "current_aslot": self.head_block_number,
+            "recent_slots_filled": "340282366920938463463374607431768211455",
+            "dynamic_flags": 0,
+            "last_irreversible_block_num": max(self.head_block_number - 1, 0)
+        }
+
+    def get_block(self, number):
+        return copy.deepcopy(self.blocks.get(number))
+
+    def get_transaction_id(self, transaction):
+        # like signed_transaction, the id does not depend on results
+        transaction = dict(transaction, operation_results=None)
+        for tx_id, record in self.transactions.items():
+            if dict(record['transaction'],
+                    operation_results=None) == transaction:
+                return tx_id
+        raise SimChainError('Unknown transaction')
+
+    def get_transaction_block_num(self, tx_id):
+        record = self.transactions.get(tx_id)
+        return record['block_num'] if record else None
+
+    def info(self):
+        return {"head_block_num": self.head_block_number,
+                "head_block_id": self.blocks[self.head_block_number][
+                    "block_id"] if self.head_block_number else "0" * 40,
+                "chain_id": CHAIN_ID}
+
+    def about(self):
+        return {"client_version": "sim", "graphene_revision": "sim",
+                "chain_id": CHAIN_ID}
+
+    def transfer(self, from_account, to_account, amount, symbol, memo,
+                 broadcast):
+        asset = self._get_asset(symbol)
+        return self.push_operations([[TRANSFER_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "from": self._get_account(from_account)['id'],
+            "to": self._get_account(to_account)['id'],
+            "amount": {"amount": self._to_satoshi(amount, asset),
+                       "asset_id": asset['id']},
+            "extensions": []}]])
+
+    def register_account(self, name, owner_key, active_key, registrar,
+                         referrer, referrer_percent, broadcast):
+        return self.push_operations([[ACCOUNT_CREATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "registrar": self._get_account(registrar)['id'],
+            "referrer": self._get_account(referrer)['id'],
+            "referrer_percent": int(referrer_percent) * 100,
+            "name": name,
+            "owner": make_authority(owner_key),
+            "active": make_authority(active_key),
+            "options": {"memo_key": active_key, "voting_account": "1.2.5",
+                        "num_witness": 0, "num_committee": 0, "votes": [],
+                        "extensions": []},
+            "extensions": {}}]])
+
+    def create_account_with_private_key(self, key, name, registrar,
+                                        broadcast):
+        return self.register_account(name, PUBLIC_KEY, PUBLIC_KEY,
+                                     registrar, registrar, 0, broadcast)
+
+    def upgrade_account(self, name, broadcast):
+        return self.push_operations([[ACCOUNT_UPGRADE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "account_to_upgrade": self._get_account(name)['id'],
+            "upgrade_to_lifetime_member": True,
+            "extensions": []}]])
+
+    def create_asset(self, issuer, symbol, precision, options,
+                     bitasset_opts, broadcast):
+        return self.push_operations([[ASSET_CREATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "issuer": self._get_account(issuer)['id'],
+            "symbol": symbol,
+            "precision": precision,
+            "common_options": options,
+            "bitasset_opts": bitasset_opts,
+            "is_prediction_market": False,
+            "extensions": []}]])
+
+    def update_asset(self, symbol, new_issuer, new_options, broadcast):
+        asset = self._get_asset(symbol)
+        return self.push_operations([[ASSET_UPDATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "issuer": asset['issuer'],
+            "asset_to_update": asset['id'],
+            "new_issuer": new_issuer,
+            "new_options": new_options,
+            "extensions": []}]])
+
+    def issue_asset(self, to_account, amount, symbol, memo, broadcast):
+        asset = self._get_asset(symbol)
+        return self.push_operations([[ASSET_ISSUE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "issuer": asset['issuer'],
+            "asset_to_issue": {"amount": self._to_satoshi(amount, asset),
+                               "asset_id": asset['id']},
+            "issue_to_account": self._get_account(to_account)['id'],
+            "extensions": []}]])
+
+    def publish_asset_feed(self, publisher, symbol, feed, broadcast):
+        return self.push_operations([[ASSET_PUBLISH_FEED_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "publisher": self._get_account(publisher)['id'],
+            "asset_id": self._get_asset(symbol)['id'],
+            "feed": feed,
+            "extensions": []}]])
+
+    def borrow_asset(self, borrower, amount_to_borrow, symbol,
+                     amount_of_collateral, broadcast):
+        asset = self._get_asset(symbol)
+        core = self._get_asset(CORE_ASSET_ID)
+        return self.push_operations([[CALL_ORDER_UPDATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "funding_account": self._get_account(borrower)['id'],
+            "delta_collateral": {
+                "amount": self._to_satoshi(amount_of_collateral, core),
+                "asset_id": CORE_ASSET_ID},
+            "delta_debt": {
+                "amount": self._to_satoshi(amount_to_borrow, asset),
+                "asset_id": asset['id']},
+            "extensions": {}}]])
+
+    def sell_asset(self, seller, amount_to_sell, symbol_to_sell,
+                   min_to_receive, symbol_to_receive, timeout,
+                   fill_or_kill, broadcast):
+        sell_asset = self._get_asset(symbol_to_sell)
+        receive_asset = self._get_asset(symbol_to_receive)
+        expiration = self.head_block_time + timedelta(seconds=int(timeout))
+        return self.push_operations([[LIMIT_ORDER_CREATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "seller": self._get_account(seller)['id'],
+            "amount_to_sell": {
+                "amount": self._to_satoshi(amount_to_sell, sell_asset),
+                "asset_id": sell_asset['id']},
+            "min_to_receive": {
+                "amount": self._to_satoshi(min_to_receive, receive_asset),
+                "asset_id": receive_asset['id']},
+            "expiration": format_time(expiration),
+            "fill_or_kill": fill_or_kill,
+            "extensions": []}]])
+
+    def get_limit_orders(self, asset_id_1, asset_id_2, limit):
+        asset_1 = self._get_asset(asset_id_1)
+        asset_2 = self._get_asset(asset_id_2)
+        orders = self._get_orders(asset_1['id'], asset_2['id']) + \
+            self._get_orders(asset_2['id'], asset_1['id'])
+        orders.sort(key=lambda order: int(order['id'].split('.')[2]))
+        return copy.deepcopy(orders[:limit])
+
+    def whitelist_account(self, authorizing_account, account_to_list,
+                          new_listing_status, broadcast):
+        return self.push_operations([[ACCOUNT_WHITELIST_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "authorizing_account":
+                self._get_account(authorizing_account)['id'],
+            "account_to_list": self._get_account(account_to_list)['id'],
+            "new_listing": WHITELIST_STATUSES[new_listing_status],
+            "extensions": []}]])
+
+    def get_vesting_balances(self, account_name):
+        account = self._get_account(account_name)
+        result = list()
+        for vesting_balance in self._get_vesting_balances(account['id']):
+            vesting_balance = copy.deepcopy(vesting_balance)
+            vesting_balance['allowed_withdraw'] = copy.deepcopy(
+                vesting_balance['balance'])
+            vesting_balance['allowed_withdraw_time'] = format_time(
+                self.head_block_time)
+            result.append(vesting_balance)
+        return result
+
+    def withdraw_vesting(self, vesting_balance_id, amount, symbol,
+                         broadcast):
+        asset = self._get_asset(symbol)
+        vesting_balance = self.objects.get(vesting_balance_id)
+        if vesting_balance is None:
+            raise SimChainError('Unable to find vesting balance %s' %
+                                vesting_balance_id)
+        return self.push_operations([[VESTING_BALANCE_WITHDRAW_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "vesting_balance": vesting_balance_id,
+            "owner": vesting_balance['owner'],
+            "amount": {"amount": self._to_satoshi(amount, asset),
+                       "asset_id": asset['id']}}]])
+
+    def get_trade_statistics(self, account_id, asset_id):
+        asset = self._get_asset(asset_id)
+        amount = self.trade_statistics.get((account_id, asset['id']), 0)
+        return {"account": account_id,
+                "total_volume": {"amount": amount, "asset_id": asset['id']}}
+
+    def list_committee_members(self, lowerbound, limit):
+        members = list()
+        for object_id, obj in self.objects.items():
+            if object_id.startswith('1.5.'):
+                name = self.objects[obj['committee_member_account']]['name']
+                if name >= lowerbound:
+                    members.append([name, object_id])
+        return sorted(members)[:limit]
+
+    def _get_committee_member_id(self, name_or_id):
+        account = self._get_account(name_or_id)
+        for object_id, obj in self.objects.items():
+            if object_id.startswith('1.5.') and \
+                    obj['committee_member_account'] == account['id']:
+                return object_id
+        raise SimChainError('Account %s is not a committee member' %
+                            account['name'])
+
+    def vote_for_committee_member(self, voting_account, owner, approve,
+                                  broadcast):
+        voter = self._get_account(voting_account)
+        member_id = self._get_committee_member_id(owner)
+        voters = self.committee_votes.setdefault(member_id, set())
+        if approve and voter['id'] in voters:
+            raise SimChainError(
+                'Account %s was already voting for committee member %s' % (
+                    voter['name'], owner))
+        if not approve and voter['id'] not in voters:
+            raise SimChainError(
+                'Account %s is already not voting for committee member %s'
+                % (voter['name'], owner))
+        new_options = copy.deepcopy(voter['options'])
+        vote_id = self.objects[member_id]['vote_id']
+        if approve:
+            voters.add(voter['id'])
+            new_options['votes'].append(vote_id)
+        else:
+            voters.discard(voter['id'])
+            new_options['votes'].remove(vote_id)
+        return self.push_operations([[ACCOUNT_UPDATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "account": voter['id'],
+            "new_options": new_options,
+            "extensions": {}}]])
+
+    def vote_for_witness(self, voting_account, witness, approve, broadcast):
+        voter = self._get_account(voting_account)
+        return self.push_operations([[ACCOUNT_UPDATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "account": voter['id'],
+            "extensions": {}}]])
+
+    def get_witness(self, name_or_id):
+        account = self._get_account(name_or_id)
+        for object_id, obj in sorted(self.objects.items()):
+            if object_id.startswith('1.6.') and \
+                    obj['witness_account'] == account['id']:
+                return copy.deepcopy(obj)
+        raise SimChainError('Account %s is not a witness' % account['name'])
+
+    def list_witnesses(self, lowerbound, limit):
+        witnesses = list()
+        for object_id, obj in self.objects.items():
+            if object_id.startswith('1.6.'):
+                name = self.objects[obj['witness_account']]['name']
+                if name >= lowerbound:
+                    witnesses.append([name, object_id])
+        return sorted(witnesses)[:limit]
+
+    def propose_parameter_change(self, proposing_account, expiration_time,
+                                 changed_values, broadcast):
+        for key in changed_values:
+            if key not in self.parameters:
+                raise SimChainError('Unknown chain parameter: %s' % key)
+        return self.push_operations([[PROPOSAL_CREATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "fee_paying_account": self._get_account(proposing_account)['id'],
+            "expiration_time": expiration_time,
+            "proposed_ops": [changed_values],
+            "extensions": []}]])
+
+    def approve_proposal(self, fee_paying_account, proposal_id, delta,
+                         broadcast):
+        approvals = [self._get_account(name)['id'] for name in
+                     delta.get('active_approvals_to_add', [])]
+        return self.push_operations([[PROPOSAL_UPDATE_OPERATION, {
+            "fee": {"amount": 0, "asset_id": CORE_ASSET_ID},
+            "fee_paying_account": self._get_account(fee_paying_account)['id'],
+            "proposal": proposal_id,
+            "active_approvals_to_add": approvals,
+            "active_approvals_to_remove": [],
+            "extensions": []}]])
+
+    def begin_builder_transaction(self):
+        handle = self.next_builder_handle
+        self.next_builder_handle += 1
+        self.builder_transactions[handle] = list()
+        return handle
+
+    def add_operation_to_builder_transaction(self, handle, operation):
+        self.builder_transactions[handle].append(operation)
+        return None
+
+    def set_fees_on_builder_transaction(self, handle, fee_asset):
+        return [{"amount": 0, "asset_id": CORE_ASSET_ID}
+                for _ in self.builder_transactions[handle]]
+
+    def sign_builder_transaction(self, handle, broadcast):
+        operations = self.builder_transactions.pop(handle)
+        return self.push_operations(operations)
+
+
+class SimJsonRpc(object):
+    """Has the same interface as connection.JsonRpc, but calls SimChain
+    methods instead of sending HTTP requests"""
+    def __init__(self, chain, uri='sim://', pool_size=None):
+        self.chain = chain
+        self.uri = uri
+        self.pool_size = pool_size
+        self.id = 0
+        self.batch_supported = True
+
+    def close(self):
+        pass
+
+    def reconnect(self):
+        pass
+
+    def get_connection_stats(self):
+        return {'connections_opened': 0, 'connections_reused': 0,
+                'reconnects': 0}
+
+    def _call(self, method, params):
+        handler = getattr(self.chain, method, None)
+        if handler is None or method.startswith('_'):
+            return {"error": {"code": -32601,
+                              "message": 'Method not found: %s' % method}}
+        # results are passed through json to get the same types as in real
+        # responses and to detach them from chain state
+        with self.chain.lock:
+            try:
+                result = handler(*params)
+            except (SimChainError, TypeError, KeyError, ValueError) as e:
+                # same format as graphene uses for failed FC_ASSERT
+                return {"error": {"code": 1, "message":
+                                  '10 assert_exception: Assert Exception\n'
+                                  '%s: %s' % (type(e).__name__, e)}}
+            return {"result": json.loads(json.dumps(result))}
+
+    def send_request(self, method, *arguments, **kwargs):
+        expected_code = kwargs.get('expected_code', 200)
+        self.id += 1
+        started = time.time()
+        with PROFILER.section(RPC):
+            response = self._call(method, list(*arguments))
+        response["jsonrpc"] = "2.0"
+        if RPC_STATS.enabled:
+            RPC_STATS.record(method, (time.time() - started) * 1000,
+                             error='error' in response)
+        if expected_code is not None and 'error' in response:
+            raise BitshareStatusCodeError(response)
+        return response
+
+    def send_batch(self, calls):
+        return [self.send_request(method, *arguments,
+                                  expected_code=expected_code)
+                for method, arguments, expected_code in calls]
+
+
+SIM_CHAIN = {'chain': None}
+
+
+def get_sim_chain():
+    return SIM_CHAIN['chain']
+
+
+def install_sim_backend(parameters=None):
+    """Switches all clients (CLI_WALLET, WITNESS_NODE, async clients) to
+    one in-process SimChain and makes BLOCK_WATCHER and TIME_CONTROLLER use
+    its virtual clock"""
+    from connection import set_rpc_factory
+    from cli_wallet import CLI_WALLET
+    from witness_node import WITNESS_NODE
+    from block_watcher import BLOCK_WATCHER
+    from time_control import TIME_CONTROLLER, SimChainTimeSkipper
+
+    chain = SimChain(parameters)
+    SIM_CHAIN['chain'] = chain
+
+    def create_sim_rpc(uri, pool_size=None):
+        return SimJsonRpc(chain, uri, pool_size)
+
+    set_rpc_factory(create_sim_rpc)
+    CLI_WALLET.connect(CLI_WALLET.rpc.uri)
+    CLI_WALLET.asset_cache.clear()
+    WITNESS_NODE.connect(WITNESS_NODE.rpc.uri)
+    BLOCK_WATCHER.sleep = chain.sleep
+    BLOCK_WATCHER.now = chain.now
+    TIME_CONTROLLER.set_skipper(SimChainTimeSkipper(chain))
+    return chain
@@ -1,13 +1,20 @@
 import random
 import string
-import time
+import calendar
 from datetime import datetime, timedelta
 import dateutil.parser as dt
 from utils.cli_wallet import CLI_WALLET
+from utils.block_watcher import BLOCK_WATCHER
+from utils.time_control import TIME_CONTROLLER
+from utils.log_scanner import get_log_index
+from utils.results_store import RESULTS_STORE
 from utils.py_logger import logger
-import re
 import os
 from utils.constants import DMF_ASSET_FLAG
+from utils import fee_oracle
+from utils.fee_oracle import (calculate_market_fees, calculate_rewards,
+                              decay_trade_statistics, to_satoshi)
+from utils.workers import get_worker_name_tag, get_worker_asset_letter
 
 
 def get_last_operation_id(account_name):
@@ -47,54 +54,27 @@ def generate_random_key():
 
 def generate_random_name():
     ts = get_timestamp()
-    name = generate_random_string(10) + ts
+    name = generate_random_string(10) + get_worker_name_tag() + ts
     return name
 
 
 def wait_until_maintenance_finished():
-    next_maintenance_time = CLI_WALLET.get_next_maintenance_time()
-    while True:
-        prop = CLI_WALLET.get_dynamic_global_properties()
-        now = dt.parse(prop["time"])
-
-        if now < next_maintenance_time:
-            time.sleep(1)
-        else:
-            break
-    return next_maintenance_time
+    return TIME_CONTROLLER.advance_to_next_maintenance()
 
 
 def wait_for_maintenance_after(timestamp):
-    while True:
-        prop = CLI_WALLET.get_dynamic_global_properties()
-        now = dt.parse(prop["time"])
-        next_maintenance_time = dt.parse(prop["next_maintenance_time"])
-
-        if now < timestamp:
-            time.sleep(0.5)
-        else:
-            if timestamp < next_maintenance_time:
-                timestamp = next_maintenance_time
-            break
-    wait_until(timestamp)
-    return timestamp
+    return TIME_CONTROLLER.advance_past_maintenance_after(timestamp)
 
 
 def wait_blocks(num_blocks=1):
     logger.info('Waiting for new block is generated')
-    block = CLI_WALLET.get_head_block_number()
-    while CLI_WALLET.get_head_block_number() - block < num_blocks:
-        sleep_time = 0.5
-        logger.debug('Sleep %s seconds' % sleep_time)
-        time.sleep(sleep_time)
+    BLOCK_WATCHER.wait_blocks(num_blocks)
     logger.info('Done.')
 
 
 def wait_until(timestamp):
     logger.info('Wait until %s...' % timestamp)
-    while timestamp > dt.parse(
-            CLI_WALLET.get_dynamic_global_properties()["time"]):
-        time.sleep(1)
+    TIME_CONTROLLER.advance_to(timestamp)
 
 
 def wait_proposal_processed(proposal_id):
@@ -107,7 +87,7 @@ def wait_proposal_processed(proposal_id):
 
 def wait_operation_processed(account, operation_id):
     while operation_id == get_last_operation_id(account):
-        time.sleep(1)
+        BLOCK_WATCHER.wait_blocks(1)
 
 
 def update_timestamp(timestamp, minutes=0, seconds=0):
@@ -123,19 +103,44 @@ def prepare_datetime_object(timestamp):
         return dt.parse(timestamp)
 
 
-def calculate_trade_statistics(start_amount, first_maintenance_time,
-                               extra_timestamp=None):
-    maintenance_interval = CLI_WALLET.get_maintenance_interval()
-    extra_timestamp = first_maintenance_time if extra_timestamp is None \
-        else extra_timestamp
-    delta = extra_timestamp - first_maintenance_time
-    first_maintenance_count = 1
-    extra_maintenance_count = delta.seconds / maintenance_interval
-    all_maintenance_count = first_maintenance_count + extra_maintenance_count
-
-    for _ in xrange(all_maintenance_count):
-        start_amount = trade_statistics_calculator(start_amount)
-    return start_amount
+def calculate_trade_statistics(start_amount, first_block, last_block,
+                               docker_dir=None):
+    """Trade statistics volume after maintenances performed since
+    first_block, when it was start_amount, till last_block"""
+    maintenances_count = get_maintenances_count(first_block, last_block,
+                                                docker_dir)
+    return decay_trade_statistics(start_amount, maintenances_count)[0]
+
+
+def count_maintenances(block_times, maintenance_interval):
+    """Maintenances performed in blocks with block_times[1:], block_times[0]
+    is the time of the block before them. Maintenance times are multiples
+    of maintenance interval since the epoch. The chain performs one
+    maintenance in the first block after a maintenance time, however many
+    of them a gap between blocks skips"""
+    intervals = [calendar.timegm(block_time.utctimetuple()) //
+                 maintenance_interval for block_time in block_times]
+    return len([current for previous, current
+                in zip(intervals, intervals[1:]) if current > previous])
+
+
+def get_maintenances_count(first_block, last_block, docker_dir=None):
+    """Maintenances performed in blocks (first_block, last_block]. Uses
+    witness log when it is in docker_dir, otherwise block timestamps"""
+    if docker_dir is not None:
+        log_file_path = os.path.join(docker_dir, 'log')
+        if os.path.exists(log_file_path):
+            log_index = get_log_index(log_file_path)
+            log_index.update()
+            return len([timing for timing
+                        in log_index.get_finished_maintenances()
+                        if first_block < timing.block <= last_block])
+    with CLI_WALLET.batch() as batch:
+        blocks = [batch.send_request('get_block', [number])
+                  for number in xrange(first_block, last_block + 1)]
+    block_times = [dt.parse(block.result()['timestamp']) for block in blocks]
+    return count_maintenances(block_times,
+                              CLI_WALLET.get_maintenance_interval())
 
 
 def trade_statistics_calculator(start_amount):
@@ -242,7 +247,7 @@ def wait_transfer(from_account, to_account, amount):
     CLI_WALLET.transfer(from_account, to_account, amount)
 
     while get_first_amount(to_account) - prev < amount:
-        time.sleep(1)
+        BLOCK_WATCHER.wait_blocks(1)
 
 
 def check_committee_preconditions(committee):
@@ -255,9 +260,10 @@ def check_committee_preconditions(committee):
 
 
 def calculate_percent(value, percent, bitshares_value=True):
-    percent = float(percent) / float(100) if bitshares_value else percent
-    result = value * percent / 100
-    return result
+    """percent is in basis points (10000 means 100%) or, without
+    bitshares_value, in percents; the result is rounded down like on chain"""
+    percent = percent if bitshares_value else percent * 100
+    return fee_oracle.calculate_percent(value, percent)
 
 
 def percentage(part, whole):
@@ -269,7 +275,7 @@ def generate_new_asset_name(symbol_length=7):
     symbol_length -= 1
     while True:
         asset_name = generate_random_string(symbol_length).upper()
-        asset_name = 'A%s' % asset_name
+        asset_name = '%s%s' % (get_worker_asset_letter(), asset_name)
         if not asset_exists(asset_name):
             return asset_name
 
@@ -280,23 +286,6 @@ def seller_list_generator(even_list, odd_list):
         yield even_list[list_index], odd_list[list_index]
 
 
-def get_file_lines(file_path):
-    with open(file_path, 'rb') as opened_file:
-        return opened_file.readlines()
-
-
-def get_block_number_from_log_line(line):
-    result = re.findall('#\d*', line)
-    # Example of result: ['#1234']
-    return result[0][1:]
-
-
-def get_time_from_line(line):
-    result = line.split()[0]
-    # Example of result: '1234000ms'
-    return result[:-2]
-
-
 def calculate_maintenance_time(start, finish):
     assert start is not None
     assert finish is not None
@@ -306,25 +295,16 @@ def calculate_maintenance_time(start, finish):
 
 def check_maintenance_time(docker_dir, block_before_maintenance):
     logger.info('Searching for next maintenance block...')
-    start_time = None
-    finish_time = None
-    maintenance_block = None
     log_file_path = os.path.join(docker_dir, 'log')
-    file_lines = get_file_lines(log_file_path)
-    for line in file_lines:
-        if 'Started in block=#' in line:
-            block = get_block_number_from_log_line(line)
-            if int(block) > int(block_before_maintenance):
-                logger.info('Next maintenance block number found: %s' % block)
-                maintenance_block = block
-                start_time = get_time_from_line(line)
-                logger.info('Start maintenance time: %s' % start_time)
-                break
-    for line in file_lines:
-        if 'Finished in block=#%s' % maintenance_block in line:
-            finish_time = get_time_from_line(line)
-            logger.info('Finish maintenance time: %s' % finish_time)
-            break
+    log_index = get_log_index(log_file_path)
+    maintenance_block, start_time, finish_time = \
+        log_index.find_maintenance_after(int(block_before_maintenance))
+    if maintenance_block is not None:
+        logger.info('Next maintenance block number found: %s' %
+                    maintenance_block)
+        logger.info('Start maintenance time: %s' % start_time)
+    if finish_time is not None:
+        logger.info('Finish maintenance time: %s' % finish_time)
 
     time_in_ms = calculate_maintenance_time(start_time, finish_time)
     return time_in_ms
@@ -342,41 +322,47 @@ def append_comma_separated_value_to_file(file_path, value):
         f.write(value_with_comma)
 
 
-def write_result_to_csv(file_path, value):
+def write_result_to_csv(file_path, value, name='maintenance_time',
+                        unit='ms', params=None):
     str_value = str(value)
     if os.path.exists(file_path):
         append_comma_separated_value_to_file(file_path, str_value)
     else:
         write_to_result_file(file_path, str_value)
+    # csv keeps bare numbers for old reports, the store keeps run metadata
+    RESULTS_STORE.record(name, value, unit, params, csv_file=file_path)
 
 
 def calculate_account_reward_amount(asset, asset_amount, asset_percent,
-                                    reward_percent, account_percent):
-
-    asset_reward_amount = calculate_full_reward_amount(asset, asset_amount,
-                                                       asset_percent,
-                                                       reward_percent)
+                                    reward_percent, account_percent,
+                                    is_registrar=False):
+    """account_percent is the share in percents of the referrer, or of
+    the registrar (100 - referrer percent) with is_registrar. The
+    registrar gets what is left after the rounded down referrer reward"""
     logger.info('Calculate account asset reward amounts')
-    account_asset_reward_amount = calculate_percent(
-        asset_reward_amount, account_percent, bitshares_value=False)
-    return account_asset_reward_amount
+    referrer_percent = 100 - account_percent if is_registrar \
+        else account_percent
+    rewards = calculate_rewards(
+        to_satoshi(asset_amount, asset.precision), asset_percent,
+        reward_percent, referrer_percent * 100)
+    if is_registrar:
+        return rewards['registrar_reward'][0]
+    return rewards['referrer_reward'][0]
 
 
 def calculate_full_fee(asset, asset_amount, asset_percent):
-    precision_value = 10 ** asset.precision
     logger.info('Get assets full fees')
-    asset_full_fee = calculate_percent(
-        asset_amount * precision_value, asset_percent)
+    asset_full_fee = calculate_market_fees(
+        to_satoshi(asset_amount, asset.precision), asset_percent)[0]
     logger.info('"%s" asset full fee: %s' % (asset.name, asset_full_fee))
     return asset_full_fee
 
 
 def calculate_full_reward_amount(asset, asset_amount, asset_percent,
                                  reward_percent):
-    asset_full_fee = calculate_full_fee(asset, asset_amount, asset_percent)
     logger.info('Calculate assets reward amounts')
-    asset_reward_amount = calculate_percent(asset_full_fee, reward_percent)
-    return asset_reward_amount
+    return calculate_rewards(to_satoshi(asset_amount, asset.precision),
+                             asset_percent, reward_percent, 0)['reward'][0]
 
 
 def prepare_dmf_asset_options(extensions, flags_int=DMF_ASSET_FLAG,
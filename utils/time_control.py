@@ -0,0 +1,96 @@
+# Time control for tests bound to maintenance intervals.
+# When the backend can move chain time forward (simulated chain, witness
+# node with debug_node plugin) waits are replaced by jumps, otherwise
+# TimeController waits for real blocks with BlockWatcher.
+
+import dateutil.parser as dt
+from cli_wallet import CLI_WALLET
+from block_watcher import BLOCK_WATCHER
+from b3_exceptions import BitshareStatusCodeError
+from utils.py_logger import logger
+from utils.time_profiler import PROFILER, WAIT
+
+
+class SimChainTimeSkipper(object):
+    def __init__(self, chain):
+        self.chain = chain
+
+    def skip_to(self, timestamp):
+        self.chain.generate_blocks_until(timestamp)
+
+
+class DebugNodeTimeSkipper(object):
+    """Uses debug_generate_blocks_until of witness_node debug_node plugin.
+    Suitable only for chains produced by this node alone: regular witnesses
+    do not produce blocks until wall clock reaches the new head block time,
+    so until then BlockWatcher generates blocks by generate_blocks"""
+    def __init__(self, node, debug_key):
+        self.node = node
+        self.debug_key = debug_key
+
+    def skip_to(self, timestamp):
+        self.node.send_request(
+            "call", ["debug", "debug_generate_blocks_until",
+                     [self.debug_key, timestamp.isoformat(), True]])
+
+    def generate_blocks(self, count):
+        self.node.send_request(
+            "call", ["debug", "debug_generate_blocks",
+                     [self.debug_key, count]])
+
+
+class TimeController(object):
+    def __init__(self, watcher, wallet, skipper=None):
+        self.watcher = watcher
+        self.wallet = wallet
+        self.skipper = skipper
+
+    def set_skipper(self, skipper):
+        self.skipper = skipper
+        self.watcher.set_block_producer(
+            getattr(skipper, 'generate_blocks', None))
+
+    @property
+    def can_fast_forward(self):
+        return self.skipper is not None
+
+    def advance_to(self, timestamp):
+        """Returns dynamic global properties once head block time reaches
+        timestamp"""
+        with PROFILER.section(WAIT):
+            if self.skipper is not None:
+                logger.info('Fast-forwarding chain time to %s' % timestamp)
+                try:
+                    self.skipper.skip_to(timestamp)
+                except BitshareStatusCodeError as e:
+                    logger.info('Chain time cannot be moved: %s. Waiting for '
+                                'real blocks from now on' % e)
+                    self.set_skipper(None)
+            # returns at once if the time has already been skipped
+            return self.watcher.wait_for_time(timestamp)
+
+    def advance_to_next_maintenance(self):
+        next_maintenance_time = self.wallet.get_next_maintenance_time()
+        self.advance_to(next_maintenance_time)
+        return next_maintenance_time
+
+    def advance_past_maintenance_after(self, timestamp):
+        """Moves to timestamp and then to the first maintenance not earlier
+        than it"""
+        props = self.advance_to(timestamp)
+        next_maintenance_time = dt.parse(props["next_maintenance_time"])
+        if timestamp < next_maintenance_time:
+            timestamp = next_maintenance_time
+        self.advance_to(timestamp)
+        return timestamp
+
+    def advance_maintenances(self, count):
+        """Passes count maintenance intervals, returns the last maintenance
+        time"""
+        maintenance_time = None
+        for _ in xrange(count):
+            maintenance_time = self.advance_to_next_maintenance()
+        return maintenance_time
+
+
+TIME_CONTROLLER = TimeController(BLOCK_WATCHER, CLI_WALLET)
@@ -0,0 +1,146 @@
+# Opt-in wall-clock breakdown of tests and their steps into three buckets:
+#   wait   - blocked on chain progress (BlockWatcher, TimeController)
+#   rpc    - waiting for cli_wallet/witness_node responses
+#   python - everything else
+# Steps are started by log_step. Nested sections are attributed to the
+# outermost one, e.g. RPC polls made while waiting for a block are "wait".
+# Only the thread running the test is measured.
+# Enabled by --time_profile option, see conftest.py.
+
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+
+WAIT = 'wait'
+RPC = 'rpc'
+PYTHON = 'python'
+BUCKETS = (WAIT, RPC, PYTHON)
+SETUP_STEP = 'setup'
+
+
+class TimeProfiler(object):
+    def __init__(self, clock=time.time):
+        self.enabled = False
+        self.clock = clock
+        # test id -> list of steps:
+        #   {"name": ..., "wall": seconds, "wait": seconds, "rpc": seconds}
+        self.tests = dict()
+        self._thread = None
+        self._test_id = None
+        self._step = None
+        self._step_started = None
+        self._section = None
+        self._section_started = None
+
+    def enable(self):
+        self.enabled = True
+
+    def _is_profiled_thread(self):
+        return self._test_id is not None and \
+            threading.current_thread() is self._thread
+
+    def start_test(self, test_id):
+        if not self.enabled:
+            return
+        self._thread = threading.current_thread()
+        self._test_id = test_id
+        self.tests[test_id] = list()
+        self._start_step(SETUP_STEP)
+
+    def finish_test(self):
+        if not self.enabled or self._test_id is None:
+            return
+        self._finish_step()
+        self._test_id = None
+        self._thread = None
+
+    def start_step(self, name):
+        if not self.enabled or not self._is_profiled_thread():
+            return
+        self._finish_step()
+        self._start_step(name)
+
+    def _start_step(self, name):
+        self._step = {'name': name, 'wall': 0.0, WAIT: 0.0, RPC: 0.0}
+        self._step_started = self.clock()
+
+    def _finish_step(self):
+        if self._step is None:
+            return
+        now = self.clock()
+        if self._section is not None:
+            # a step finished inside a section gets its part of the section
+            self._step[self._section] += now - self._section_started
+            self._section_started = now
+        self._step['wall'] = now - self._step_started
+        self.tests[self._test_id].append(self._step)
+        self._step = None
+
+    @contextmanager
+    def section(self, bucket):
+        if not self.enabled or not self._is_profiled_thread() or \
+                self._section is not None:
+            yield
+            return
+        self._section = bucket
+        self._section_started = self.clock()
+        try:
+            yield
+        finally:
+            if self._step is not None:
+                self._step[bucket] += self.clock() - self._section_started
+            self._section = None
+
+    def get_report(self):
+        """JSON-compatible dict: test id -> totals and steps, in seconds"""
+        report = dict()
+        for test_id, steps in self.tests.items():
+            steps = [dict(step, python=max(step['wall'] - step[WAIT] -
+                                           step[RPC], 0.0))
+                     for step in steps]
+            total = dict((key, sum(step[key] for step in steps))
+                         for key in ('wall',) + BUCKETS)
+            report[test_id] = {'total': total, 'steps': steps}
+        return report
+
+    def dump_json(self, file_path):
+        with open(file_path, 'w') as report_file:
+            json.dump(self.get_report(), report_file, indent=2,
+                      sort_keys=True)
+
+    def get_collapsed_stacks(self):
+        """Lines of "test;step;bucket milliseconds" for flamegraph.pl"""
+        lines = list()
+        for test_id, data in sorted(self.get_report().items()):
+            for index, step in enumerate(data['steps']):
+                step_name = '%s. %s' % (index, step['name'])
+                for bucket in BUCKETS:
+                    value = int(round(step[bucket] * 1000))
+                    if value > 0:
+                        lines.append('%s;%s;%s %s' % (
+                            test_id.replace(';', ','),
+                            step_name.replace(';', ','), bucket, value))
+        return lines
+
+    def dump_collapsed(self, file_path):
+        with open(file_path, 'w') as stacks_file:
+            for line in self.get_collapsed_stacks():
+                stacks_file.write(line + '\n')
+
+    def format_summary(self, top=20):
+        report = self.get_report()
+        lines = ['%-70s %9s %9s %9s %9s' % ('test', 'wall s', 'wait s',
+                                            'rpc s', 'python s')]
+        tests = sorted(report.items(), key=lambda item: item[1]['total'][
+            'wall'], reverse=True)
+        for test_id, data in tests[:top]:
+            total = data['total']
+            lines.append('%-70s %9.2f %9.2f %9.2f %9.2f' % (
+                test_id[-70:], total['wall'], total[WAIT], total[RPC],
+                total[PYTHON]))
+        return '\n'.join(lines)
+
+
+PROFILER = TimeProfiler()
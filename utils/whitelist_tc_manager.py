@@ -1,6 +1,6 @@
 from utils.cli_wallet import CLI_WALLET
 from utils.py_logger import log_step, logger
-from utils.account import create_account_with_balance
+from utils.account import create_accounts
 from utils.testutil import wait_blocks, calculate_account_reward_amount
 from utils.assets import (prepare_whitelist_user_asset_options,
                           create_new_user_asset)
@@ -26,16 +26,13 @@ class WhitelistTcManager(object):
         self.asset_1 = None
 
     def prepare_accounts(self):
-        self.authorized_account = create_account_with_balance(300000,
-                                                              lifetime=True)
-        self.registrar_2 = create_account_with_balance(20000,
-                                                       lifetime=True)
-        self.referrer_2 = create_account_with_balance(20000, lifetime=True)
+        self.authorized_account, self.registrar_2, self.referrer_2 = \
+            create_accounts(3, [300000, 20000, 20000], lifetime=True)
 
-        self.account_1 = create_account_with_balance(balance=1000000)
-        self.account_2 = create_account_with_balance(
-            balance=1000000, registrar=self.registrar_2.name,
-            referrer=self.referrer_2.name, referrer_percent=self.ref_2_percent)
+        self.account_1, self.account_2 = create_accounts(
+            2, 1000000, registrar=['nathan', self.registrar_2.name],
+            referrer=['nathan', self.referrer_2.name],
+            referrer_percent=['0', self.ref_2_percent])
 
     def create_new_user_asset(self):
         log_step('Create new user assets')
@@ -57,7 +54,8 @@ class WhitelistTcManager(object):
         self.asset_1.update_options(current_options)
 
     def check_if_reward_amount_is_correct(self, account_name,
-                                          reg_or_ref_percent):
+                                          reg_or_ref_percent,
+                                          is_registrar=False):
         log_step('Get mfs vesting balances list of "%s"' % account_name)
         account_list_rewards = CLI_WALLET.get_mfs_vesting_balances_list(
             account_name)
@@ -66,7 +64,7 @@ class WhitelistTcManager(object):
             'Calculate expected "%s" reward' % account_name)
         expected_account_reward = calculate_account_reward_amount(
             self.asset_1, self.asset_1_amount, self.asset_1_percent,
-            self.reward_percent, reg_or_ref_percent)
+            self.reward_percent, reg_or_ref_percent, is_registrar)
 
         log_step('Check mfs vesting balances of registrar_2 is correct')
         asset_1_dict = {'asset_id': self.asset_1.id,
@@ -1,9 +1,16 @@
-from connection import JsonRpc
+from connection import create_rpc, DEFAULT_POOL_SIZE
+from utils.py_logger import logger
 
 
 class WitnessNode(object):
-    def __init__(self, uri):
-        self.rpc = JsonRpc(uri)
+    def __init__(self, uri, pool_size=DEFAULT_POOL_SIZE):
+        self.rpc = create_rpc(uri, pool_size=pool_size)
+
+    def connect(self, uri):
+        logger.info('Connecting witness_node client to %s' % uri)
+        old_rpc = self.rpc
+        self.rpc = create_rpc(uri, pool_size=old_rpc.pool_size)
+        old_rpc.close()
 
     def send_request(self, method, *arguments, **kwargs):
         return self.rpc.send_request(method, *arguments, **kwargs)
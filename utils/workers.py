@@ -0,0 +1,98 @@
+# Helpers for running suites with pytest-xdist against one chain.
+# Every xdist worker is a separate process, so module-level singletons
+# (CLI_WALLET, StepGenerator, ...) are already per worker. What is shared is
+# the chain itself: funding account balance, object names and committee.
+
+import os
+import re
+import json
+import fcntl
+import tempfile
+from contextlib import contextmanager
+
+
+DEFAULT_FUNDING_ACCOUNT = 'nathan'
+MASTER_WORKER_ID = 'master'
+
+_funding_account = {'name': DEFAULT_FUNDING_ACCOUNT}
+
+
+def get_worker_id():
+    # PYTEST_XDIST_WORKER is set by pytest-xdist: "gw0", "gw1", ...
+    return os.environ.get('PYTEST_XDIST_WORKER', MASTER_WORKER_ID)
+
+
+def is_xdist_worker():
+    return get_worker_id() != MASTER_WORKER_ID
+
+
+def get_test_run_id():
+    # PYTEST_XDIST_TESTRUNUID is the same for all workers of one run
+    return os.environ.get('PYTEST_XDIST_TESTRUNUID', str(os.getpid()))
+
+
+def get_worker_index():
+    found = re.findall(r'\d+', get_worker_id())
+    return int(found[0]) if found else 0
+
+
+def get_worker_name_tag():
+    """Part of generated account names unique for worker"""
+    return 'w%s' % get_worker_index() if is_xdist_worker() else ''
+
+
+def get_worker_asset_letter():
+    """First letter of generated asset symbols unique for worker"""
+    return chr(ord('A') + get_worker_index() % 26)
+
+
+def get_worker_file_path(file_path):
+    """Output file of the worker: "rpc_stats.json" becomes
+    "rpc_stats.gw0.json" on xdist worker gw0, so workers do not overwrite
+    each other's files"""
+    if not file_path or not is_xdist_worker():
+        return file_path
+    root, extension = os.path.splitext(file_path)
+    return '%s.%s%s' % (root, get_worker_id(), extension)
+
+
+def get_funding_account():
+    return _funding_account['name']
+
+
+def set_funding_account(account_name):
+    _funding_account['name'] = account_name
+
+
+@contextmanager
+def worker_lock(name):
+    """Inter-process lock shared by all workers of the host"""
+    lock_path = os.path.join(tempfile.gettempdir(),
+                             'bitshares-tests-%s.lock' % name)
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def shared_state(name):
+    """Yields dict shared by all workers of the test run, e.g. users count
+    of a shared fixture. It is read and saved under worker_lock(name), and
+    the file is removed when the dict is left empty"""
+    state_path = os.path.join(tempfile.gettempdir(),
+                              'bitshares-tests-%s-%s.json' % (
+                                  name, get_test_run_id()))
+    with worker_lock(name):
+        state = dict()
+        if os.path.exists(state_path):
+            with open(state_path) as state_file:
+                state = json.load(state_file)
+        yield state
+        if state:
+            with open(state_path, 'w') as state_file:
+                json.dump(state, state_file)
+        elif os.path.exists(state_path):
+            os.remove(state_path)